@@ -1,5 +1,6 @@
 import tkinter as tk
 from ui.settings_ui import SettingsUI
+from ui.ui_bus import call_on_tk_thread
 from ui.main_menu import MainMenu
 from utils.config_manager import ConfigManager
 
@@ -19,10 +20,12 @@ def integrate_settings(app, root):
     config_manager = ConfigManager("config.json")
 
     # ลงทะเบียนฟังก์ชันที่จะเรียกเมื่อการตั้งค่าเปลี่ยนแปลง
-    config_manager.register_observer(lambda config: on_config_changed(app, config))
+    config_manager.register_observer(
+        lambda config, changed_keys: on_config_changed(app, config, changed_keys)
+    )
 
-    # สร้างหน้าตั้งค่า
-    settings_ui = SettingsUI(root, "config.json")
+    # สร้างหน้าตั้งค่า (ใช้ตัวจัดการการตั้งค่าเดียวกับแอพ)
+    settings_ui = SettingsUI(root, config_manager)
 
     # สร้างเมนูหลัก
     main_menu = MainMenu(root, settings_ui, config_manager, app)
@@ -30,21 +33,23 @@ def integrate_settings(app, root):
     # เพิ่มคีย์ลัด
     setup_hotkeys(root, settings_ui)
 
-    # ตั้งค่าการตรวจสอบการเปลี่ยนแปลงการตั้งค่าตามระยะเวลา
-    schedule_config_check(root, config_manager)
+    # เฝ้าดูไฟล์การตั้งค่า และโหลดใหม่ทันทีเมื่อไฟล์เปลี่ยน
+    watch_config(root, config_manager)
 
     return config_manager, settings_ui, main_menu
 
 
-def on_config_changed(app, config):
+def on_config_changed(app, config, changed_keys):
     """
     จัดการเมื่อการตั้งค่าเปลี่ยนแปลง
 
     Args:
         app: แอพพลิเคชันหลัก
         config: การตั้งค่าใหม่
+        changed_keys: ชุดคีย์ที่ค่าเปลี่ยน
     """
-    if hasattr(app, "detector"):
+    # detector อ่านค่าจาก snapshot ของ ConfigManager เอง ที่นี่อัปเดตเฉพาะค่าที่แอพเก็บไว้
+    if getattr(app, "detector", None) is not None:
         app.detector.line_threshold = config.get("line_threshold", 200)
         app.detector.color_threshold = config.get("color_threshold", 30)
 
@@ -59,8 +64,9 @@ def on_config_changed(app, config):
     if hasattr(app, "buffer_zone_size"):
         app.buffer_zone_size = config.get("buffer_zone_size", 0.13)
 
-    # อัปเดต UI (หากมีการเปลี่ยนแปลงสี)
-    update_ui_colors(app, config)
+    # อัปเดต UI เฉพาะเมื่อสีเปลี่ยน (การสร้างเกจใหม่มีต้นทุนสูง)
+    if "ui_colors" in changed_keys:
+        update_ui_colors(app, config)
 
 
 def update_ui_colors(app, config):
@@ -113,19 +119,17 @@ def setup_hotkeys(root, settings_ui):
     root.bind("<Control-s>", lambda e: settings_ui.open_settings())
 
 
-def schedule_config_check(root, config_manager, interval=5000):
+def watch_config(root, config_manager):
     """
-    ตั้งเวลาตรวจสอบการเปลี่ยนแปลงการตั้งค่าตามระยะเวลา
+    เฝ้าดูการเปลี่ยนแปลงของไฟล์การตั้งค่า แล้วโหลดใหม่ในเธรดหลักของ Tk
+
+    ตัวเฝ้าดูทำงานในเธรดแยก เมื่อไฟล์เปลี่ยนจะส่ง check_for_changes
+    ไปทำบนเธรดหลักทันทีผ่าน call_on_tk_thread (ไม่มีการตรวจเป็นระยะ)
 
     Args:
         root: หน้าต่างหลัก
         config_manager: อินสแตนซ์ของ ConfigManager
-        interval: ระยะเวลาในการตรวจสอบ (มิลลิวินาที)
     """
-
-    def check_config():
-        config_manager.check_for_changes()
-        root.after(interval, check_config)
-
-    # เริ่มตรวจสอบตามระยะเวลา
-    root.after(interval, check_config)
+    config_manager.start_watching(
+        lambda: call_on_tk_thread(root, config_manager.check_for_changes)
+    )
@@ -0,0 +1,170 @@
+import time
+
+import numpy as np
+
+
+class CaptureBackend:
+    """คลาสพื้นฐานของตัวจับภาพหน้าจอ พร้อมวัดเวลาที่ใช้ต่อการจับภาพหนึ่งครั้ง"""
+
+    name = "base"
+
+    # ลำดับช่องสีของภาพที่ backend คืนค่ามา
+    channel_order = "BGR"
+
+    def __init__(self):
+        self.grab_count = 0
+        self.total_grab_time = 0.0
+        self.last_grab_time = 0.0
+        self.max_grab_time = 0.0
+
+    def grab(self, region):
+        """จับภาพพื้นที่ที่กำหนดและบันทึกเวลาที่ใช้
+
+        Args:
+            region: พื้นที่ (x1, y1, x2, y2) บนหน้าจอ
+
+        Returns:
+            numpy.ndarray: ภาพในลำดับช่องสีตาม channel_order
+        """
+        start = time.perf_counter()
+        frame = self._grab(region)
+        self._record(time.perf_counter() - start)
+        return frame
+
+    def grab_into(self, region, out):
+        """จับภาพแล้วเขียนลงใน buffer ที่จองไว้ล่วงหน้า
+
+        Args:
+            region: พื้นที่ (x1, y1, x2, y2) บนหน้าจอ
+            out: buffer ปลายทางขนาด (h, w, channels)
+
+        Returns:
+            numpy.ndarray: out หรือภาพที่จับได้ถ้าขนาดไม่ตรงกับ buffer
+                (เช่นเมื่อหน้าจอมีการปรับสเกล DPI)
+        """
+        start = time.perf_counter()
+        frame = self._grab(region)
+        if frame.shape == out.shape:
+            np.copyto(out, frame)
+            frame = out
+        self._record(time.perf_counter() - start)
+        return frame
+
+    def _grab(self, region):
+        raise NotImplementedError
+
+    def _record(self, elapsed):
+        """บันทึกเวลาที่ใช้ในการจับภาพหนึ่งครั้ง"""
+        self.grab_count += 1
+        self.total_grab_time += elapsed
+        self.last_grab_time = elapsed
+        if elapsed > self.max_grab_time:
+            self.max_grab_time = elapsed
+
+    def get_stats(self):
+        """รับสถิติเวลาที่ใช้ในการจับภาพ
+
+        Returns:
+            dict: ชื่อ backend, จำนวนครั้ง, เวลาเฉลี่ย/ล่าสุด/สูงสุด (ms) และอัตราสูงสุดที่ทำได้ (Hz)
+        """
+        avg = self.total_grab_time / self.grab_count if self.grab_count else 0.0
+        return {
+            "backend": self.name,
+            "grabs": self.grab_count,
+            "avg_ms": avg * 1000,
+            "last_ms": self.last_grab_time * 1000,
+            "max_ms": self.max_grab_time * 1000,
+            "max_hz": 1.0 / avg if avg > 0 else 0.0,
+        }
+
+    def close(self):
+        """ปล่อยทรัพยากรที่ backend ถืออยู่"""
+        pass
+
+
+class PyAutoGuiCapture(CaptureBackend):
+    """จับภาพด้วย pyautogui (ช้าที่สุด แต่ใช้ได้ทุกที่ จึงใช้เป็นตัวสำรอง)"""
+
+    name = "pyautogui"
+    channel_order = "RGB"
+
+    def __init__(self):
+        import pyautogui
+
+        super().__init__()
+        self._pyautogui = pyautogui
+
+    def _grab(self, region):
+        x1, y1, x2, y2 = region
+        screenshot = self._pyautogui.screenshot(region=(x1, y1, x2 - x1, y2 - y1))
+        return np.asarray(screenshot)
+
+
+class MssCapture(CaptureBackend):
+    """จับภาพด้วย mss (XGetImage/XShm บน Linux, GDI BitBlt บน Windows)
+
+    เปิด handle ของจอค้างไว้ตลอดเซสชัน แทนการเปิดใหม่ทุกเฟรม
+    """
+
+    name = "mss"
+    channel_order = "BGRA"
+
+    def __init__(self):
+        import mss
+
+        super().__init__()
+        self._mss = mss
+        self._sct = None
+
+    def _grab(self, region):
+        # mss ผูก handle กับเธรดที่สร้าง จึงเปิดในเธรดที่จับภาพจริงครั้งแรก
+        if self._sct is None:
+            self._sct = self._mss.mss()
+
+        x1, y1, x2, y2 = region
+        shot = self._sct.grab(
+            {"left": x1, "top": y1, "width": x2 - x1, "height": y2 - y1}
+        )
+        return np.frombuffer(shot.raw, dtype=np.uint8).reshape(
+            shot.height, shot.width, 4
+        )
+
+    def close(self):
+        if self._sct is not None:
+            self._sct.close()
+            self._sct = None
+
+
+# backend ที่รองรับ เรียงตามลำดับที่จะลองเมื่อเลือก "auto"
+CAPTURE_BACKENDS = {
+    "mss": MssCapture,
+    "pyautogui": PyAutoGuiCapture,
+}
+
+
+def create_capture_backend(name="auto"):
+    """สร้างตัวจับภาพตามชื่อที่กำหนดใน config
+
+    ถ้า backend ที่เลือกใช้ไม่ได้ (ไม่ได้ติดตั้งไลบรารี) จะถอยไปใช้ตัวถัดไป
+    โดยมี pyautogui เป็นตัวสำรองสุดท้าย
+
+    Args:
+        name: ชื่อ backend ("auto", "mss", "pyautogui")
+
+    Returns:
+        CaptureBackend: ตัวจับภาพที่พร้อมใช้งาน
+    """
+    if name in CAPTURE_BACKENDS:
+        candidates = [name] + [key for key in CAPTURE_BACKENDS if key != name]
+    else:
+        if name != "auto":
+            print(f"Unknown capture backend '{name}', using auto")
+        candidates = list(CAPTURE_BACKENDS)
+
+    for candidate in candidates:
+        try:
+            return CAPTURE_BACKENDS[candidate]()
+        except ImportError as e:
+            print(f"Capture backend '{candidate}' unavailable: {e}")
+
+    raise RuntimeError("No screen capture backend available")
@@ -0,0 +1,68 @@
+class PIDController:
+    """ตัวควบคุม PID ที่รักษาเส้นขาวไว้กลางโซนเขียว
+
+    ผลลัพธ์คือ duty (0.0 - 1.0) คือสัดส่วนของอัตราคลิกสูงสุด (1 / action_cooldown)
+    แล้วแปลงเป็นจังหวะคลิกด้วยตัวสะสมเฟส แทนการคลิกทุกครั้งที่อยู่ในโซนที่กำหนด
+    การคลิกดันเส้นไปทางขวา ดังนั้นเส้นที่อยู่ซ้ายของเป้าหมายจะได้ duty สูงขึ้น
+    """
+
+    def __init__(self, kp=4.0, ki=1.0, kd=0.5, bias=0.5):
+        """
+        Args:
+            kp: อัตราขยายของความคลาดเคลื่อนตำแหน่ง (ต่อหน่วยความกว้างเกจ)
+            ki: อัตราขยายของผลรวมความคลาดเคลื่อน (ต่อวินาที)
+            kd: อัตราขยายของความเร็วเส้น (หน่วยความกว้างเกจต่อวินาที)
+            bias: duty พื้นฐานที่ทำให้เส้นอยู่นิ่งโดยประมาณ
+        """
+        self.kp = kp
+        self.ki = ki
+        self.kd = kd
+        self.bias = bias
+
+        self.integral = 0.0
+        self.phase = 0.0
+        self.duty = 0.0
+        self.timestamp = None
+
+    def reset(self):
+        """ล้างสถานะ (เช่นเมื่อเกจหายไป)"""
+        self.integral = 0.0
+        self.phase = 0.0
+        self.duty = 0.0
+        self.timestamp = None
+
+    def update(self, position, velocity, target, timestamp, min_interval):
+        """คำนวณ duty ใหม่จากตำแหน่งและความเร็วของเส้น แล้วเลื่อนเฟสของจังหวะคลิก
+
+        Args:
+            position: ตำแหน่งสัมพัทธ์ของเส้น (0.0 - 1.0)
+            velocity: ความเร็วของเส้น (หน่วยความกว้างเกจต่อวินาที)
+            target: ตำแหน่งเป้าหมาย (0.0 - 1.0)
+            timestamp: เวลาปัจจุบัน (time.perf_counter)
+            min_interval: ช่วงเวลาสั้นที่สุดระหว่างคลิก (action_cooldown)
+
+        Returns:
+            bool: True ถ้าถึงจังหวะคลิกในรอบนี้ (duty ล่าสุดอยู่ใน self.duty)
+        """
+        dt = 0.0 if self.timestamp is None else timestamp - self.timestamp
+        self.timestamp = timestamp
+
+        error = target - position
+        output = self.bias + self.kp * error - self.kd * velocity
+
+        # สะสมผลรวมเฉพาะเมื่อผลลัพธ์ยังไม่ชนขอบ (ป้องกัน integral windup)
+        integral = self.integral + error * dt
+        if 0.0 <= output + self.ki * integral <= 1.0:
+            self.integral = integral
+        output += self.ki * self.integral
+        self.duty = min(max(output, 0.0), 1.0)
+
+        if min_interval <= 0:
+            return self.duty > 0
+
+        # จำกัดเฟสไว้ไม่เกินหนึ่งคลิก เพื่อไม่ให้คลิกรัวหลังช่วงที่หยุดไป
+        self.phase = min(self.phase + self.duty * dt / min_interval, 1.0)
+        if self.phase >= 1.0:
+            self.phase -= 1.0
+            return True
+        return False
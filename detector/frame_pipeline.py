@@ -0,0 +1,387 @@
+import threading
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+from utils.timing import FixedRateScheduler
+
+# ข้อมูลของแต่ละลำดับช่องสี: จำนวนช่อง, ตำแหน่งช่องแดง/เขียว/น้ำเงิน, รหัสแปลงเป็นสีเทา
+CHANNEL_LAYOUTS = {
+    "BGR": (3, 2, 1, 0, cv2.COLOR_BGR2GRAY),
+    "BGRA": (4, 2, 1, 0, cv2.COLOR_BGRA2GRAY),
+    "RGB": (3, 0, 1, 2, cv2.COLOR_RGB2GRAY),
+}
+
+
+class Frame:
+    """เฟรมหนึ่งช่องใน ring พร้อม buffer ที่จองไว้ล่วงหน้าแยกตามขนาดภาพ"""
+
+    __slots__ = ("data", "seq", "timestamp", "strip", "_buffers")
+
+    def __init__(self):
+        self.data = None
+        self.seq = 0
+        self.timestamp = 0.0
+        self.strip = False
+        self._buffers = {}
+
+    def ensure(self, shape):
+        """เลือก buffer ตามขนาดที่ต้องการ จองใหม่เฉพาะครั้งแรกของแต่ละขนาด
+
+        Returns:
+            bool: True ถ้ามีการจองหน่วยความจำใหม่
+        """
+        buffer = self._buffers.get(shape)
+        allocated = buffer is None
+        if allocated:
+            buffer = np.empty(shape, dtype=np.uint8)
+            self._buffers[shape] = buffer
+        self.data = buffer
+        return allocated
+
+
+class FrameRing:
+    """ring ของเฟรมที่จองไว้ล่วงหน้า ให้ตัวจับภาพเขียนทับวนไปโดยไม่จองหน่วยความจำใหม่"""
+
+    def __init__(self, slots=3):
+        self.frames = [Frame() for _ in range(slots)]
+        self.allocations = 0
+        self._index = -1
+
+    def acquire(self, shape):
+        """รับเฟรมช่องถัดไปใน ring ที่มี buffer ขนาดตามที่กำหนด"""
+        self._index = (self._index + 1) % len(self.frames)
+        return self.prepare(self.frames[self._index], shape)
+
+    def prepare(self, frame, shape):
+        """เตรียม buffer ของเฟรมที่กำหนดให้มีขนาดตามที่ต้องการ"""
+        if frame.ensure(shape):
+            self.allocations += 1
+        return frame
+
+
+class LatestFrameSlot:
+    """ช่องเก็บ "เฟรมล่าสุด" ระหว่างเธรดจับภาพกับเธรดตัดสินใจ (triple buffer)
+
+    ใช้เฟรม 3 ช่องจาก ring: ช่องที่เธรดจับภาพกำลังเขียน (back), ช่องเฟรมล่าสุด
+    ที่พร้อมใช้ (ready) และช่องที่เธรดตัดสินใจถืออยู่ (front) การสลับช่องทำภายใต้ lock
+    จึงไม่มีการเขียนทับเฟรมที่กำลังถูกใช้ และเฟรมแต่ละเฟรมถูกใช้ได้ไม่เกินหนึ่งครั้ง
+    """
+
+    def __init__(self, ring):
+        self._frames = ring.frames
+        self._back, self._ready, self._front = 0, 1, 2
+        self._fresh = False
+        self._condition = threading.Condition()
+
+    @property
+    def back_frame(self):
+        """เฟรมที่เธรดจับภาพใช้เขียนภาพถัดไป"""
+        return self._frames[self._back]
+
+    def publish(self):
+        """ประกาศ back_frame เป็นเฟรมล่าสุด (เฟรมเดิมที่ยังไม่ถูกใช้จะถูกทิ้ง)"""
+        with self._condition:
+            self._back, self._ready = self._ready, self._back
+            self._fresh = True
+            self._condition.notify()
+
+    def take(self, timeout=None):
+        """รับเฟรมล่าสุดที่ยังไม่เคยถูกใช้
+
+        Args:
+            timeout: เวลารอสูงสุด (วินาที) เมื่อยังไม่มีเฟรมใหม่
+
+        Returns:
+            Frame: เฟรมล่าสุด หรือ None ถ้าไม่มีเฟรมใหม่ภายในเวลาที่กำหนด
+        """
+        with self._condition:
+            if not self._fresh and not self._condition.wait(timeout):
+                return None
+            if not self._fresh:
+                return None
+            self._front, self._ready = self._ready, self._front
+            self._fresh = False
+            return self._frames[self._front]
+
+
+class FrameWorkspace:
+    """buffer ผลลัพธ์ที่ใช้ซ้ำทุกเฟรมสำหรับการคำนวณของ detector
+
+    ทำงานบนลำดับช่องสีของ backend โดยตรง จึงไม่ต้องแปลงภาพเป็น BGR ก่อน
+    """
+
+    def __init__(self, channel_order="BGR"):
+        (
+            self.channels,
+            self.red_index,
+            self.green_index,
+            self.blue_index,
+            self.gray_code,
+        ) = CHANNEL_LAYOUTS[channel_order]
+        self.channel_order = channel_order
+
+        self.shape = None
+        self.gray = None
+        self.mask = None
+        self.column_sum = None
+        self.allocations = 0
+        self._buffers = {}
+
+    def ensure(self, height, width):
+        """เลือก buffer ตามขนาดภาพ จองใหม่เฉพาะครั้งแรกของแต่ละขนาด"""
+        shape = (height, width)
+        if self.shape == shape:
+            return
+        buffers = self._buffers.get(shape)
+        if buffers is None:
+            buffers = self._buffers[shape] = (
+                np.empty(shape, dtype=np.uint8),
+                np.empty(shape, dtype=np.uint8),
+                np.empty((1, width), dtype=np.int32),
+            )
+            self.allocations += 1
+        self.shape = shape
+        self.gray, self.mask, self.column_sum = buffers
+
+
+class AllocationProbe:
+    """วัดหน่วยความจำที่ถูกจองชั่วคราวต่อเฟรมด้วย tracemalloc
+
+    ใช้ตรวจสอบว่าเส้นทางของเฟรมไม่จอง buffer ขนาดภาพต่อเฟรม ขั้นตรวจจับยังมีวัตถุ Python
+    ขนาดเล็กจำนวนคงที่ (เช่น view ของ numpy และผลจาก cv2) ซึ่งไม่เพิ่มตามขนาดภาพ
+    ค่าที่สูงกว่านั้นคือ buffer ที่หลุดจากการจองล่วงหน้า
+    (tracemalloc ทำให้ช้าลง จึงเปิดเฉพาะเมื่อ frame_alloc_probe เป็น True
+    และนับรวมทุกเธรด จึงวัดได้แม่นยำเมื่อไม่ได้ใช้เธรดจับภาพ)
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self._start = 0
+        self._owns_tracing = False
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracing = True
+
+    def stop(self):
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+
+    def begin(self):
+        """เริ่มวัดช่วงใหม่"""
+        tracemalloc.reset_peak()
+        self._start = tracemalloc.get_traced_memory()[0]
+
+    def end(self, stage):
+        """จบการวัดและบันทึกจำนวนไบต์สูงสุดที่ถูกจองระหว่างช่วงนั้น"""
+        peak = tracemalloc.get_traced_memory()[1]
+        churn = peak - self._start
+        stats = self.stages.get(stage)
+        if stats is None:
+            stats = self.stages[stage] = [0, 0, 0]
+        stats[0] += 1
+        stats[1] += churn
+        if churn > stats[2]:
+            stats[2] = churn
+
+    def get_stats(self):
+        """รับสถิติหน่วยความจำต่อเฟรมของแต่ละช่วง
+
+        Returns:
+            dict: {stage: {"frames", "avg_bytes", "max_bytes"}}
+        """
+        return {
+            stage: {
+                "frames": count,
+                "avg_bytes": total / count if count else 0.0,
+                "max_bytes": peak,
+            }
+            for stage, (count, total, peak) in self.stages.items()
+        }
+
+
+class FramePipeline:
+    """เส้นทางของเฟรมจากตัวจับภาพเข้าสู่ ring buffer ที่จองไว้ล่วงหน้า
+
+    ทำงานได้ 2 แบบ: จับภาพในเธรดที่เรียก next_frame() โดยตรง หรือให้เธรดจับภาพแยก
+    ประกาศเฟรมล่าสุดลงใน LatestFrameSlot แล้ว next_frame() รับเฉพาะเฟรมใหม่ล่าสุด
+    """
+
+    def __init__(
+        self,
+        capture,
+        region,
+        slots=3,
+        probe_allocations=False,
+        strip_rows=None,
+        threaded=False,
+        rate_hz=0,
+    ):
+        """
+        Args:
+            capture: CaptureBackend ที่ใช้จับภาพ
+            region: พื้นที่ (x1, y1, x2, y2) บนหน้าจอ
+            slots: จำนวนเฟรมใน ring (อย่างน้อย 3 เมื่อใช้เธรดจับภาพ)
+            probe_allocations: วัดการจองหน่วยความจำต่อเฟรมด้วย tracemalloc
+            strip_rows: จำนวนแถวของแถบรอบเส้นกลางเกจ (None = จับทั้งพื้นที่เสมอ)
+            threaded: จับภาพในเธรดแยกจากเธรดตัดสินใจ
+            rate_hz: อัตราจับภาพของเธรดจับภาพ ควรเท่ากับอัตราของลูปตัดสินใจ
+                (0 = จับต่อเนื่องโดยไม่จำกัดอัตรา)
+        """
+        self.capture = capture
+        self.region = region
+        self.ring = FrameRing(max(slots, 3) if threaded else slots)
+        self.workspace = FrameWorkspace(capture.channel_order)
+
+        x1, y1, x2, y2 = region
+        channels = self.workspace.channels
+        self.shape = (y2 - y1, x2 - x1, channels)
+        self._seq = 0
+
+        # แถบแนวนอนรอบแถวกลางของเกจ (แถวที่ detector อ่านสีโซน)
+        # จัดให้แถวกลางของแถบตรงกับแถวกลางของพื้นที่เต็ม
+        self.strip_region = None
+        self.use_strip = False
+        self.strip_frames = 0
+        self.full_frames = 0
+        self.strip_fallbacks = 0
+        if strip_rows and strip_rows < y2 - y1:
+            top = y1 + (y2 - y1) // 2 - strip_rows // 2
+            self.strip_region = (x1, top, x2, top + strip_rows)
+            self.strip_shape = (strip_rows, x2 - x1, channels)
+
+        self.probe = None
+        if probe_allocations:
+            self.probe = AllocationProbe()
+            self.probe.start()
+
+        # เธรดจับภาพและสถิติฝั่งผู้ใช้เฟรม
+        self.threaded = threaded
+        self.rate_hz = rate_hz
+        self._slot = LatestFrameSlot(self.ring) if threaded else None
+        self._thread = None
+        self._running = False
+        self._last_seq = 0
+        self.consumed_frames = 0
+        self.dropped_frames = 0
+        self.total_frame_age = 0.0
+
+    def start(self):
+        """เริ่มเธรดจับภาพ (ไม่มีผลเมื่อไม่ได้ใช้โหมดเธรด)"""
+        if not self.threaded or self._thread is not None:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self._thread.start()
+
+    def _capture_loop(self):
+        """ลูปของเธรดจับภาพ: จับภาพลง back frame แล้วประกาศเป็นเฟรมล่าสุด
+
+        จับตามอัตรา rate_hz เพื่อไม่ให้จับภาพทิ้งเกินกว่าที่ลูปตัดสินใจใช้
+        เฟรมที่ถูกข้ามจึงหมายถึงเฟรมที่ลูปตัดสินใจตามไม่ทันที่อัตรานั้นจริงๆ
+        """
+        scheduler = FixedRateScheduler(self.rate_hz)
+        while self._running:
+            try:
+                self._capture_into(self._slot.back_frame)
+                self._slot.publish()
+                if scheduler.period > 0:
+                    scheduler.wait()
+                else:
+                    time.sleep(0.001)
+            except Exception as e:
+                print(f"Error in capture thread: {e}")
+                time.sleep(1)
+
+    def set_strip(self, enabled):
+        """สลับระหว่างการจับเฉพาะแถบกับการจับทั้งพื้นที่
+
+        Args:
+            enabled: True เพื่อจับเฉพาะแถบ (มีผลเมื่อกำหนด strip_rows ไว้เท่านั้น)
+        """
+        enabled = enabled and self.strip_region is not None
+        if self.use_strip and not enabled:
+            self.strip_fallbacks += 1
+        self.use_strip = enabled
+
+    def _capture_into(self, frame):
+        """จับภาพ (แถบหรือทั้งพื้นที่) ลงในเฟรมที่กำหนด"""
+        strip = self.use_strip
+        if strip:
+            self.ring.prepare(frame, self.strip_shape)
+            frame.data = self.capture.grab_into(self.strip_region, frame.data)
+            self.strip_frames += 1
+        else:
+            self.ring.prepare(frame, self.shape)
+            frame.data = self.capture.grab_into(self.region, frame.data)
+            self.full_frames += 1
+        frame.strip = strip
+        self._seq += 1
+        frame.seq = self._seq
+        frame.timestamp = time.perf_counter()
+        return frame
+
+    def next_frame(self, timeout=0.1, require_full=False):
+        """รับเฟรมถัดไปสำหรับการตัดสินใจ
+
+        Args:
+            timeout: เวลารอเฟรมใหม่สูงสุด (วินาที) ในโหมดเธรด
+            require_full: ต้องการเฟรมทั้งพื้นที่ (ข้ามเฟรมแถบที่ค้างอยู่ในโหมดเธรด)
+
+        Returns:
+            Frame: เฟรมล่าสุด หรือ None ถ้าไม่มีเฟรมใหม่ภายในเวลาที่กำหนด
+        """
+        if not self.threaded:
+            # รับช่องตามขนาดที่จะจับจริง ไม่จองภาพทั้งพื้นที่ไว้เปล่าๆ ในโหมดแถบ
+            shape = self.strip_shape if self.use_strip else self.shape
+            frame = self._capture_into(self.ring.acquire(shape))
+        else:
+            frame = self._slot.take(timeout)
+            while frame is not None and require_full and frame.strip:
+                frame = self._slot.take(timeout)
+            if frame is None:
+                return None
+
+        # นับเฟรมที่ถูกข้ามไปเพราะมีเฟรมใหม่กว่ามาแทน
+        skipped = frame.seq - self._last_seq - 1
+        if skipped > 0:
+            self.dropped_frames += skipped
+        self._last_seq = frame.seq
+        self.consumed_frames += 1
+        self.total_frame_age += time.perf_counter() - frame.timestamp
+        return frame
+
+    def get_stats(self):
+        """รับสถิติของตัวจับภาพ การจองหน่วยความจำ เฟรมที่ถูกข้าม และผลจาก probe"""
+        stats = self.capture.get_stats()
+        stats["ring_allocations"] = self.ring.allocations
+        stats["workspace_allocations"] = self.workspace.allocations
+        stats["strip_frames"] = self.strip_frames
+        stats["full_frames"] = self.full_frames
+        stats["strip_fallbacks"] = self.strip_fallbacks
+        stats["captured_frames"] = self._seq
+        stats["consumed_frames"] = self.consumed_frames
+        stats["dropped_frames"] = self.dropped_frames
+        stats["avg_frame_age_ms"] = (
+            self.total_frame_age / self.consumed_frames * 1000
+            if self.consumed_frames
+            else 0.0
+        )
+        if self.probe is not None:
+            stats["allocations_per_frame"] = self.probe.get_stats()
+        return stats
+
+    def close(self):
+        """หยุดเธรดจับภาพและปล่อยทรัพยากรของ backend"""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self.capture.close()
+        if self.probe is not None:
+            self.probe.stop()
@@ -1,86 +1,141 @@
-import numpy as np
-import pyautogui
-import cv2
 import time
+from detector.capture import create_capture_backend
+from detector.controller import PIDController
+from detector.frame_pipeline import FramePipeline, FrameWorkspace
+from detector.gauge_layout import GaugeLayoutCache, measure_layout
+from detector.input_injector import ClickDispatcher, create_input_injector
+from detector.line_tracker import LinePredictor, LineTracker
+from detector.zone_scanner import ZoneScanner
+from utils.config_manager import ConfigSnapshot
 from utils.constants import DEFAULT_CONFIG
+from utils.timing import FixedRateScheduler, StageTimer
+
+# ข้อความสถานะของแต่ละโซน
+ZONE_STATUS_TEXT = {
+    "danger_left": "LEFT DANGER - Clicking!",
+    "caution_left": "LEFT CAUTION - Clicking!",
+    "danger_right": "RIGHT DANGER - Stop Clicking!",
+    "caution_right": "RIGHT CAUTION - Stop Clicking!",
+    "safe": "SAFE ZONE - Clicking!",
+}
+
+# ข้อความสถานะของแต่ละโซนในโหมดกดค้าง
+ZONE_HOLD_TEXT = {
+    "danger_left": "LEFT DANGER - Holding!",
+    "caution_left": "LEFT CAUTION - Holding!",
+    "danger_right": "RIGHT DANGER - Released!",
+    "caution_right": "RIGHT CAUTION - Released!",
+    "safe": "SAFE ZONE - Holding!",
+}
+
+# โซนที่ต้องคลิก (หรือกดค้าง) เพื่อดึงเส้นไปทางขวา
+CLICK_ZONES = ("safe", "caution_left", "danger_left")
+
+# ประเภทสถานะที่แสดงใน UI ของแต่ละโซน
+ZONE_STATUS_TYPE = {
+    "danger_left": "danger",
+    "caution_left": "warning",
+    "danger_right": "danger",
+    "caution_right": "warning",
+    "safe": "success",
+}
 
 
 class GaugeDetector:
     def __init__(self, app):
         self.app = app
 
-        # ตั้งค่าเริ่มต้นด้วยค่า DEFAULT_CONFIG
-        self.config = DEFAULT_CONFIG.copy()
+        # ตั้งค่าเริ่มต้นด้วยค่า DEFAULT_CONFIG (snapshot แบบอ่านอย่างเดียว)
+        self.config = ConfigSnapshot()
 
         # ตัวแปรควบคุมการคลิก
-        self.last_action_time = time.time()
+        self.last_action_time = time.perf_counter()
 
-    def update_config(self):
-        """อัปเดตค่าการตั้งค่าจาก app.config_manager หากมี"""
-        try:
-            if (
-                hasattr(self.app, "config_manager")
-                and self.app.config_manager is not None
-            ):
-                # ตรวจสอบและอัปเดตค่าที่จำเป็น
-                for key in DEFAULT_CONFIG:
-                    if key in self.app.config_manager.config:
-                        self.config[key] = self.app.config_manager.config[key]
-            elif hasattr(self.app, "config") and self.app.config is not None:
-                # ใช้ app.config แบบเดิมหากไม่มี config_manager
-                for key in DEFAULT_CONFIG:
-                    if hasattr(self.app.config, key):
-                        self.config[key] = getattr(self.app.config, key)
-        except Exception as e:
-            print(f"Error updating config: {e}")
-            # ในกรณีที่เกิดข้อผิดพลาด ใช้ค่า DEFAULT_CONFIG
+        # เส้นทางของเฟรม (สร้างเมื่อเริ่มลูปตามค่า capture_backend)
+        self.pipeline = None
 
-    def detect_color_zone(self, image, line_x, region_y):
-        """ตรวจสอบว่าตำแหน่งที่กำหนดอยู่ในโซนสีใด (แดง/เขียว)"""
-        try:
-            # ตรวจสอบว่าตำแหน่งอยู่ในขอบเขตของภาพ
-            h, w = image.shape[:2]
-            if line_x < 0 or line_x >= w or region_y < 0 or region_y >= h:
-                return "unknown"
+        # ตัวส่งการคลิก (สร้างเมื่อเริ่มลูปตามค่า input_backend)
+        self.clicker = None
 
-            # ดึงค่าสีที่ตำแหน่งนั้น
-            color = image[region_y, line_x]  # [B, G, R]
+        # buffer ที่ใช้ซ้ำในการคำนวณ (เปลี่ยนตามลำดับช่องสีของ backend)
+        self.workspace = FrameWorkspace("BGR")
+        self.zone_scanner = ZoneScanner(self.workspace)
+        self.line_tracker = LineTracker(self.workspace)
 
-            # ตรวจสอบว่ามีองค์ประกอบสีเขียวสูงกว่าอย่างชัดเจน
-            if color[1] > 1.5 * max(color[0], color[2]) and color[1] > 100:
-                return "green"
+        # ผลการระบุตำแหน่งเส้นขาวล่าสุด (LineFix) และจำนวนเฟรมที่ความมั่นใจต่ำ
+        self.last_line_fix = None
+        self.low_confidence_frames = 0
 
-            # ตรวจสอบว่ามีองค์ประกอบสีแดงสูงกว่าอย่างชัดเจน
-            if color[2] > 1.5 * max(color[0], color[1]) and color[2] > 100:
-                return "red"
+        # ตัวประมาณตำแหน่ง/ความเร็วของเส้นขาวสำหรับทำนายตำแหน่ง ณ เวลาที่คลิกไปถึง
+        self.line_predictor = LinePredictor()
 
-            return "unknown"
-        except Exception as e:
-            print(f"Error in detect_color_zone: {e}")
-            return "unknown"
+        # ตัวควบคุม PID สำหรับโหมด control_mode = "pid"
+        self.controller = PIDController()
 
-    def find_white_line(self, image):
-        """หาตำแหน่งของเส้นขาวแนวตั้ง"""
-        try:
-            # แปลงเป็นโทนสีเทา
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        # ช่วงโซนสีและขอบเขตโซนที่วัดได้จากเฟรมล่าสุด
+        self.zone_segments = []
+        self.zone_layout = None
+        self.measured_zone_frames = 0
+        self.fallback_zone_frames = 0
 
-            # ใช้ค่า line_threshold จากการตั้งค่า
-            line_threshold = self.config.get(
-                "line_threshold", DEFAULT_CONFIG["line_threshold"]
-            )
+        # layout ของเกจที่จำไว้ระหว่างการดึงปลา (ตรวจซ้ำด้วยพิกเซลตัวอย่าง)
+        self.layout_cache = GaugeLayoutCache()
 
-            # หาเส้นขาว
-            _, thresh = cv2.threshold(gray, line_threshold, 255, cv2.THRESH_BINARY)
+        # ตัวจับเวลาแต่ละขั้นตอนของลูป (None เมื่อปิด stage_timing)
+        self.stage_timer = None
 
-            # หาตำแหน่งของเส้นแนวตั้ง (คอลัมน์ที่มีพิกเซลสีขาวเยอะที่สุด)
-            column_sum = np.sum(thresh, axis=0)
+    def update_config(self):
+        """รับ snapshot การตั้งค่าล่าสุดจาก app.config_manager หากมี
 
-            if np.max(column_sum) > 0:
-                # คืนค่าตำแหน่ง x ที่มีผลรวมสูงสุด
-                return np.argmax(column_sum)
+        สลับ snapshot เฉพาะเมื่อ version เปลี่ยน รอบปกติจึงไม่มีงานเกี่ยวกับ config
+        """
+        try:
+            config_manager = getattr(self.app, "config_manager", None)
+            if config_manager is not None:
+                snapshot = config_manager.snapshot
+                if snapshot.version != self.config.version:
+                    self.config = snapshot
+            elif getattr(self.app, "config", None) is not None:
+                # ใช้ app.config แบบเดิมหากไม่มี config_manager
+                self.config = ConfigSnapshot(
+                    {
+                        key: getattr(self.app.config, key)
+                        for key in DEFAULT_CONFIG
+                        if hasattr(self.app.config, key)
+                    }
+                )
+        except Exception as e:
+            print(f"Error updating config: {e}")
+            # ในกรณีที่เกิดข้อผิดพลาด ใช้ snapshot เดิม
 
-            return None
+    def find_white_line(self, image):
+        """หาตำแหน่งของเส้นขาวแนวตั้ง
+
+        Returns:
+            float: ตำแหน่ง x แบบละเอียดกว่าพิกเซล หรือ None ถ้าไม่พบ
+                (รายละเอียดความกว้างและความมั่นใจเก็บไว้ใน self.last_line_fix)
+        """
+        self.last_line_fix = None
+        try:
+            # ใช้ค่า line_threshold จากการตั้งค่า
+            line_threshold = self.config.line_threshold
+
+            tracker = self.line_tracker
+            # โหมดติดตาม: ค้นหารอบตำแหน่งเดิมก่อน แล้วค่อยสแกนทั้งความกว้างเมื่อไม่พบ
+            if self.config.line_tracking:
+                tracker.margin = self.config.line_search_margin
+                tracker.velocity_gain = self.config.line_velocity_gain
+                peak_x = tracker.locate(image, line_threshold)
+            else:
+                # คอลัมน์ที่มีพิกเซลสีขาวเยอะที่สุด
+                peak_x, _ = tracker.scan(image, line_threshold)
+
+            if peak_x is None:
+                return None
+
+            # ระบุตำแหน่งแบบละเอียดและความมั่นใจรอบจุดสูงสุด
+            self.last_line_fix = tracker.measure(self.config.max_line_width)
+            return self.last_line_fix.x
         except Exception as e:
             print(f"Error in find_white_line: {e}")
             return None
@@ -88,64 +143,289 @@ class GaugeDetector:
     def check_gauge_components(self, image):
         """ตรวจสอบองค์ประกอบของเกจ (เส้นขาว, โซนสีเขียว, โซนสีแดง)"""
         try:
-            h, w = image.shape[:2]
-
             # 1. หาเส้นขาว
             white_line_x = self.find_white_line(image)
+            if self.stage_timer is not None:
+                self.stage_timer.lap("line")
             if white_line_x is None:
+                # เกจหายไป (จบการดึงปลา) ต้องเรียนรู้ layout ใหม่ในครั้งถัดไป
+                self.zone_layout = None
+                self.layout_cache.invalidate()
                 return None, False, False
 
-            # 2. ตรวจหาสีเขียวและสีแดงในภาพ
-            y_middle = h // 2
+            # เส้นที่ไม่ชัดเจน (ความมั่นใจต่ำ) ถือว่าเกจไม่ครบ เพื่อไม่ให้คลิกจากตำแหน่งที่ไม่แน่นอน
+            if self.last_line_fix.confidence < self.config.min_line_confidence:
+                self.low_confidence_frames += 1
+                return white_line_x, False, False
 
-            found_green = False
-            found_red = False
+            zone_scan_rows = self.config.zone_scan_rows
+            min_zone_width = self.config.min_zone_width
+            zone_merge_gap = self.config.zone_merge_gap
+            use_cache = self.config.layout_cache
 
-            # สุ่มตรวจสอบจุดต่างๆ ในแนวนอนเพื่อระบุโซนสี
-            step = max(1, w // 20)  # แบ่งเป็น 20 ส่วน
+            # 2. ถ้ามี layout ที่จำไว้และยังตรงกับเฟรมนี้ ไม่ต้องสแกนทั้งแถว
+            if use_cache and self.layout_cache.verify(
+                self.zone_scanner, image, white_line_x, zone_merge_gap, zone_scan_rows
+            ):
+                self.zone_segments = self.layout_cache.segments
+                self.zone_layout = self.layout_cache.layout
+                return white_line_x, True, True
 
-            for x in range(0, w, step):
-                zone = self.detect_color_zone(image, x, y_middle)
+            # 3. จำแนกโซนสีของทั้งแถวกลาง (หรือแถบรอบแถวกลาง) ในครั้งเดียว
+            self.zone_segments = self.zone_scanner.scan(image, zone_scan_rows)
 
-                if zone == "green":
+            # นับเฉพาะช่วงที่กว้างพอ เพื่อไม่ให้พิกเซลรบกวนถูกนับเป็นโซน
+            found_green = False
+            found_red = False
+            for segment in self.zone_segments:
+                if segment.end - segment.start < min_zone_width:
+                    continue
+                if segment.zone == "green":
                     found_green = True
-                elif zone == "red":
+                elif segment.zone == "red":
                     found_red = True
 
-                # หากพบทั้งสองสีแล้ว ไม่จำเป็นต้องตรวจสอบเพิ่ม
-                if found_green and found_red:
-                    break
+            # 4. วัดขอบเขตโซนจริงจากภาพ (ค่าสัดส่วนใน config ใช้เมื่อวัดไม่ได้เท่านั้น)
+            self.zone_layout = None
+            if self.config.measured_zones:
+                self.zone_layout = measure_layout(
+                    self.zone_segments,
+                    image.shape[1],
+                    self.config.buffer_zone_size,
+                    min_zone_width,
+                    zone_merge_gap,
+                )
+
+            # 5. จำ layout ไว้ใช้กับเฟรมถัดไปเมื่อพบเกจครบ
+            if use_cache and found_green and found_red:
+                cache = self.layout_cache
+                cache.samples_per_zone = self.config.layout_verify_samples
+                cache.tolerance = self.config.layout_verify_tolerance
+                cache.min_zone_width = min_zone_width
+                cache.learn(self.zone_segments, self.zone_layout, image, white_line_x)
 
             return white_line_x, found_green, found_red
         except Exception as e:
             print(f"Error in check_gauge_components: {e}")
             return None, False, False
 
-    def get_gauge_zone(self, relative_pos):
-        """ระบุว่าตำแหน่งในเกจอยู่ในโซนใด"""
-        # อัปเดตค่าจากการตั้งค่า
-        red_zone_threshold = self.config.get(
-            "red_zone_threshold", DEFAULT_CONFIG["red_zone_threshold"]
+    def report_session(self, scheduler, timer, strip_mode):
+        """พิมพ์สรุปผลเมื่อจบการทำงาน
+
+        ปกติพิมพ์เพียงบรรทัดเดียว รายละเอียดของแต่ละส่วน (การจับภาพ, การคลิก, การติดตามเส้น,
+        cache, เวลาของแต่ละขั้นตอน) พิมพ์เมื่อเปิด session_report หรือ frame_alloc_probe
+
+        Args:
+            scheduler: FixedRateScheduler ของลูป
+            timer: StageTimer ของลูป (None ถ้าปิดการจับเวลา)
+            strip_mode: True ถ้าใช้การจับภาพแบบแถบ
+        """
+        stats = self.pipeline.get_stats()
+        loop_stats = scheduler.get_stats()
+        click_stats = self.clicker.get_stats()
+        print(
+            f"Session: {loop_stats['ticks']} frames at {loop_stats['actual_hz']:.1f} Hz "
+            f"(target {loop_stats['target_hz']} Hz), "
+            f"capture avg {stats['avg_ms']:.2f} ms, "
+            f"{click_stats['clicks']} clicks, "
+            f"{click_stats['transitions']} hold transitions, "
+            f"{self.low_confidence_frames} low-confidence frames"
+        )
+        if not (self.config.session_report or self.config.frame_alloc_probe):
+            return
+
+        print(
+            f"Capture backend {stats['backend']}: {stats['grabs']} grabs, "
+            f"avg {stats['avg_ms']:.2f} ms, max {stats['max_ms']:.2f} ms "
+            f"(~{stats['max_hz']:.0f} Hz)"
+        )
+        print(
+            f"Frame buffers allocated: ring {stats['ring_allocations']}, "
+            f"workspace {stats['workspace_allocations']}"
+        )
+        print(
+            f"Zone classification: {self.measured_zone_frames} measured, "
+            f"{self.fallback_zone_frames} from config fractions"
+        )
+        print(
+            f"Loop rate: {loop_stats['actual_hz']:.1f} Hz "
+            f"(target {loop_stats['target_hz']} Hz), jitter "
+            f"p50 {loop_stats['p50_jitter_ms']:.2f} ms, "
+            f"p99 {loop_stats['p99_jitter_ms']:.2f} ms, "
+            f"max {loop_stats['max_jitter_ms']:.2f} ms, "
+            f"{loop_stats['overruns']} overruns"
+        )
+        print(
+            f"Input backend {click_stats['backend']}: {click_stats['clicks']} clicks, "
+            f"{click_stats['transitions']} hold transitions, "
+            f"avg {click_stats['avg_ms']:.2f} ms, max {click_stats['max_ms']:.2f} ms"
+        )
+        tracker_stats = self.line_tracker.get_stats()
+        print(
+            f"Line tracking: {tracker_stats['hits']} window hits, "
+            f"{tracker_stats['misses']} misses, "
+            f"{tracker_stats['full_scans']} full scans, "
+            f"avg {tracker_stats['avg_columns']:.0f} columns searched, "
+            f"{self.low_confidence_frames} low-confidence frames"
+        )
+        predictor_stats = self.line_predictor.get_stats()
+        print(
+            f"Line prediction: {predictor_stats['updates']} updates, "
+            f"avg residual {predictor_stats['avg_residual']:.2f} px"
+        )
+        cache_stats = self.layout_cache.get_stats()
+        print(
+            f"Layout cache: {cache_stats['learns']} learned, "
+            f"{cache_stats['hits']} verified frames, "
+            f"{cache_stats['invalidations']} invalidations"
+        )
+        print(
+            f"Decision frames: {stats['consumed_frames']} used of "
+            f"{stats['captured_frames']} captured, "
+            f"{stats['dropped_frames']} skipped as stale, "
+            f"avg frame age {stats['avg_frame_age_ms']:.2f} ms"
         )
-        buffer_zone_size = self.config.get(
-            "buffer_zone_size", DEFAULT_CONFIG["buffer_zone_size"]
+        if strip_mode:
+            print(
+                f"Strip capture: {stats['strip_frames']} strip / "
+                f"{stats['full_frames']} full frames, "
+                f"{stats['strip_fallbacks']} fallbacks"
+            )
+        for stage, alloc in stats.get("allocations_per_frame", {}).items():
+            print(
+                f"Allocations per frame [{stage}]: avg {alloc['avg_bytes']:.0f} B, "
+                f"max {alloc['max_bytes']} B over {alloc['frames']} frames"
+            )
+        if timer is not None:
+            for stage, stage_stats in timer.get_stats().items():
+                print(
+                    f"Stage [{stage}]: {stage_stats['count']} samples, "
+                    f"avg {stage_stats['avg_ms']:.3f} ms, "
+                    f"p50 {stage_stats['p50_ms']:.3f} ms, "
+                    f"p99 {stage_stats['p99_ms']:.3f} ms, "
+                    f"max {stage_stats['max_ms']:.3f} ms "
+                    f"({stage_stats['share']:.0%} of frame)"
+                )
+
+    def export_stage_timing(self, path):
+        """ส่งออกเวลาของแต่ละขั้นตอนในลูปเป็น JSON หรือ CSV (เรียกระหว่างทำงานได้)
+
+        Args:
+            path: ที่อยู่ไฟล์ (.json หรือ .csv)
+
+        Returns:
+            bool: True ถ้าส่งออกสำเร็จ
+        """
+        if self.stage_timer is None:
+            print("Stage timing is disabled")
+            return False
+        try:
+            self.stage_timer.export(path)
+            print(f"Stage timing exported to {path}")
+            return True
+        except OSError as e:
+            print(f"Error exporting stage timing: {e}")
+            return False
+
+    def predict_line_position(self, white_line_x, timestamp, gauge_width):
+        """ปรับตัวประมาณด้วยตำแหน่งที่วัดได้ แล้วทำนายตำแหน่ง ณ เวลาที่คลิกจะไปถึงเกม
+
+        Args:
+            white_line_x: ตำแหน่งเส้นขาวที่วัดได้ (พิกเซล)
+            timestamp: เวลาที่จับภาพเฟรมนั้น (time.perf_counter)
+            gauge_width: ความกว้างของพื้นที่เกจ (พิกเซล)
+
+        Returns:
+            float: ตำแหน่งสัมพัทธ์ (0.0 - 1.0) ที่ใช้ตัดสินใจ
+        """
+        predictor = self.line_predictor
+        predictor.alpha = self.config.predictor_alpha
+        predictor.beta = self.config.predictor_beta
+        predictor.update(white_line_x, timestamp)
+
+        if not self.config.line_prediction:
+            return white_line_x / gauge_width
+
+        # ทำนายล่วงหน้าเท่ากับอายุของเฟรม (นับจาก timestamp) บวกเวลาที่ใช้ส่งคลิกที่วัดได้
+        # และเวลาที่เกมใช้รับคลิก (prediction_lead)
+        lead = self.config.prediction_lead
+        if self.clicker is not None:
+            lead += self.clicker.avg_latency
+        predicted_x = predictor.predict(time.perf_counter() + lead)
+        return min(max(predicted_x / gauge_width, 0.0), 1.0)
+
+    def update_controller(self, relative_pos, gauge_width, action_cooldown):
+        """ปรับตัวควบคุม PID ด้วยตำแหน่งล่าสุด และตรวจว่าถึงจังหวะคลิกหรือไม่
+
+        Args:
+            relative_pos: ตำแหน่งสัมพัทธ์ของเส้นที่ใช้ตัดสินใจ (0.0 - 1.0)
+            gauge_width: ความกว้างของพื้นที่เกจ (พิกเซล)
+            action_cooldown: ช่วงเวลาสั้นที่สุดระหว่างคลิก (วินาที)
+
+        Returns:
+            bool: True ถ้าควรคลิกในรอบนี้
+        """
+        controller = self.controller
+        controller.kp = self.config.pid_kp
+        controller.ki = self.config.pid_ki
+        controller.kd = self.config.pid_kd
+        controller.bias = self.config.pid_bias
+
+        # เป้าหมายคือกลางโซนเขียวที่วัดได้ (หรือกลางเกจถ้าวัดไม่ได้)
+        if self.zone_layout is not None:
+            target = (self.zone_layout.green_start + self.zone_layout.green_end) / 2
+        else:
+            target = 0.5
+
+        return controller.update(
+            relative_pos,
+            self.line_predictor.velocity / gauge_width,
+            target,
+            time.perf_counter(),
+            action_cooldown,
         )
 
-        # คำนวณขอบเขตของโซน
-        safe_zone_min = red_zone_threshold + buffer_zone_size
-        safe_zone_max = 1.0 - red_zone_threshold - buffer_zone_size
-
-        # ระบุโซน
-        if relative_pos < red_zone_threshold:
-            return "danger_left", "LEFT DANGER - Clicking!"
-        elif relative_pos < safe_zone_min:
-            return "caution_left", "LEFT CAUTION - Clicking!"
-        elif relative_pos > (1.0 - red_zone_threshold):
-            return "danger_right", "RIGHT DANGER - Stop Clicking!"
-        elif relative_pos > safe_zone_max:
-            return "caution_right", "RIGHT CAUTION - Stop Clicking!"
+    def set_hold(self, held, current_time, min_interval):
+        """เปลี่ยนสถานะกดค้าง โดยเว้นระยะอย่างน้อย min_interval ระหว่างการเปลี่ยน
+
+        ป้องกันการกด/ปล่อยสลับไปมาเมื่อเส้นอยู่บนขอบโซนพอดี
+
+        Args:
+            held: True เพื่อกดค้าง, False เพื่อปล่อย
+            current_time: เวลาปัจจุบัน
+            min_interval: ระยะห่างขั้นต่ำระหว่างการเปลี่ยนสถานะ (action_cooldown)
+        """
+        if held == self.clicker.held:
+            return
+        if current_time - self.last_action_time < min_interval:
+            return
+        self.clicker.set_hold(held)
+        self.last_action_time = current_time
+
+    def get_gauge_zone(self, relative_pos):
+        """ระบุว่าตำแหน่งในเกจอยู่ในโซนใด"""
+        # ใช้ขอบเขตโซนที่วัดได้จากภาพก่อน
+        if self.zone_layout is not None:
+            self.measured_zone_frames += 1
+            zone = self.zone_layout.zone_of(relative_pos)
+            return zone, ZONE_STATUS_TEXT[zone]
+
+        # ถ้าวัดไม่ได้ ใช้สัดส่วนคงที่จากการตั้งค่า
+        self.fallback_zone_frames += 1
+        config = self.config
+
+        # ระบุโซน (ขอบเขตคำนวณไว้ล่วงหน้าใน snapshot)
+        if relative_pos < config.red_zone_threshold:
+            zone = "danger_left"
+        elif relative_pos < config.safe_zone_min:
+            zone = "caution_left"
+        elif relative_pos > config.danger_right_min:
+            zone = "danger_right"
+        elif relative_pos > config.safe_zone_max:
+            zone = "caution_right"
         else:
-            return "safe", "SAFE ZONE - Clicking!"
+            zone = "safe"
+        return zone, ZONE_STATUS_TEXT[zone]
 
     def fishing_loop(self, region, ui):
         """การทำงานหลักสำหรับตรวจจับและคลิก"""
@@ -155,83 +435,208 @@ class GaugeDetector:
         x1, y1, x2, y2 = region
         gauge_width = x2 - x1
 
-        last_line_detected_time = time.time()
+        last_line_detected_time = time.perf_counter()
         gauge_was_detected = False
         last_missing_gauge_click_time = 0
 
-        while self.app.running:
-            try:
-                self.update_config()
-
-                # อ่านค่า config ครั้งเดียวต่อรอบ
-                action_cooldown = self.config.get(
-                    "action_cooldown", DEFAULT_CONFIG["action_cooldown"]
-                )
-                first_click_delay = self.config.get(
-                    "first_click_delay", DEFAULT_CONFIG["first_click_delay"]
-                )
-                periodic_click_interval = self.config.get(
-                    "periodic_click_interval", DEFAULT_CONFIG["periodic_click_interval"]
-                )
-
-                screenshot = pyautogui.screenshot(region=(x1, y1, x2 - x1, y2 - y1))
-                screenshot_cv = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
-
-                white_line_x, found_green, found_red = self.check_gauge_components(
-                    screenshot_cv
-                )
-                current_time = time.time()
+        self.update_config()
+        capture = create_capture_backend(self.config.capture_backend)
+        strip_mode = self.config.strip_mode
+        self.pipeline = FramePipeline(
+            capture,
+            region,
+            probe_allocations=self.config.frame_alloc_probe,
+            strip_rows=(self.config.strip_rows if strip_mode else None),
+            threaded=self.config.capture_thread,
+            rate_hz=self.config.loop_rate_hz,
+        )
+        self.clicker = ClickDispatcher(
+            create_input_injector(self.config.input_backend),
+            threaded=self.config.input_thread,
+        )
+        self.workspace = self.pipeline.workspace
+        self.zone_scanner = ZoneScanner(self.workspace)
+        self.line_tracker = LineTracker(self.workspace)
+        self.line_predictor = LinePredictor()
+        self.controller = PIDController()
+        self.layout_cache = GaugeLayoutCache()
+        probe = self.pipeline.probe
+        scheduler = FixedRateScheduler(self.config.loop_rate_hz)
+        timer = self.stage_timer = StageTimer() if self.config.stage_timing else None
+        try:
+            self.pipeline.start()
+
+            while self.app.running:
+                try:
+                    if timer is not None:
+                        timer.start()
+
+                    self.update_config()
+
+                    # อ่านค่า config ครั้งเดียวต่อรอบ
+                    config = self.config
+                    action_cooldown = config.action_cooldown
+                    first_click_delay = config.first_click_delay
+                    periodic_click_interval = config.periodic_click_interval
+                    pid_mode = config.pid_mode
+                    hold_mode = config.hold_mode
+
+                    # จับภาพลงใน ring และตรวจจับบนลำดับช่องสีเดิมของ backend
+                    if probe:
+                        probe.begin()
+                    frame = self.pipeline.next_frame()
+                    if probe:
+                        probe.end("capture")
+                    if frame is None:
+                        # ยังไม่มีเฟรมใหม่จากเธรดจับภาพ
+                        continue
+                    if timer is not None:
+                        timer.lap("capture")
+                    if probe:
+                        probe.begin()
+
+                    white_line_x, found_green, found_red = self.check_gauge_components(
+                        frame.data
+                    )
+                    if probe:
+                        probe.end("detect")
+                    if timer is not None:
+                        timer.lap("zones")
+
+                    # โหมดแถบ: ใช้แถบเมื่อยืนยันเกจได้ครบ ถ้าแถบยืนยันไม่ได้ให้จับทั้งพื้นที่ทันที
+                    if strip_mode:
+                        confirmed = (
+                            white_line_x is not None and found_green and found_red
+                        )
+                        if frame.strip and not confirmed:
+                            self.pipeline.set_strip(False)
+                            frame = self.pipeline.next_frame(require_full=True)
+                            if frame is None:
+                                continue
+                            if timer is not None:
+                                timer.lap("capture")
+                            white_line_x, found_green, found_red = (
+                                self.check_gauge_components(frame.data)
+                            )
+                            if timer is not None:
+                                timer.lap("zones")
+                        elif not frame.strip and confirmed:
+                            self.pipeline.set_strip(True)
 
-                if white_line_x is not None and found_green and found_red:
-                    relative_pos = white_line_x / gauge_width
-                    gauge_was_detected = True
-                    last_line_detected_time = current_time
+                    current_time = time.perf_counter()
 
-                    ui.update_line_position(relative_pos)
-                    zone, status_text = self.get_gauge_zone(relative_pos)
-                    should_click = zone in ["safe", "caution_left", "danger_left"]
+                    if white_line_x is not None and found_green and found_red:
+                        relative_pos = white_line_x / gauge_width
+                        gauge_was_detected = True
+                        last_line_detected_time = current_time
 
-                    if should_click:
-                        if current_time - self.last_action_time > action_cooldown:
-                            pyautogui.click()
-                            self.last_action_time = current_time
-                            ui.update_status(
-                                status_text, "success" if zone == "safe" else "warning"
-                            )
-                    else:
-                        ui.update_status(status_text, "danger")
-
-                elif white_line_x is not None:
-                    ui.update_status("Incomplete gauge detected", "warning")
-                    if (
-                        current_time - last_missing_gauge_click_time
-                        >= periodic_click_interval
-                    ):
-                        pyautogui.click()
-                        last_missing_gauge_click_time = current_time
-                        ui.update_status(
-                            f"Incomplete gauge - Clicking every {periodic_click_interval}s",
-                            "warning",
+                        ui.update_line_position(relative_pos)
+                        decision_pos = self.predict_line_position(
+                            white_line_x, frame.timestamp, gauge_width
                         )
-
-                else:
-                    ui.update_status("No gauge detected", "warning")
-                    if gauge_was_detected:
-                        if current_time - last_line_detected_time >= first_click_delay:
-                            if (
-                                current_time - last_missing_gauge_click_time
-                                >= periodic_click_interval
+                        zone, status_text = self.get_gauge_zone(decision_pos)
+                        if timer is not None:
+                            timer.lap("decide")
+
+                        if pid_mode:
+                            # ตัวควบคุมกำหนดจังหวะคลิกเอง (อัตราสูงสุด 1 / action_cooldown)
+                            if self.update_controller(
+                                decision_pos, gauge_width, action_cooldown
                             ):
-                                pyautogui.click()
-                                last_missing_gauge_click_time = current_time
+                                if not hold_mode:
+                                    self.clicker.click()
+                                    self.last_action_time = current_time
+                            if hold_mode:
+                                # กดค้างเมื่อ duty เกินครึ่ง
+                                self.set_hold(
+                                    self.controller.duty >= 0.5,
+                                    current_time,
+                                    action_cooldown,
+                                )
+                            ui.update_status(
+                                f"PID CONTROL - Duty {self.controller.duty:.0%}",
+                                ZONE_STATUS_TYPE[zone],
+                            )
+                        elif hold_mode:
+                            # กดค้างในโซนที่ต้องคลิก ส่ง input เฉพาะเมื่อสถานะเปลี่ยน
+                            self.set_hold(
+                                zone in CLICK_ZONES, current_time, action_cooldown
+                            )
+                            ui.update_status(
+                                ZONE_HOLD_TEXT[zone], ZONE_STATUS_TYPE[zone]
+                            )
+                        elif zone in CLICK_ZONES:
+                            if current_time - self.last_action_time > action_cooldown:
+                                self.clicker.click()
+                                self.last_action_time = current_time
                                 ui.update_status(
-                                    f"No gauge - Clicking every {periodic_click_interval}s",
-                                    "warning",
+                                    status_text,
+                                    "success" if zone == "safe" else "warning",
                                 )
+                        else:
+                            ui.update_status(status_text, "danger")
+
+                    elif white_line_x is not None:
+                        self.clicker.set_hold(False)
+                        ui.update_status("Incomplete gauge detected", "warning")
+                        if (
+                            current_time - last_missing_gauge_click_time
+                            >= periodic_click_interval
+                        ):
+                            self.clicker.click()
+                            last_missing_gauge_click_time = current_time
+                            ui.update_status(
+                                f"Incomplete gauge - Clicking every {periodic_click_interval}s",
+                                "warning",
+                            )
 
-                time.sleep(0.01)
-
-            except Exception as e:
-                print(f"Error in fishing loop: {e}")
-                ui.update_status(f"Error: {str(e)[:20]}...", "danger")
-                time.sleep(1)
+                    else:
+                        self.line_predictor.reset()
+                        self.controller.reset()
+                        self.clicker.set_hold(False)
+                        ui.update_status("No gauge detected", "warning")
+                        if gauge_was_detected:
+                            if (
+                                current_time - last_line_detected_time
+                                >= first_click_delay
+                            ):
+                                if (
+                                    current_time - last_missing_gauge_click_time
+                                    >= periodic_click_interval
+                                ):
+                                    self.clicker.click()
+                                    last_missing_gauge_click_time = current_time
+                                    ui.update_status(
+                                        f"No gauge - Clicking every {periodic_click_interval}s",
+                                        "warning",
+                                    )
+
+                    if timer is not None:
+                        timer.lap("act")
+
+                    # เมื่อไม่จำกัดอัตรา พักสั้นๆ เพื่อคืน CPU
+                    # (ในโหมดเธรด การรอเฟรมใหม่ทำหน้าที่นี้แทน)
+                    if scheduler.period == 0 and not self.pipeline.threaded:
+                        time.sleep(0.001)
+
+                    # รอจนถึงรอบถัดไปตามอัตรา loop_rate_hz
+                    scheduler.wait()
+                    if timer is not None:
+                        timer.lap("wait")
+                        timer.end()
+
+                except Exception as e:
+                    print(f"Error in fishing loop: {e}")
+                    ui.update_status(f"Error: {str(e)[:20]}...", "danger")
+                    # ไม่กดเมาส์ค้างไว้ระหว่างพักหลังเกิดข้อผิดพลาด
+                    self.clicker.set_hold(False)
+                    time.sleep(1)
+
+            # สรุปผลเมื่อจบการทำงาน (รายละเอียดเมื่อเปิด session_report)
+            self.report_session(scheduler, timer, strip_mode)
+            if timer is not None and self.config.stage_timing_export:
+                self.export_stage_timing(self.config.stage_timing_export)
+        finally:
+            # ปิดเธรดจับภาพ/ส่งคลิกและปล่อยเมาส์เสมอ แม้ลูปหรือการรายงานผลจะล้มเหลว
+            self.pipeline.close()
+            self.clicker.close()
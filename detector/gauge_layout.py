@@ -0,0 +1,256 @@
+import numpy as np
+
+from detector.zone_scanner import ZONE_NAMES
+
+# ค่าสีของเส้นขาวที่ต่างจากที่จำไว้ได้สูงสุดต่อช่องสี
+LINE_COLOR_TOLERANCE = 64
+
+
+class GaugeLayout:
+    """ขอบเขตโซนจริงของเกจที่วัดจากภาพ (หน่วยเป็นสัดส่วนของความกว้างพื้นที่ 0.0 - 1.0)"""
+
+    __slots__ = (
+        "gauge_start",
+        "gauge_end",
+        "green_start",
+        "green_end",
+        "safe_start",
+        "safe_end",
+    )
+
+    def __init__(self, gauge_start, gauge_end, green_start, green_end, caution):
+        """
+        Args:
+            gauge_start: ขอบซ้ายของส่วนที่มีสีของเกจ
+            gauge_end: ขอบขวาของส่วนที่มีสีของเกจ
+            green_start: ขอบซ้ายของโซนเขียว
+            green_end: ขอบขวาของโซนเขียว
+            caution: ความกว้างของแถบระวังด้านในโซนเขียวแต่ละฝั่ง
+        """
+        self.gauge_start = gauge_start
+        self.gauge_end = gauge_end
+        self.green_start = green_start
+        self.green_end = green_end
+        self.safe_start = green_start + caution
+        self.safe_end = green_end - caution
+
+    def zone_of(self, relative_pos):
+        """ระบุโซนของตำแหน่งเทียบกับขอบเขตที่วัดได้
+
+        Returns:
+            str: "danger_left", "caution_left", "safe", "caution_right", "danger_right"
+        """
+        if relative_pos < self.green_start:
+            return "danger_left"
+        elif relative_pos < self.safe_start:
+            return "caution_left"
+        elif relative_pos >= self.green_end:
+            return "danger_right"
+        elif relative_pos >= self.safe_end:
+            return "caution_right"
+        else:
+            return "safe"
+
+
+def measure_layout(segments, width, buffer_zone_size, min_zone_width=3, max_gap=8):
+    """วัดขอบเขตโซนเขียว/แดงจากช่วงโซนสีของแถวกลางเกจ
+
+    ช่วงเขียวที่ถูกคั่นด้วยช่องว่างแคบๆ ที่ไม่ใช่สีของโซน (เช่นเส้นขาวที่อยู่บนโซนเขียว)
+    จะถูกรวมเป็นช่วงเดียว ส่วนช่วงแดงที่คั่นอยู่ไม่ว่าจะแคบเพียงใดจะแยกเป็นคนละช่วง
+    แล้วเลือกช่วงเขียวที่กว้างที่สุดเป็นโซนปลอดภัย
+
+    Args:
+        segments: รายการ ZoneSegment จาก ZoneScanner
+        width: ความกว้างของเฟรม (พิกเซล)
+        buffer_zone_size: ความกว้างของแถบระวัง (สัดส่วนของความกว้างเกจ)
+        min_zone_width: ความกว้างต่ำสุดของช่วงที่นับเป็นโซน (พิกเซล)
+        max_gap: ช่องว่างกว้างสุดระหว่างช่วงเขียวที่ยังถือเป็นโซนเดียวกัน (พิกเซล)
+
+    Returns:
+        GaugeLayout: ขอบเขตที่วัดได้ หรือ None ถ้าไม่พบทั้งโซนเขียวและโซนแดง
+    """
+    if not width:
+        return None
+
+    colored = [
+        segment
+        for segment in segments
+        if segment.zone != "unknown" and segment.end - segment.start >= min_zone_width
+    ]
+    if not any(segment.zone == "red" for segment in colored):
+        return None
+
+    # รวมช่วงเขียวที่คั่นด้วยช่วง unknown แคบๆ แล้วเลือกช่วงที่กว้างที่สุด
+    green_start = green_end = None
+    best_start = best_end = None
+    for segment in segments:
+        if segment.zone == "red":
+            green_end = None
+            continue
+        if segment.zone != "green" or segment.end - segment.start < min_zone_width:
+            continue
+        if green_end is not None and segment.start - green_end <= max_gap:
+            green_end = segment.end
+        else:
+            green_start, green_end = segment.start, segment.end
+        if best_start is None or green_end - green_start > best_end - best_start:
+            best_start, best_end = green_start, green_end
+
+    if best_start is None:
+        return None
+
+    gauge_start = colored[0].start
+    gauge_end = colored[-1].end
+
+    # แถบระวังคิดจากความกว้างเกจ แต่ไม่เกินหนึ่งในสามของโซนเขียว
+    caution = min(
+        buffer_zone_size * (gauge_end - gauge_start), (best_end - best_start) / 3
+    )
+
+    return GaugeLayout(
+        gauge_start / width,
+        gauge_end / width,
+        best_start / width,
+        best_end / width,
+        caution / width,
+    )
+
+
+class GaugeLayoutCache:
+    """จำ layout ของเกจไว้ตลอดการดึงปลาหนึ่งครั้ง แล้วตรวจซ้ำด้วยพิกเซลตัวอย่างไม่กี่จุด
+
+    ระหว่างการดึงปลา ตำแหน่งโซนเขียว/แดงไม่เปลี่ยน จึงสแกนทั้งแถวเพียงครั้งแรก
+    เฟรมถัดไปตรวจเฉพาะจุดตัวอย่างในแต่ละโซน (ข้ามจุดที่เส้นขาวทับอยู่)
+    ถ้าสีไม่ตรงเกินจำนวนที่ยอมรับได้ cache จะถูกล้างและกลับไปสแกนทั้งแถว
+    """
+
+    def __init__(self, samples_per_zone=3, tolerance=1, min_zone_width=3):
+        """
+        Args:
+            samples_per_zone: จำนวนจุดตัวอย่างในแต่ละช่วงโซน
+            tolerance: จำนวนจุดที่สีไม่ตรงได้สูงสุดก่อนถือว่า layout เปลี่ยน
+            min_zone_width: ความกว้างต่ำสุดของช่วงที่ใช้วางจุดตัวอย่าง (พิกเซล)
+        """
+        self.samples_per_zone = samples_per_zone
+        self.tolerance = tolerance
+        self.min_zone_width = min_zone_width
+
+        self.active = False
+        self.layout = None
+        self.segments = []
+        self.line_color = None
+        self.width = None
+        self._sample_xs = None
+        self._expected = None
+        self._mismatch = None
+        self._far = None
+        self._distance = None
+        self._color_diff = None
+
+        self.learns = 0
+        self.hits = 0
+        self.invalidations = 0
+
+    def learn(self, segments, layout, image, line_x):
+        """จำ layout ของเกจจากผลการสแกนเต็มแถว
+
+        Args:
+            segments: รายการ ZoneSegment ของแถวกลาง
+            layout: GaugeLayout ที่วัดได้ (None ถ้าไม่ได้ใช้ขอบเขตที่วัดจากภาพ)
+            image: เฟรมที่สแกน (ใช้จำสีของเส้นขาว)
+            line_x: ตำแหน่งเส้นขาวในเฟรมนั้น
+        """
+        xs = []
+        expected = []
+        for segment in segments:
+            if segment.zone == "unknown":
+                continue
+            width = segment.end - segment.start
+            if width < self.min_zone_width:
+                continue
+            for i in range(1, self.samples_per_zone + 1):
+                xs.append(segment.start + width * i // (self.samples_per_zone + 1))
+                expected.append(ZONE_NAMES.index(segment.zone))
+
+        if not xs:
+            self.invalidate()
+            return
+
+        self.active = True
+        self.layout = layout
+        self.segments = segments
+        self.width = image.shape[1]
+        self.line_color = image[image.shape[0] // 2, int(line_x)].astype(np.int16)
+        self._sample_xs = np.array(xs, dtype=np.intp)
+        self._expected = np.array(expected, dtype=np.uint8)
+        # buffer สำหรับ verify() ในเฟรมถัดไป (ไม่ต้องจองใหม่ทุกเฟรม)
+        self._mismatch = np.empty(len(xs), dtype=bool)
+        self._far = np.empty(len(xs), dtype=bool)
+        self._distance = np.empty(len(xs), dtype=np.float64)
+        self._color_diff = np.empty_like(self.line_color)
+        self.learns += 1
+
+    def verify(self, scanner, image, line_x, exclusion, band_rows=1):
+        """ตรวจว่า layout ที่จำไว้ยังตรงกับเฟรมปัจจุบัน
+
+        Args:
+            scanner: ZoneScanner สำหรับจำแนกสีของจุดตัวอย่าง
+            image: เฟรมปัจจุบัน
+            line_x: ตำแหน่งเส้นขาวในเฟรมปัจจุบัน
+            exclusion: ระยะรอบเส้นขาวที่ไม่ใช้ตรวจ (พิกเซล)
+            band_rows: จำนวนแถวรอบแถวกลางที่นำมาเฉลี่ย
+
+        Returns:
+            bool: True ถ้า layout ยังใช้ได้ (ถ้าไม่ได้ cache จะถูกล้าง)
+        """
+        if not self.active:
+            return False
+        if image.shape[1] != self.width:
+            self.invalidate()
+            return False
+
+        codes = scanner.classify_points(image, self._sample_xs, band_rows)
+        mismatch = np.not_equal(codes, self._expected, out=self._mismatch)
+        distance = np.subtract(self._sample_xs, line_x, out=self._distance)
+        np.abs(distance, out=distance)
+        np.greater(distance, exclusion, out=self._far)
+        np.logical_and(mismatch, self._far, out=mismatch)
+        mismatch_count = int(np.count_nonzero(mismatch))
+
+        # สีของเส้นขาวที่ต่างจากเดิมมาก (เช่นเกจของเกมเปลี่ยนไป) นับเป็นจุดที่ไม่ตรงด้วย
+        line_color = image[image.shape[0] // 2, int(line_x)]
+        color_diff = np.subtract(
+            line_color, self.line_color, out=self._color_diff, dtype=np.int16
+        )
+        np.abs(color_diff, out=color_diff)
+        if color_diff.max() > LINE_COLOR_TOLERANCE:
+            mismatch_count += 1
+
+        if mismatch_count > self.tolerance:
+            self.invalidate()
+            return False
+
+        self.hits += 1
+        return True
+
+    def invalidate(self):
+        """ล้าง layout ที่จำไว้ (เช่นเมื่อเกจหายไปหรือสีไม่ตรง)"""
+        if self.active:
+            self.invalidations += 1
+        self.active = False
+        self.layout = None
+        self.segments = []
+        self._sample_xs = None
+        self._expected = None
+        self._mismatch = None
+        self._far = None
+        self._distance = None
+        self._color_diff = None
+
+    def get_stats(self):
+        """รับสถิติการใช้ cache"""
+        return {
+            "learns": self.learns,
+            "hits": self.hits,
+            "invalidations": self.invalidations,
+        }
@@ -0,0 +1,279 @@
+import queue
+import sys
+import threading
+import time
+
+
+class InputInjector:
+    """คลาสพื้นฐานของตัวส่งการคลิกเมาส์"""
+
+    name = "base"
+
+    def click(self):
+        """คลิกเมาส์ซ้ายหนึ่งครั้ง ณ ตำแหน่งปัจจุบันของเคอร์เซอร์"""
+        self.press()
+        self.release()
+
+    def press(self):
+        """กดเมาส์ซ้ายค้างไว้"""
+        raise NotImplementedError
+
+    def release(self):
+        """ปล่อยเมาส์ซ้าย"""
+        raise NotImplementedError
+
+    def close(self):
+        """ปล่อยทรัพยากรที่ backend ถืออยู่"""
+        pass
+
+
+class PyAutoGuiInjector(InputInjector):
+    """คลิกด้วย pyautogui โดยข้ามการหน่วง PAUSE (0.1 วินาที) หลังทุกคำสั่ง
+
+    ใช้เป็นตัวสำรองเมื่อไม่มี backend ที่เร็วกว่า
+    """
+
+    name = "pyautogui"
+
+    def __init__(self):
+        import pyautogui
+
+        self._pyautogui = pyautogui
+
+    def press(self):
+        self._pyautogui.mouseDown(_pause=False)
+
+    def release(self):
+        self._pyautogui.mouseUp(_pause=False)
+
+
+class XTestInjector(InputInjector):
+    """คลิกผ่าน XTest extension ของ X11 โดยตรง (Linux)"""
+
+    name = "xtest"
+
+    def __init__(self):
+        from Xlib import X
+        from Xlib.display import Display
+        from Xlib.ext import xtest
+
+        self._X = X
+        self._xtest = xtest
+        self._open_display = Display
+
+        # ตรวจการเชื่อมต่อทันทีเพื่อให้ถอยไปใช้ backend อื่นได้เมื่อไม่มี DISPLAY หรือ XTEST
+        # แต่ปิดทิ้ง เพราะการเชื่อมต่อของ Xlib ใช้ได้เฉพาะในเธรดที่เปิด
+        display = Display()
+        try:
+            if not display.has_extension("XTEST"):
+                raise RuntimeError("X server does not support XTEST")
+        finally:
+            display.close()
+
+        # เปิดจริงครั้งแรกในเธรดส่งคลิก (เหมือน MssCapture)
+        self._display = None
+
+    def _send(self, event_type):
+        if self._display is None:
+            self._display = self._open_display()
+        self._xtest.fake_input(self._display, event_type, 1)
+        self._display.sync()
+
+    def press(self):
+        self._send(self._X.ButtonPress)
+
+    def release(self):
+        self._send(self._X.ButtonRelease)
+
+    def close(self):
+        if self._display is not None:
+            self._display.close()
+            self._display = None
+
+
+class SendInputInjector(InputInjector):
+    """คลิกผ่าน SendInput ของ Windows ด้วย ctypes"""
+
+    name = "sendinput"
+
+    MOUSEEVENTF_LEFTDOWN = 0x0002
+    MOUSEEVENTF_LEFTUP = 0x0004
+
+    def __init__(self):
+        if sys.platform != "win32":
+            raise ImportError("SendInput is only available on Windows")
+        import ctypes
+        from ctypes import wintypes
+
+        class MOUSEINPUT(ctypes.Structure):
+            _fields_ = [
+                ("dx", wintypes.LONG),
+                ("dy", wintypes.LONG),
+                ("mouseData", wintypes.DWORD),
+                ("dwFlags", wintypes.DWORD),
+                ("time", wintypes.DWORD),
+                ("dwExtraInfo", ctypes.c_size_t),
+            ]
+
+        class INPUT(ctypes.Structure):
+            _fields_ = [("type", wintypes.DWORD), ("mi", MOUSEINPUT)]
+
+        self._send_input = ctypes.windll.user32.SendInput
+        self._size = ctypes.sizeof(INPUT)
+        # สร้างโครงสร้างไว้ล่วงหน้า ไม่ต้องสร้างใหม่ทุกคลิก
+        self._down = INPUT(0, MOUSEINPUT(0, 0, 0, self.MOUSEEVENTF_LEFTDOWN, 0, 0))
+        self._up = INPUT(0, MOUSEINPUT(0, 0, 0, self.MOUSEEVENTF_LEFTUP, 0, 0))
+        self._byref = ctypes.byref
+
+    def press(self):
+        self._send_input(1, self._byref(self._down), self._size)
+
+    def release(self):
+        self._send_input(1, self._byref(self._up), self._size)
+
+
+# backend ที่รองรับ เรียงตามลำดับที่จะลองเมื่อเลือก "auto"
+INPUT_BACKENDS = {
+    "sendinput": SendInputInjector,
+    "xtest": XTestInjector,
+    "pyautogui": PyAutoGuiInjector,
+}
+
+
+def create_input_injector(name="auto"):
+    """สร้างตัวส่งการคลิกตามชื่อที่กำหนดใน config
+
+    ถ้า backend ที่เลือกใช้ไม่ได้ (ไม่ได้ติดตั้งไลบรารีหรือระบบไม่รองรับ)
+    จะถอยไปใช้ตัวถัดไป โดยมี pyautogui เป็นตัวสำรองสุดท้าย
+
+    Args:
+        name: ชื่อ backend ("auto", "sendinput", "xtest", "pyautogui")
+
+    Returns:
+        InputInjector: ตัวส่งการคลิกที่พร้อมใช้งาน
+    """
+    if name in INPUT_BACKENDS:
+        candidates = [name] + [key for key in INPUT_BACKENDS if key != name]
+    else:
+        if name != "auto":
+            print(f"Unknown input backend '{name}', using auto")
+        candidates = list(INPUT_BACKENDS)
+
+    for candidate in candidates:
+        try:
+            return INPUT_BACKENDS[candidate]()
+        except Exception as e:
+            # นอกจาก ImportError แล้ว XTest อาจเชื่อมต่อ X server ไม่ได้
+            print(f"Input backend '{candidate}' unavailable: {e}")
+
+    raise RuntimeError("No input injection backend available")
+
+
+class ClickDispatcher:
+    """ส่งการคลิกจากเธรดแยก เพื่อไม่ให้ลูปตรวจจับต้องรอการส่ง input
+
+    รองรับทั้งการคลิกทีละครั้ง และการกดค้าง/ปล่อย (ส่งเฉพาะเมื่อสถานะเปลี่ยน)
+    บันทึกเวลาตั้งแต่สั่งจนส่งเสร็จ (รวมเวลารอในคิว) ของทุกเหตุการณ์
+    """
+
+    def __init__(self, injector, threaded=True):
+        """
+        Args:
+            injector: InputInjector ที่ใช้ส่งการคลิก
+            threaded: True เพื่อส่งจากเธรดแยก, False เพื่อส่งในเธรดที่เรียกทันที
+        """
+        self.injector = injector
+        self.threaded = threaded
+
+        # สถานะการกดค้างที่สั่งไว้ล่าสุด
+        self.held = False
+
+        self.clicks = 0
+        self.transitions = 0
+        self.events = 0
+        self.total_latency = 0.0
+        self.last_latency = 0.0
+        self.max_latency = 0.0
+
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        if threaded:
+            self._thread = threading.Thread(target=self._worker, daemon=True)
+            self._thread.start()
+
+    def click(self):
+        """สั่งคลิกหนึ่งครั้ง (คืนค่าทันทีเมื่อใช้เธรดแยก)"""
+        self.clicks += 1
+        self._submit(self.injector.click)
+
+    def set_hold(self, held):
+        """สั่งกดค้างหรือปล่อยเมาส์ ส่ง input เฉพาะเมื่อสถานะเปลี่ยน
+
+        Args:
+            held: True เพื่อกดค้าง, False เพื่อปล่อย
+
+        Returns:
+            bool: True ถ้ามีการเปลี่ยนสถานะ
+        """
+        if held == self.held:
+            return False
+        self.held = held
+        self.transitions += 1
+        self._submit(self.injector.press if held else self.injector.release)
+        return True
+
+    def _submit(self, action):
+        if self.threaded:
+            self._queue.put((action, time.perf_counter()))
+        else:
+            self._dispatch(action, time.perf_counter())
+
+    def _worker(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            self._dispatch(*item)
+
+    def _dispatch(self, action, requested):
+        try:
+            action()
+        except Exception as e:
+            print(f"Error sending input: {e}")
+            return
+        latency = time.perf_counter() - requested
+        self.events += 1
+        self.total_latency += latency
+        self.last_latency = latency
+        if latency > self.max_latency:
+            self.max_latency = latency
+
+    @property
+    def avg_latency(self):
+        """เวลาเฉลี่ยตั้งแต่สั่งจนส่ง input เสร็จ (วินาที)"""
+        return self.total_latency / self.events if self.events else 0.0
+
+    def get_stats(self):
+        """รับสถิติการส่ง input
+
+        Returns:
+            dict: ชื่อ backend, จำนวนคลิก, จำนวนการเปลี่ยนสถานะกดค้าง
+                และเวลาเฉลี่ย/ล่าสุด/สูงสุดต่อเหตุการณ์ (ms)
+        """
+        return {
+            "backend": self.injector.name,
+            "clicks": self.clicks,
+            "transitions": self.transitions,
+            "avg_ms": self.avg_latency * 1000,
+            "last_ms": self.last_latency * 1000,
+            "max_ms": self.max_latency * 1000,
+        }
+
+    def close(self):
+        """ปล่อยเมาส์ถ้ากดค้างอยู่ หยุดเธรดส่งคลิก (ส่งที่ค้างอยู่ให้เสร็จก่อน) และปล่อย backend"""
+        self.set_hold(False)
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self.injector.close()
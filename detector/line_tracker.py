@@ -0,0 +1,308 @@
+from collections import namedtuple
+
+import cv2
+
+# ผลการระบุตำแหน่งเส้นขาว
+# x: ตำแหน่งแบบละเอียดกว่าพิกเซล (centroid), peak_x: คอลัมน์ที่มีผลรวมสูงสุด,
+# width: ความกว้างของเส้น (พิกเซล), prominence: สัดส่วนของจุดสูงสุดที่สูงกว่าพื้นหลัง (0.0 - 1.0),
+# coverage: สัดส่วนของแถวที่เส้นครอบคลุมเทียบกับ full_coverage (0.0 - 1.0),
+# confidence: ความมั่นใจรวม (0.0 - 1.0)
+LineFix = namedtuple(
+    "LineFix", ["x", "peak_x", "width", "prominence", "coverage", "confidence"]
+)
+
+
+class LineTracker:
+    """ติดตามเส้นขาวโดยค้นหาเฉพาะหน้าต่างรอบตำแหน่งล่าสุด
+
+    ขนาดหน้าต่างคิดจากความเร็วของเส้นที่สังเกตได้ (พิกเซลต่อเฟรม)
+    ถ้าไม่พบเส้นในหน้าต่างจะถอยไปสแกนทั้งความกว้าง
+    การคำนวณทั้งหมดเขียนลงส่วนของ buffer ใน workspace จึงไม่จอง buffer ของภาพต่อเฟรม
+    """
+
+    def __init__(self, workspace, margin=8, velocity_gain=2.0, full_coverage=0.2):
+        """
+        Args:
+            workspace: FrameWorkspace ที่มี buffer สำหรับภาพเทา/หน้ากาก/ผลรวมคอลัมน์
+            margin: ความกว้างขั้นต่ำของหน้าต่างแต่ละฝั่ง (พิกเซล)
+            velocity_gain: ตัวคูณความเร็วที่ใช้ขยายหน้าต่าง
+            full_coverage: สัดส่วนของแถวที่สแกนที่เส้นต้องครอบคลุมจึงได้ความมั่นใจเต็ม
+        """
+        self.workspace = workspace
+        self.margin = margin
+        self.velocity_gain = velocity_gain
+        self.full_coverage = full_coverage
+
+        self.last_x = None
+        self.velocity = 0.0
+        self._last_strength = 0.0
+
+        self._last_scan = None
+
+        self.hits = 0
+        self.misses = 0
+        self.full_scans = 0
+        self.scanned_columns = 0
+
+    def reset(self):
+        """ลืมตำแหน่งล่าสุด (เช่นเมื่อเกจหายไป)"""
+        self.last_x = None
+        self.velocity = 0.0
+        self._last_strength = 0.0
+
+    def scan(self, image, threshold, start=0, end=None):
+        """หาคอลัมน์ที่มีพิกเซลขาวมากที่สุดในช่วง [start, end)
+
+        Args:
+            image: ภาพตามลำดับช่องสีของ workspace
+            threshold: ค่าความสว่างขั้นต่ำของพิกเซลเส้นขาว
+            start: คอลัมน์เริ่มต้น
+            end: คอลัมน์สิ้นสุด (ไม่รวม) ค่าเริ่มต้นคือความกว้างภาพ
+
+        Returns:
+            tuple: (ตำแหน่ง x ในภาพ, จำนวนพิกเซลขาวในคอลัมน์นั้น)
+                หรือ (None, 0) ถ้าไม่พบพิกเซลขาว
+        """
+        workspace = self.workspace
+        h, w = image.shape[:2]
+        workspace.ensure(h, w)
+        if end is None:
+            end = w
+        self.scanned_columns += end - start
+
+        # แปลงเป็นโทนสีเทาลงในส่วนของ buffer ที่ตรงกับช่วงที่ค้นหา
+        gray = cv2.cvtColor(
+            image[:, start:end], workspace.gray_code, dst=workspace.gray[:, start:end]
+        )
+
+        # หาเส้นขาว (พิกเซลขาว = 1 เพื่อให้ผลรวมคือจำนวนพิกเซล)
+        _, mask = cv2.threshold(
+            gray, threshold, 1, cv2.THRESH_BINARY, dst=workspace.mask[:, start:end]
+        )
+
+        # หาตำแหน่งของเส้นแนวตั้ง (คอลัมน์ที่มีพิกเซลสีขาวเยอะที่สุด)
+        column_sum = cv2.reduce(
+            mask,
+            0,
+            cv2.REDUCE_SUM,
+            dst=workspace.column_sum[:, start:end],
+            dtype=cv2.CV_32S,
+        )
+        _, max_value, _, max_loc = cv2.minMaxLoc(column_sum)
+
+        if max_value > 0:
+            self._last_scan = (column_sum[0], start, max_loc[0], max_value, h)
+            return start + max_loc[0], max_value
+        self._last_scan = None
+        return None, 0
+
+    def measure(self, max_width=10):
+        """คำนวณตำแหน่งแบบละเอียดและความมั่นใจจากผลการสแกนครั้งล่าสุด
+
+        ความกว้างคือจำนวนคอลัมน์ติดกันรอบจุดสูงสุดที่มีผลรวมอย่างน้อยครึ่งหนึ่งของจุดสูงสุด
+        ตำแหน่งคือ centroid ของคอลัมน์เหล่านั้น ความเด่นคือผลต่างระหว่างจุดสูงสุดกับ
+        ค่าเฉลี่ยของคอลัมน์อื่นในช่วงที่สแกน หารด้วยจุดสูงสุด
+        ความเด่นอย่างเดียวให้ 1.0 กับจุดขาวเพียงพิกเซลเดียวบนพื้นหลังมืดด้วย
+        ความมั่นใจจึงคูณด้วยความครอบคลุม คือจำนวนแถวของจุดสูงสุดเทียบกับ full_coverage ของแถวที่สแกน
+        (ค่าเริ่มต้น: เส้นที่สูงอย่างน้อยหนึ่งในห้าของพื้นที่ หรือเต็มแถบในโหมด strip ยังได้ 1.0)
+
+        Args:
+            max_width: ความกว้างของเส้นที่ยอมรับได้เต็มที่ เส้นที่กว้างกว่านี้จะถูกลดความมั่นใจ
+
+        Returns:
+            LineFix: ผลการระบุตำแหน่ง หรือ None ถ้าการสแกนล่าสุดไม่พบเส้น
+        """
+        if self._last_scan is None:
+            return None
+        sums, start, peak, peak_value, rows = self._last_scan
+        n = len(sums)
+
+        # ขยายจากจุดสูงสุดออกไปทั้งสองฝั่งตราบที่ยังสูงกว่าครึ่งหนึ่งของจุดสูงสุด
+        half = peak_value / 2
+        left = peak
+        while left > 0 and sums[left - 1] >= half:
+            left -= 1
+        right = peak
+        while right < n - 1 and sums[right + 1] >= half:
+            right += 1
+
+        weight = 0
+        moment = 0
+        for i in range(left, right + 1):
+            value = int(sums[i])
+            weight += value
+            moment += i * value
+        width = right - left + 1
+
+        # พื้นหลังคือค่าเฉลี่ยของคอลัมน์ที่อยู่นอกเส้น
+        if n > width:
+            background = (cv2.sumElems(sums)[0] - weight) / (n - width)
+        else:
+            background = 0.0
+        prominence = max(0.0, (peak_value - background) / peak_value)
+        coverage = min(1.0, peak_value / (self.full_coverage * rows))
+
+        confidence = prominence * coverage
+        if width > max_width:
+            confidence *= max_width / width
+
+        return LineFix(
+            start + moment / weight,
+            start + peak,
+            width,
+            prominence,
+            coverage,
+            confidence,
+        )
+
+    def locate(self, image, threshold):
+        """หาตำแหน่งเส้นขาว โดยค้นหาในหน้าต่างรอบตำแหน่งล่าสุดก่อน
+
+        Args:
+            image: ภาพตามลำดับช่องสีของ workspace
+            threshold: ค่าความสว่างขั้นต่ำของพิกเซลเส้นขาว
+
+        Returns:
+            int: ตำแหน่ง x ของเส้นขาว หรือ None ถ้าไม่พบ
+        """
+        h, w = image.shape[:2]
+
+        if self.last_x is not None:
+            half = int(self.margin + self.velocity_gain * abs(self.velocity))
+            center = int(round(self.last_x + self.velocity))
+            start = max(0, center - half)
+            end = min(w, center + half + 1)
+            if start < end:
+                x, strength = self.scan(image, threshold, start, end)
+                if x is not None and self._is_hit(x, strength / h, start, end, w):
+                    self.hits += 1
+                    self._update(x, strength / h)
+                    return x
+            self.misses += 1
+
+        # ไม่มีตำแหน่งเดิมหรือเส้นหลุดหน้าต่าง: สแกนทั้งความกว้าง
+        self.full_scans += 1
+        x, strength = self.scan(image, threshold)
+        if x is None:
+            self.reset()
+            return None
+
+        self.velocity = 0.0
+        self.last_x = None
+        self._update(x, strength / h)
+        return x
+
+    def _is_hit(self, x, strength, start, end, width):
+        """ตรวจว่าผลในหน้าต่างเป็นเส้นเดิมจริง ไม่ใช่ขอบของเส้นหรือพิกเซลรบกวน"""
+        # จุดสูงสุดที่ติดขอบหน้าต่างอาจเป็นเพียงขอบของเส้นที่อยู่นอกหน้าต่าง
+        if x == start and start > 0:
+            return False
+        if x == end - 1 and end < width:
+            return False
+        # ความสูงของเส้นต้องไม่ลดลงเกินครึ่งจากเฟรมก่อน
+        return strength >= self._last_strength * 0.5
+
+    def _update(self, x, strength):
+        """บันทึกตำแหน่งและปรับความเร็วแบบเฉลี่ยเคลื่อนที่"""
+        if self.last_x is not None:
+            self.velocity = 0.5 * self.velocity + 0.5 * (x - self.last_x)
+        self.last_x = x
+        self._last_strength = strength
+
+    def get_stats(self):
+        """รับสถิติการติดตามเส้นขาว
+
+        Returns:
+            dict: จำนวนครั้งที่พบในหน้าต่าง/ไม่พบ, จำนวนการสแกนเต็ม และจำนวนคอลัมน์เฉลี่ยต่อครั้ง
+        """
+        locates = self.hits + self.full_scans
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "full_scans": self.full_scans,
+            "avg_columns": self.scanned_columns / locates if locates else 0.0,
+        }
+
+
+class LinePredictor:
+    """ประมาณตำแหน่งและความเร็วของเส้นขาวด้วยตัวกรอง alpha-beta
+
+    ใช้เวลาที่จับภาพของแต่ละเฟรม (time.perf_counter) จึงรองรับช่วงเวลาระหว่างเฟรมที่ไม่คงที่
+    แล้วทำนายตำแหน่งล่วงหน้าไปยังเวลาที่คลิกจะไปถึงเกม
+    """
+
+    def __init__(self, alpha=0.5, beta=0.1, max_gap=0.25):
+        """
+        Args:
+            alpha: น้ำหนักการแก้ตำแหน่งจากค่าที่วัดได้ (0.0 - 1.0)
+            beta: น้ำหนักการแก้ความเร็วจากค่าที่วัดได้ (0.0 - 1.0)
+            max_gap: ช่วงเวลาสูงสุดระหว่างการวัด (วินาที) ถ้าเกินจะเริ่มประมาณใหม่
+        """
+        self.alpha = alpha
+        self.beta = beta
+        self.max_gap = max_gap
+
+        self.x = None
+        self.velocity = 0.0
+        self.timestamp = 0.0
+
+        self.updates = 0
+        self.total_residual = 0.0
+
+    def reset(self):
+        """ล้างสถานะ (เช่นเมื่อเกจหายไป)"""
+        self.x = None
+        self.velocity = 0.0
+
+    def update(self, x, timestamp):
+        """ปรับสถานะด้วยตำแหน่งที่วัดได้
+
+        Args:
+            x: ตำแหน่งเส้นขาวที่วัดได้ (พิกเซล)
+            timestamp: เวลาที่จับภาพเฟรมนั้น (time.perf_counter)
+        """
+        dt = timestamp - self.timestamp
+        if self.x is None or dt > self.max_gap:
+            # เริ่มใหม่จากค่าที่วัดได้
+            self.x = x
+            self.velocity = 0.0
+            self.timestamp = timestamp
+            return
+        if dt <= 0:
+            # เฟรมเดิมซ้ำ ไม่มีข้อมูลใหม่
+            return
+
+        predicted = self.x + self.velocity * dt
+        residual = x - predicted
+        self.x = predicted + self.alpha * residual
+        self.velocity += self.beta / dt * residual
+        self.timestamp = timestamp
+
+        self.updates += 1
+        self.total_residual += abs(residual)
+
+    def predict(self, timestamp):
+        """ทำนายตำแหน่งของเส้นขาว ณ เวลาที่กำหนด
+
+        Args:
+            timestamp: เวลาที่ต้องการทำนาย (time.perf_counter)
+
+        Returns:
+            float: ตำแหน่งที่ทำนาย หรือ None ถ้ายังไม่มีข้อมูล
+        """
+        if self.x is None:
+            return None
+        return self.x + self.velocity * (timestamp - self.timestamp)
+
+    def get_stats(self):
+        """รับสถิติของตัวประมาณ
+
+        Returns:
+            dict: จำนวนการปรับ และค่าคลาดเคลื่อนเฉลี่ยระหว่างค่าที่ทำนายกับค่าที่วัดได้ (พิกเซล)
+        """
+        return {
+            "updates": self.updates,
+            "avg_residual": (
+                self.total_residual / self.updates if self.updates else 0.0
+            ),
+        }
@@ -0,0 +1,172 @@
+from collections import namedtuple
+
+import cv2
+import numpy as np
+
+# รหัสโซนสีในผลการจำแนก
+ZONE_UNKNOWN = 0
+ZONE_GREEN = 1
+ZONE_RED = 2
+ZONE_NAMES = ("unknown", "green", "red")
+
+# ช่วงของโซนสีที่ต่อเนื่องกันในแนวนอน (end ไม่รวมพิกเซลสุดท้าย)
+ZoneSegment = namedtuple("ZoneSegment", ["zone", "start", "end"])
+
+
+class ZoneScanner:
+    """จำแนกโซนสี (เขียว/แดง/ไม่ทราบ) ของทั้งแถวด้วย NumPy ในครั้งเดียว
+
+    ใช้เกณฑ์เดียวกับการตรวจทีละพิกเซลเดิม: ช่องสีหลักต้องมากกว่า 100
+    และมากกว่า 1.5 เท่าของอีกสองช่อง (คำนวณเป็นจำนวนเต็ม 2a > 3b)
+    """
+
+    def __init__(self, workspace):
+        """
+        Args:
+            workspace: FrameWorkspace ที่ระบุลำดับช่องสีของภาพ
+        """
+        self.red_index = workspace.red_index
+        self.green_index = workspace.green_index
+        self.blue_index = workspace.blue_index
+        self.channels = workspace.channels
+
+        self.width = None
+        self._buffers = {}
+        self._point_buffers = {}
+
+    def _new_row_buffers(self, width):
+        """จอง buffer สำหรับจำแนกหนึ่งแถว (ค่าเฉลี่ยแถบ, ค่ากลาง, ผลรหัสโซน)"""
+        return (
+            np.empty((1, width, self.channels), dtype=np.uint8),
+            np.empty(width, dtype=np.uint8),
+            np.empty(width, dtype=np.int16),
+            np.empty(width, dtype=np.int16),
+            np.empty(width, dtype=bool),
+            np.empty(width, dtype=bool),
+            np.empty(width, dtype=np.uint8),
+        )
+
+    def _ensure(self, width):
+        """เลือก buffer ตามความกว้าง จองใหม่เฉพาะครั้งแรกของแต่ละขนาด"""
+        if self.width == width:
+            return
+        buffers = self._buffers.get(width)
+        if buffers is None:
+            buffers = self._buffers[width] = self._new_row_buffers(width)
+        self.width = width
+        self._row = buffers
+        self._band = self._row[0]
+        self.codes = self._row[-1]
+
+    def classify(self, image, band_rows=1):
+        """จำแนกโซนสีของแถวกลางภาพ (หรือค่าเฉลี่ยของแถบรอบแถวกลาง)
+
+        Args:
+            image: ภาพตามลำดับช่องสีของ workspace
+            band_rows: จำนวนแถวรอบแถวกลางที่นำมาเฉลี่ยก่อนจำแนก
+
+        Returns:
+            numpy.ndarray: รหัสโซนของแต่ละคอลัมน์ (ZONE_UNKNOWN/GREEN/RED)
+        """
+        h, w = image.shape[:2]
+        self._ensure(w)
+
+        band_rows = max(1, min(band_rows, h))
+        top = h // 2 - band_rows // 2
+        if band_rows == 1:
+            row = image[top]
+        else:
+            row = cv2.reduce(
+                image[top : top + band_rows], 0, cv2.REDUCE_AVG, dst=self._band
+            )[0]
+
+        return self._classify_row(row, self._row)
+
+    def _classify_row(self, row, buffers):
+        """จำแนกโซนสีของแถวพิกเซล (ความกว้าง x ช่องสี) ลงใน buffer ที่กำหนด"""
+        red = row[:, self.red_index]
+        green = row[:, self.green_index]
+        blue = row[:, self.blue_index]
+
+        codes = buffers[-1]
+        codes.fill(ZONE_UNKNOWN)
+        self._mark(buffers, ZONE_GREEN, green, blue, red)
+        self._mark(buffers, ZONE_RED, red, blue, green)
+        return codes
+
+    @staticmethod
+    def _mark(buffers, zone, main, other_a, other_b):
+        """ทำเครื่องหมายคอลัมน์ที่ช่องสีหลักเด่นกว่าช่องอื่นอย่างชัดเจน"""
+        _, max_other, scaled_main, scaled_other, mask, bright, codes = buffers
+        np.maximum(other_a, other_b, out=max_other)
+        np.multiply(max_other, 3, out=scaled_other, dtype=np.int16)
+        np.multiply(main, 2, out=scaled_main, dtype=np.int16)
+        np.greater(scaled_main, scaled_other, out=mask)
+        np.greater(main, 100, out=bright)
+        np.logical_and(mask, bright, out=mask)
+        np.copyto(codes, zone, where=mask)
+
+    def segments(self, codes):
+        """แปลงรหัสโซนรายคอลัมน์เป็นช่วงต่อเนื่อง (run-length)
+
+        Args:
+            codes: รหัสโซนจาก classify()
+
+        Returns:
+            list: รายการ ZoneSegment เรียงจากซ้ายไปขวา
+        """
+        width = len(codes)
+        if width == 0:
+            return []
+
+        boundaries = np.flatnonzero(codes[1:] != codes[:-1]) + 1
+        starts = [0] + boundaries.tolist()
+        ends = boundaries.tolist() + [width]
+        zones = codes[starts].tolist()
+        return [
+            ZoneSegment(ZONE_NAMES[zone], start, end)
+            for zone, start, end in zip(zones, starts, ends)
+        ]
+
+    def scan(self, image, band_rows=1):
+        """จำแนกโซนสีและคืนค่าเป็นช่วงต่อเนื่อง
+
+        Returns:
+            list: รายการ ZoneSegment ของแถวกลางภาพ
+        """
+        return self.segments(self.classify(image, band_rows))
+
+    def classify_points(self, image, xs, band_rows=1):
+        """จำแนกโซนสีเฉพาะบางคอลัมน์ของแถวกลางภาพ (ใช้ตรวจ layout ที่จำไว้)
+
+        ดึงพิกเซลและจำแนกลงใน buffer ที่จองไว้ตามจำนวนจุดและจำนวนแถว
+        ผลที่คืนจึงถูกเขียนทับในการเรียกครั้งถัดไป
+
+        Args:
+            image: ภาพตามลำดับช่องสีของ workspace
+            xs: ตำแหน่งคอลัมน์ที่ต้องการตรวจ (numpy array)
+            band_rows: จำนวนแถวรอบแถวกลางที่นำมาเฉลี่ย
+
+        Returns:
+            numpy.ndarray: รหัสโซนของแต่ละตำแหน่ง
+        """
+        h = image.shape[0]
+        band_rows = max(1, min(band_rows, h))
+        top = h // 2 - band_rows // 2
+
+        key = (len(xs), band_rows)
+        buffers = self._point_buffers.get(key)
+        if buffers is None:
+            pixels = np.empty((band_rows, len(xs), self.channels), dtype=np.uint8)
+            buffers = self._point_buffers[key] = (
+                pixels,
+                self._new_row_buffers(len(xs)),
+            )
+        pixels, row_buffers = buffers
+
+        np.take(image[top : top + band_rows], xs, axis=1, out=pixels, mode="clip")
+        if band_rows > 1:
+            row = cv2.reduce(pixels, 0, cv2.REDUCE_AVG, dst=row_buffers[0])[0]
+        else:
+            row = pixels[0]
+        return self._classify_row(row, row_buffers)
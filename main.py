@@ -1,5 +1,9 @@
+import time
+
+# เวลาเริ่มโปรแกรม (ก่อน import อื่นๆ) สำหรับ --startup-profile
+STARTUP_TIME = time.perf_counter()
+
 import tkinter as tk
-import keyboard
 import threading
 import os
 import sys
@@ -7,13 +11,46 @@ import sys
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from ui.pixelated_ui import PixelatedUI
-from detector.gauge_detector import GaugeDetector
+from ui.ui_bus import UIStateBus, call_on_tk_thread
 from utils.config_manager import ConfigManager
 from app_integration import integrate_settings
+from utils.constants import DEFAULT_CONFIG
+from utils.startup import BackgroundLoader, StartupProfile
+
+
+def load_detection_modules(profile):
+    """import โมดูลหนักของการตรวจจับและการควบคุมอินพุต (เรียกบนเธรดเบื้องหลัง)
+
+    ใช้คำสั่ง import ตรงๆ ทีละโมดูลเพื่อจับเวลาแยก และให้ PyInstaller ยังตามไปรวมโมดูลได้
+
+    Args:
+        profile: StartupProfile ที่ใช้จับเวลา
+
+    Returns:
+        dict: GaugeDetector และโมดูล keyboard
+    """
+    with profile.measure("import numpy"):
+        import numpy
+    with profile.measure("import cv2"):
+        import cv2
+    with profile.measure("import pyautogui"):
+        import pyautogui
+    with profile.measure("import keyboard"):
+        import keyboard
+    with profile.measure("import detector"):
+        from detector.gauge_detector import GaugeDetector
+        import detector.screen_selector
+
+    return {"GaugeDetector": GaugeDetector, "keyboard": keyboard}
 
 
 class FishingBot:
-    def __init__(self, root):
+    def __init__(self, root, loader):
+        """
+        Args:
+            root: หน้าต่างหลัก
+            loader: BackgroundLoader ของ load_detection_modules
+        """
         self.root = root
         self.root.title("Fishing Assistant")
         self.root.geometry("430x780")
@@ -22,16 +59,16 @@ class FishingBot:
         self.running = False
         self.region = None
         self.detection_thread = None
+        self.ui_bus = None
+
+        # ตัวตรวจจับสร้างเมื่อโมดูลหนักโหลดเสร็จ (ดู _on_modules_loaded)
+        self.loader = loader
+        self.detector = None
+        self.start_requested = False
 
         # สร้าง UI
         self.ui = PixelatedUI(root, self)
 
-        # สร้างตัวตรวจจับ
-        self.detector = GaugeDetector(self)
-
-        # ลงทะเบียน Hotkey
-        keyboard.add_hotkey("f10", self.stop_fishing)
-
         # ตั้งค่าการปิดโปรแกรม
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
 
@@ -41,6 +78,31 @@ class FishingBot:
         )
         self.load_settings_from_config()
 
+        # สร้างตัวตรวจจับและลงทะเบียน Hotkey เมื่อโหลดโมดูลเสร็จ
+        loader.when_done(root, self._on_modules_loaded)
+
+    def _on_modules_loaded(self, loader):
+        """สร้างตัวตรวจจับและลงทะเบียน Hotkey หลังโหลดโมดูลหนักเสร็จ (เธรดหลักของ Tk)"""
+        if loader.error is not None:
+            print(f"Error loading detection modules: {loader.error}")
+            self.start_requested = False
+            self.ui.update_status("Load failed", "danger")
+            return
+
+        modules = loader.result
+        self.detector = modules["GaugeDetector"](self)
+        self.load_settings_from_config()
+
+        # ลงทะเบียน Hotkey (keyboard เรียกจากเธรดของ hook จึงส่งต่อไปทำในเธรดหลักของ Tk)
+        modules["keyboard"].add_hotkey(
+            "f10", lambda: call_on_tk_thread(self.root, self.stop_fishing)
+        )
+
+        # เริ่มทำงานต่อถ้ากด Start ไว้ระหว่างที่ยังโหลดไม่เสร็จ
+        if self.start_requested:
+            self.start_requested = False
+            self.start_fishing()
+
     def load_settings_from_config(self):
         """โหลดการตั้งค่าจาก config.json เข้าสู่แอพพลิเคชัน"""
         config = self.config_manager.config
@@ -55,7 +117,7 @@ class FishingBot:
         self.periodic_click_interval = config.get("periodic_click_interval", 4.0)
 
         # อัปเดตค่าใน detector ถ้ามี
-        if hasattr(self, "detector"):
+        if self.detector is not None:
             self.detector.line_threshold = self.line_threshold
             self.detector.color_threshold = self.color_threshold
             self.detector.action_cooldown = self.action_cooldown
@@ -98,9 +160,33 @@ class FishingBot:
     def start_fishing(self):
         """เริ่มการทำงานของบอท"""
         if not self.running and self.region:
+            # รอให้โมดูลการตรวจจับโหลดเสร็จก่อน แล้วเริ่มต่อจาก _on_modules_loaded
+            if self.detector is None:
+                if self.loader.error is not None:
+                    self.ui.update_status("Load failed", "danger")
+                elif not self.start_requested:
+                    self.start_requested = True
+                    self.ui.update_status("Loading...", "warning")
+                    # ยกเลิกการเริ่มที่รออยู่ได้ด้วยปุ่ม Stop
+                    self.ui.set_button_states("normal", "disabled", "normal")
+                return
+
             self.running = True
             self.ui.update_status("Starting...", "warning")
 
+            # หยุดอนิเมชันของ UI ระหว่างที่บอททำงาน
+            self.ui.animation_clock.pause("running")
+
+            # ส่งการอัปเดตจากเธรดตรวจจับผ่าน bus ที่ Tk ดึงตามอัตรา ui_rate_hz
+            self.ui_bus = UIStateBus(
+                self.root,
+                self.ui,
+                self.config_manager.config.get(
+                    "ui_rate_hz", DEFAULT_CONFIG["ui_rate_hz"]
+                ),
+            )
+            self.ui_bus.start()
+
             self.detection_thread = threading.Thread(target=self.fishing_loop)
             self.detection_thread.daemon = True
             self.detection_thread.start()
@@ -111,24 +197,59 @@ class FishingBot:
     def stop_fishing(self):
         """หยุดการทำงานของบอท"""
         self.running = False
+        self.start_requested = False
         if self.detection_thread and self.detection_thread.is_alive():
             self.detection_thread.join(timeout=1.0)
 
+        if self.ui_bus is not None:
+            self.ui_bus.stop()
+            self.ui_bus = None
+
         self.ui.update_status("Stopped", "danger")
         self.ui.set_button_states("normal", "normal", "disabled")
+        self.ui.animation_clock.resume("running")
 
     def fishing_loop(self):
         """ลูปหลักสำหรับการตกปลา"""
-        self.detector.fishing_loop(self.region, self.ui)
+        self.detector.fishing_loop(self.region, self.ui_bus)
 
     def on_closing(self):
         """จัดการเมื่อปิดโปรแกรม"""
         self.stop_fishing()
+        self.config_manager.stop_watching()
+        self.config_manager.flush()
         self.ui.stop_animation()
         self.root.destroy()
 
 
 if __name__ == "__main__":
+    profile = StartupProfile(STARTUP_TIME)
+    profile.mark("imports done")
+
     root = tk.Tk()
-    app = FishingBot(root)
+
+    # โหลดโมดูลหนักบนเธรดเบื้องหลังหลังจากหน้าต่างแสดงครั้งแรก
+    loader = BackgroundLoader(lambda: load_detection_modules(profile))
+
+    def on_first_map(event):
+        if event.widget is root and not loader.started:
+            profile.mark("window mapped")
+            loader.start()
+
+    root.bind("<Map>", on_first_map, add="+")
+
+    # สำรองกรณีหน้าต่างไม่ถูกแสดง (เช่นเริ่มแบบย่อไว้)
+    root.after(1000, loader.start)
+
+    with profile.measure("build ui"):
+        app = FishingBot(root, loader)
+
+    if "--startup-profile" in sys.argv:
+
+        def report(loader):
+            profile.mark("modules loaded")
+            profile.report()
+
+        loader.when_done(root, report)
+
     root.mainloop()
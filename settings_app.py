@@ -41,7 +41,7 @@ class SettingsApp:
         self.config_manager.register_observer(self.on_config_changed)
 
         # สร้างหน้าตั้งค่า
-        self.settings_ui = SettingsUI(self.root, "config.json")
+        self.settings_ui = SettingsUI(self.root, self.config_manager)
 
         # สร้างเมนูหลัก
         self.main_menu = MainMenu(
@@ -127,7 +127,7 @@ class SettingsApp:
         # Esc เพื่อปิดโปรแกรม (ในโหมดทดสอบ)
         self.root.bind("<Escape>", lambda e: self.root.destroy())
 
-    def on_config_changed(self, config):
+    def on_config_changed(self, config, changed_keys):
         """จัดการเมื่อการตั้งค่าเปลี่ยนแปลง"""
         pass
 
@@ -0,0 +1,128 @@
+import sys
+import types
+
+import numpy as np
+import pytest
+
+from detector import capture
+from detector.capture import CaptureBackend, create_capture_backend
+from detector.frame_pipeline import FrameWorkspace
+
+
+class StubCapture(CaptureBackend):
+    """backend ทดสอบที่คืนภาพคงที่ขนาดตามพื้นที่"""
+
+    name = "stub"
+
+    def __init__(self, shape=None):
+        super().__init__()
+        self.shape = shape
+
+    def _grab(self, region):
+        x1, y1, x2, y2 = region
+        shape = self.shape or (y2 - y1, x2 - x1, 3)
+        return np.arange(np.prod(shape), dtype=np.uint8).reshape(shape)
+
+
+class MissingCapture(CaptureBackend):
+    name = "missing"
+
+    def __init__(self):
+        raise ImportError("No module named 'missing'")
+
+
+@pytest.fixture
+def backends(monkeypatch):
+    registry = {"missing": MissingCapture, "stub": StubCapture}
+    monkeypatch.setattr(capture, "CAPTURE_BACKENDS", registry)
+    return registry
+
+
+def test_create_falls_back_when_import_fails(backends):
+    assert isinstance(create_capture_backend("missing"), StubCapture)
+    assert isinstance(create_capture_backend("auto"), StubCapture)
+    assert isinstance(create_capture_backend("unknown"), StubCapture)
+
+
+def test_create_fails_without_any_backend(backends):
+    del backends["stub"]
+
+    with pytest.raises(RuntimeError):
+        create_capture_backend("auto")
+
+
+def test_grab_records_stats():
+    backend = StubCapture()
+
+    frame = backend.grab((10, 20, 15, 24))
+
+    assert frame.shape == (4, 5, 3)
+    stats = backend.get_stats()
+    assert stats["backend"] == "stub"
+    assert stats["grabs"] == 1
+    assert stats["max_ms"] >= stats["avg_ms"] >= 0.0
+
+
+def test_grab_into_copies_into_buffer():
+    backend = StubCapture()
+    out = np.zeros((4, 5, 3), dtype=np.uint8)
+
+    frame = backend.grab_into((10, 20, 15, 24), out)
+
+    assert frame is out
+    np.testing.assert_array_equal(out, backend._grab((10, 20, 15, 24)))
+    assert backend.get_stats()["grabs"] == 1
+
+
+def test_grab_into_returns_grabbed_frame_on_shape_mismatch():
+    # เช่นหน้าจอที่ปรับสเกล DPI คืนภาพใหญ่กว่าพื้นที่ที่ขอ
+    backend = StubCapture(shape=(8, 10, 3))
+    out = np.zeros((4, 5, 3), dtype=np.uint8)
+
+    frame = backend.grab_into((0, 0, 5, 4), out)
+
+    assert frame is not out
+    assert frame.shape == (8, 10, 3)
+    assert not out.any()
+
+
+def red_screen(width, height):
+    """หน้าจอปลอมที่เป็นสีแดงล้วน (R, G, B)"""
+    return np.tile(np.array([200, 0, 0], dtype=np.uint8), (height, width, 1))
+
+
+def test_backends_report_their_channel_order(monkeypatch):
+    def screenshot(region):
+        x, y, width, height = region
+        return red_screen(width, height)
+
+    class Shot:
+        def __init__(self, monitor):
+            self.width = monitor["width"]
+            self.height = monitor["height"]
+            rgb = red_screen(self.width, self.height)
+            bgra = np.dstack([rgb[..., ::-1], np.full(rgb.shape[:2], 255, np.uint8)])
+            self.raw = bgra.tobytes()
+
+    class Screen:
+        def grab(self, monitor):
+            return Shot(monitor)
+
+        def close(self):
+            pass
+
+    monkeypatch.setitem(
+        sys.modules, "pyautogui", types.SimpleNamespace(screenshot=screenshot)
+    )
+    monkeypatch.setitem(sys.modules, "mss", types.SimpleNamespace(mss=Screen))
+
+    for name, channels in (("pyautogui", 3), ("mss", 4)):
+        backend = create_capture_backend(name)
+        frame = backend.grab((0, 0, 6, 2))
+        workspace = FrameWorkspace(backend.channel_order)
+
+        assert backend.name == name
+        assert frame.shape == (2, 6, channels) == (2, 6, workspace.channels)
+        assert (frame[..., workspace.red_index] == 200).all()
+        assert (frame[..., workspace.green_index] == 0).all()
+        backend.close()
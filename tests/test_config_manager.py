@@ -0,0 +1,94 @@
+import copy
+import json
+
+import pytest
+
+from utils.config_manager import ConfigManager, ConfigSnapshot
+from utils.constants import DEFAULT_CONFIG
+
+
+@pytest.fixture
+def manager(tmp_path):
+    config_manager = ConfigManager(str(tmp_path / "config.json"), save_delay=60)
+    changes = []
+    config_manager.register_observer(
+        lambda config, changed_keys: changes.append(changed_keys)
+    )
+    config_manager.changes = changes
+    yield config_manager
+    config_manager._cancel_pending_save()
+
+
+def test_snapshot_defaults_and_derived_values():
+    snapshot = ConfigSnapshot({"red_zone_threshold": 0.25, "capture_mode": "strip"})
+
+    assert snapshot.red_zone_threshold == 0.25
+    assert snapshot.action_cooldown == DEFAULT_CONFIG["action_cooldown"]
+    assert snapshot.safe_zone_min == pytest.approx(0.25 + snapshot.buffer_zone_size)
+    assert snapshot.danger_right_min == pytest.approx(0.75)
+    assert snapshot.strip_mode is True
+    assert snapshot.version == 0
+
+
+def test_snapshot_is_read_only():
+    snapshot = ConfigSnapshot()
+
+    with pytest.raises(AttributeError):
+        snapshot.action_cooldown = 1.0
+
+
+def test_update_values_reports_only_changed_keys(manager):
+    version = manager.snapshot.version
+
+    assert manager.update_values(
+        {"action_cooldown": 0.25, "line_threshold": manager.config["line_threshold"]}
+    )
+    assert manager.changes == [{"action_cooldown"}]
+    assert manager.snapshot.version == version + 1
+    assert manager.snapshot.action_cooldown == 0.25
+
+    assert not manager.update_values({"action_cooldown": 0.25})
+    assert manager.changes == [{"action_cooldown"}]
+
+
+def test_update_values_detects_nested_edits_on_a_copy(manager):
+    # หน้าตั้งค่าแก้ไขสำเนาของ config ค่าจริงต้องไม่เปลี่ยนจนกว่าจะบันทึก
+    draft = copy.deepcopy(manager.config)
+    draft["ui_colors"]["primary"] = "#123456"
+    assert manager.config["ui_colors"]["primary"] != "#123456"
+
+    assert manager.update_values({"ui_colors": draft["ui_colors"]})
+    assert manager.changes == [{"ui_colors"}]
+    assert manager.config["ui_colors"]["primary"] == "#123456"
+
+
+def test_update_values_keeps_its_own_copy(manager):
+    colors = dict(manager.config["ui_colors"], primary="#123456")
+    manager.update_values({"ui_colors": colors})
+
+    # การแก้ dict ของผู้เรียกภายหลังต้องไม่กระทบ config โดยไม่ผ่านการแจ้งเตือน
+    colors["primary"] = "#654321"
+    assert manager.config["ui_colors"]["primary"] == "#123456"
+    assert manager.update_values({"ui_colors": colors})
+    assert manager.changes == [{"ui_colors"}, {"ui_colors"}]
+
+
+def test_flush_writes_pending_changes(manager):
+    manager.update_values({"action_cooldown": 0.25})
+    assert manager.flush()
+
+    with open(manager.config_file) as f:
+        assert json.load(f)["action_cooldown"] == 0.25
+
+
+def test_check_for_changes_reloads_external_edits(manager):
+    with open(manager.config_file) as f:
+        config = json.load(f)
+    config["line_threshold"] = 150
+    with open(manager.config_file, "w") as f:
+        json.dump(config, f)
+    manager.last_modified = 0
+
+    assert manager.check_for_changes()
+    assert manager.changes == [{"line_threshold"}]
+    assert manager.snapshot.line_threshold == 150
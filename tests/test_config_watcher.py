@@ -0,0 +1,56 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+from utils import config_watcher
+from utils.config_watcher import ConfigWatcher
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text("{}")
+    return path
+
+
+def watch(path, **kwargs):
+    changed = threading.Event()
+    watcher = ConfigWatcher(str(path), changed.set, **kwargs)
+    watcher.start()
+    return watcher, changed
+
+
+@pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="inotify is Linux only"
+)
+def test_inotify_coalesces_a_burst_of_writes(config_file):
+    watcher, changed = watch(config_file)
+    try:
+        assert watcher.mode == "inotify"
+        for i in range(3):
+            config_file.write_text(f'{{"line_threshold": {200 + i}}}')
+
+        assert changed.wait(2.0)
+        time.sleep(0.2)
+        assert watcher.notifications == 1
+    finally:
+        watcher.stop()
+
+
+def test_polls_mtime_off_linux(monkeypatch, config_file):
+    monkeypatch.setattr(config_watcher.sys, "platform", "win32")
+    watcher, changed = watch(config_file, poll_interval=0.02)
+    try:
+        assert watcher.mode == "poll"
+        # ให้เธรดอ่าน mtime เริ่มต้นก่อนแก้ไฟล์
+        time.sleep(0.1)
+        config_file.write_text('{"line_threshold": 150}')
+        mtime = os.path.getmtime(config_file) + 1
+        os.utime(config_file, (mtime, mtime))
+
+        assert changed.wait(2.0)
+    finally:
+        watcher.stop()
@@ -0,0 +1,47 @@
+import pytest
+
+from detector.controller import PIDController
+
+
+def test_duty_follows_position_error():
+    controller = PIDController(kp=4.0, ki=0.0, kd=0.0, bias=0.5)
+
+    controller.update(0.5, 0.0, 0.5, 0.0, 0.1)
+    assert controller.duty == pytest.approx(0.5)
+
+    # เส้นอยู่ซ้ายของเป้าหมาย: ต้องคลิกถี่ขึ้นเพื่อดันไปทางขวา
+    controller.update(0.45, 0.0, 0.5, 0.01, 0.1)
+    assert controller.duty == pytest.approx(0.7)
+
+    controller.update(0.0, 0.0, 0.5, 0.02, 0.1)
+    assert controller.duty == 1.0
+    controller.update(1.0, 0.0, 0.5, 0.03, 0.1)
+    assert controller.duty == 0.0
+
+
+def test_integral_does_not_wind_up_while_saturated():
+    controller = PIDController(kp=4.0, ki=1.0, kd=0.0, bias=0.5)
+    for i in range(100):
+        controller.update(0.0, 0.0, 0.5, i * 0.01, 0.1)
+
+    assert controller.duty == 1.0
+    assert controller.integral == 0.0
+
+
+def test_click_rate_matches_duty():
+    controller = PIDController(kp=0.0, ki=0.0, kd=0.0, bias=0.5)
+    clicks = sum(controller.update(0.5, 0.0, 0.5, i / 64, 0.125) for i in range(641))
+
+    # duty 0.5 กับ action_cooldown 0.125 วินาที คือ 4 คลิกต่อวินาที (10 วินาที)
+    assert clicks == 40
+
+
+def test_reset_clears_state():
+    controller = PIDController()
+    controller.update(0.2, 0.0, 0.5, 0.0, 0.1)
+    controller.update(0.2, 0.0, 0.5, 0.1, 0.1)
+    controller.reset()
+
+    assert controller.integral == 0.0
+    assert controller.phase == 0.0
+    assert controller.timestamp is None
@@ -0,0 +1,39 @@
+import pytest
+
+from detector.gauge_layout import measure_layout
+from detector.zone_scanner import ZoneSegment
+
+
+def test_green_runs_merge_across_unknown_gap():
+    # เส้นขาวบนโซนเขียวทำให้เกิดช่วง unknown แคบๆ
+    segments = [
+        ZoneSegment("red", 0, 30),
+        ZoneSegment("green", 30, 48),
+        ZoneSegment("unknown", 48, 52),
+        ZoneSegment("green", 52, 70),
+        ZoneSegment("red", 70, 100),
+    ]
+
+    layout = measure_layout(segments, 100, 0.0)
+
+    assert layout.green_start == pytest.approx(0.3)
+    assert layout.green_end == pytest.approx(0.7)
+
+
+def test_green_runs_do_not_merge_across_red():
+    segments = [
+        ZoneSegment("red", 0, 30),
+        ZoneSegment("green", 30, 44),
+        ZoneSegment("red", 44, 48),
+        ZoneSegment("green", 48, 70),
+        ZoneSegment("red", 70, 100),
+    ]
+
+    layout = measure_layout(segments, 100, 0.0)
+
+    assert layout.green_start == pytest.approx(0.48)
+    assert layout.green_end == pytest.approx(0.7)
+
+
+def test_without_red_zone():
+    assert measure_layout([ZoneSegment("green", 0, 100)], 100, 0.13) is None
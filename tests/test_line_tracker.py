@@ -0,0 +1,123 @@
+import numpy as np
+import pytest
+
+from detector.frame_pipeline import FrameWorkspace
+from detector.line_tracker import LinePredictor, LineTracker
+from utils.constants import DEFAULT_CONFIG
+
+
+def make_line(x, width=3, height=40, image_width=200, line_height=None):
+    """ภาพที่มีเส้นขาวแนวตั้งกว้าง width พิกเซลเริ่มที่คอลัมน์ x
+
+    line_height คือความสูงของเส้นกลางภาพ (None = สูงเต็มภาพ)
+    """
+    image = np.zeros((height, image_width, 3), dtype=np.uint8)
+    line_height = height if line_height is None else line_height
+    top = (height - line_height) // 2
+    image[top : top + line_height, x : x + width] = 255
+    return image
+
+
+def test_scan_without_line():
+    tracker = LineTracker(FrameWorkspace())
+
+    assert tracker.scan(make_line(100, width=0), 200) == (None, 0)
+
+
+def test_measure_centroid_and_width():
+    tracker = LineTracker(FrameWorkspace())
+    tracker.scan(make_line(100, width=3), 200)
+
+    fix = tracker.measure(max_width=10)
+
+    assert fix.x == pytest.approx(101.0)
+    assert fix.peak_x == 100
+    assert fix.width == 3
+
+
+@pytest.mark.parametrize("height", [20, 40, 60, 100])
+def test_measure_accepts_line_shorter_than_region(height):
+    # เส้นในเกมสูงคงที่ พื้นที่ที่ผู้ใช้เลือกอาจสูงกว่าเส้นมาก
+    tracker = LineTracker(FrameWorkspace())
+    tracker.scan(make_line(100, height=height, line_height=20), 200)
+
+    fix = tracker.measure(max_width=10)
+
+    assert fix.prominence == pytest.approx(1.0)
+    assert fix.confidence >= DEFAULT_CONFIG["min_line_confidence"]
+
+
+def test_measure_full_confidence_in_strip():
+    # โหมด strip: แถบบาง 9 แถวที่เส้นพาดผ่านทั้งแถบ
+    tracker = LineTracker(FrameWorkspace())
+    tracker.scan(make_line(100, height=9), 200)
+
+    fix = tracker.measure(max_width=10)
+
+    assert fix.coverage == pytest.approx(1.0)
+    assert fix.confidence == pytest.approx(1.0)
+
+
+def test_measure_rejects_noise_speck():
+    # จุดขาวพิกเซลเดียวบนพื้นหลังมืด: เด่นเต็มที่ แต่ครอบคลุมเพียงแถวเดียว
+    tracker = LineTracker(FrameWorkspace())
+    tracker.scan(make_line(100, width=1, height=40, line_height=1), 200)
+
+    fix = tracker.measure(max_width=10)
+
+    assert fix.prominence == pytest.approx(1.0)
+    assert fix.confidence == pytest.approx(0.125)
+    assert fix.confidence < DEFAULT_CONFIG["min_line_confidence"]
+
+
+def test_measure_penalises_wide_lines_and_noise():
+    tracker = LineTracker(FrameWorkspace())
+    tracker.scan(make_line(100, width=20), 200)
+    assert tracker.measure(max_width=10).confidence == pytest.approx(0.5)
+
+    # หนึ่งในสี่ของภาพเป็นสีขาวทั้งแถว: พื้นหลังสูงขึ้น ความเด่นของเส้นลดลงเป็น 0.75
+    image = make_line(100)
+    image[:10] = 255
+    tracker.scan(image, 200)
+    assert tracker.measure(max_width=10).prominence == pytest.approx(0.75)
+
+
+def test_measure_without_line():
+    tracker = LineTracker(FrameWorkspace())
+    tracker.scan(make_line(100, width=0), 200)
+
+    assert tracker.measure() is None
+
+
+def test_locate_follows_line_inside_window():
+    tracker = LineTracker(FrameWorkspace(), margin=8)
+
+    assert tracker.locate(make_line(100), 200) == 100
+    assert tracker.locate(make_line(104), 200) == 104
+    assert tracker.full_scans == 1
+    assert tracker.hits == 1
+
+    # เส้นกระโดดออกนอกหน้าต่าง: ถอยไปสแกนทั้งความกว้าง
+    assert tracker.locate(make_line(30), 200) == 30
+    assert tracker.full_scans == 2
+
+
+def test_predictor_tracks_constant_velocity():
+    predictor = LinePredictor(alpha=0.5, beta=0.1)
+    for i in range(200):
+        predictor.update(100.0 + 50.0 * i * 0.01, i * 0.01)
+
+    assert predictor.velocity == pytest.approx(50.0, rel=0.01)
+    assert predictor.predict(2.0) == pytest.approx(200.0, abs=0.5)
+
+
+def test_predictor_restarts_after_gap():
+    predictor = LinePredictor(max_gap=0.25)
+    assert predictor.predict(0.0) is None
+
+    predictor.update(100.0, 0.0)
+    predictor.update(110.0, 0.01)
+    predictor.update(50.0, 1.0)
+
+    assert predictor.x == 50.0
+    assert predictor.velocity == 0.0
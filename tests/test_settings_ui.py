@@ -0,0 +1,48 @@
+import tkinter as tk
+
+import pytest
+
+from ui.settings_ui import SettingsUI
+from utils.config_manager import ConfigManager
+
+
+@pytest.fixture
+def root():
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        pytest.skip(f"Tk is not available: {e}")
+    root.withdraw()
+    yield root
+    root.destroy()
+
+
+@pytest.fixture
+def settings(root, tmp_path):
+    config_manager = ConfigManager(str(tmp_path / "config.json"))
+    changes = []
+    config_manager.register_observer(
+        lambda config, changed_keys: changes.append(changed_keys)
+    )
+    settings_ui = SettingsUI(root, config_manager)
+    settings_ui.open_settings()
+    settings_ui.changes = changes
+    return settings_ui
+
+
+def test_color_edit_does_not_touch_live_config(settings):
+    live_colors = settings.config_manager.config["ui_colors"]
+    settings.color_settings.color_pickers["primary"].update_color("#123456")
+
+    # ยกเลิกได้โดยค่าจริงไม่เปลี่ยน
+    assert live_colors["primary"] != "#123456"
+    assert settings.changes == []
+
+
+def test_save_notifies_and_writes_color_change(settings):
+    settings.color_settings.color_pickers["primary"].update_color("#123456")
+    settings.save_settings()
+
+    assert {"ui_colors"} in settings.changes
+    assert settings.config_manager.config["ui_colors"]["primary"] == "#123456"
+    assert '"#123456"' in open(settings.config_manager.config_file).read()
@@ -0,0 +1,146 @@
+import csv
+import json
+import time
+
+import pytest
+
+from utils import timing
+from utils.timing import (
+    HISTOGRAM_BINS,
+    FixedRateScheduler,
+    StageTimer,
+    _bin_of,
+    _bin_upper_ns,
+)
+
+
+def test_scheduler_holds_target_rate():
+    scheduler = FixedRateScheduler(200)
+    start = time.perf_counter()
+    for _ in range(41):
+        scheduler.wait()
+    elapsed = time.perf_counter() - start
+
+    stats = scheduler.get_stats()
+    assert stats["ticks"] == 40
+    # 40 คาบของ 5 ms (ยอมให้ช้ากว่ากำหนดได้บ้างบนเครื่องที่มีงานอื่น)
+    assert 0.2 <= elapsed < 0.4
+    assert stats["actual_hz"] == pytest.approx(200, rel=0.3)
+
+
+def test_scheduler_unlimited_rate_reports_no_jitter():
+    scheduler = FixedRateScheduler(0)
+    for _ in range(10):
+        scheduler.wait()
+
+    stats = scheduler.get_stats()
+    assert scheduler.period == 0.0
+    assert stats["ticks"] == 9
+    assert stats["p50_jitter_ms"] == 0.0
+    assert stats["max_jitter_ms"] == 0.0
+    assert stats["overruns"] == 0
+
+
+class FakeClock:
+    """แทนโมดูล time ใน utils.timing: sleep เลื่อนเวลาทันทีโดยไม่รอจริง"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def perf_counter(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds if seconds > 0 else 0.0001
+
+
+def test_scheduler_resets_deadline_only_when_a_period_behind(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(timing, "time", clock)
+    scheduler = FixedRateScheduler(100)
+    scheduler.wait()
+    assert scheduler._deadline == pytest.approx(0.01)
+    assert clock.now >= 0.01
+
+    # ช้ากว่ากำหนดไม่ถึงหนึ่งคาบ: ไม่รอ และยังใช้กำหนดเดิม
+    clock.now = 0.025
+    scheduler.wait()
+    assert scheduler.overruns == 1
+    assert scheduler._deadline == pytest.approx(0.02)
+    assert clock.now == 0.025
+
+    # ช้ากว่ากำหนดเกินหนึ่งคาบ: เริ่มนับใหม่จากตอนนี้
+    clock.now = 0.05
+    scheduler.wait()
+    assert scheduler.overruns == 2
+    assert scheduler._deadline == pytest.approx(0.05)
+
+
+def test_histogram_bins_are_ordered_and_contain_their_values():
+    values = list(range(0, 4096)) + [
+        10**k + d for k in range(4, 13) for d in (-1, 0, 1)
+    ]
+    previous = 0
+    for ns in values:
+        index = _bin_of(ns)
+        assert 0 <= index < HISTOGRAM_BINS
+        assert index >= previous
+        previous = index
+        assert ns < _bin_upper_ns(index)
+        if index > 0:
+            assert _bin_upper_ns(index - 1) <= ns
+
+
+def test_histogram_bins_grow_by_half_an_octave():
+    # สองช่องต่อช่วงที่เพิ่มเป็นสองเท่า
+    assert _bin_of(1_000_000) + 2 == _bin_of(2_000_000)
+    assert _bin_of(1 << 100) == HISTOGRAM_BINS - 1
+
+
+def test_stage_timer_stats():
+    timer = StageTimer()
+    for ns in (1_000_000, 2_000_000, 3_000_000, 4_000_000):
+        timer.add("detect", ns)
+        timer.add("frame", 2 * ns)
+
+    stats = timer.get_stats()["detect"]
+    assert stats["count"] == 4
+    assert stats["avg_ms"] == pytest.approx(2.5)
+    assert stats["max_ms"] == pytest.approx(4.0)
+    assert 2.0 <= stats["p50_ms"] <= 4.0
+    assert stats["p99_ms"] <= stats["max_ms"]
+    assert stats["share"] == pytest.approx(0.5)
+
+
+def test_stage_timer_laps():
+    timer = StageTimer()
+    timer.start()
+    timer.lap("capture")
+    timer.lap("detect")
+    timer.end()
+
+    stats = timer.get_stats()
+    assert set(stats) == {"capture", "detect", "frame"}
+    assert all(stage["count"] == 1 for stage in stats.values())
+
+    timer.reset()
+    assert timer.get_stats() == {}
+
+
+def test_stage_timer_export(tmp_path):
+    timer = StageTimer()
+    timer.add("detect", 1_000_000)
+    timer.add("detect", 1_000_000)
+
+    json_path = tmp_path / "timing.json"
+    timer.export(str(json_path))
+    data = json.loads(json_path.read_text(encoding="utf-8"))
+    assert data["stages"]["detect"]["histogram"][0]["count"] == 2
+
+    csv_path = tmp_path / "timing.csv"
+    timer.export(str(csv_path))
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 1
+    assert rows[0]["stage"] == "detect"
+    assert rows[0]["bin_count"] == "2"
@@ -0,0 +1,88 @@
+import numpy as np
+
+from detector.frame_pipeline import FrameWorkspace
+from detector.zone_scanner import (
+    ZONE_GREEN,
+    ZONE_RED,
+    ZONE_UNKNOWN,
+    ZoneScanner,
+    ZoneSegment,
+)
+
+
+def make_gauge(order="BGR", width=100, height=9):
+    """ภาพเกจ: แดง [10, 30), เขียว [30, 70), แดง [70, 90) ที่เหลือเป็นสีดำ"""
+    workspace = FrameWorkspace(order)
+    image = np.zeros((height, width, workspace.channels), dtype=np.uint8)
+    red, green = workspace.red_index, workspace.green_index
+    image[:, 10:30, red] = 200
+    image[:, 30:70, green] = 200
+    image[:, 70:90, red] = 200
+    return workspace, image
+
+
+def test_segments_run_length():
+    scanner = ZoneScanner(FrameWorkspace())
+    codes = np.array([0, 0, 1, 1, 1, 2, 0], dtype=np.uint8)
+
+    assert scanner.segments(codes) == [
+        ZoneSegment("unknown", 0, 2),
+        ZoneSegment("green", 2, 5),
+        ZoneSegment("red", 5, 6),
+        ZoneSegment("unknown", 6, 7),
+    ]
+
+
+def test_segments_single_run_and_empty():
+    scanner = ZoneScanner(FrameWorkspace())
+
+    assert scanner.segments(np.full(5, ZONE_RED, dtype=np.uint8)) == [
+        ZoneSegment("red", 0, 5)
+    ]
+    assert scanner.segments(np.zeros(0, dtype=np.uint8)) == []
+
+
+def test_scan_finds_gauge_zones():
+    for order in ("BGR", "BGRA", "RGB"):
+        workspace, image = make_gauge(order)
+        scanner = ZoneScanner(workspace)
+
+        assert scanner.scan(image, band_rows=3) == [
+            ZoneSegment("unknown", 0, 10),
+            ZoneSegment("red", 10, 30),
+            ZoneSegment("green", 30, 70),
+            ZoneSegment("red", 70, 90),
+            ZoneSegment("unknown", 90, 100),
+        ]
+
+
+def test_classify_requires_dominant_bright_channel():
+    workspace = FrameWorkspace("BGR")
+    scanner = ZoneScanner(workspace)
+    row = np.array(
+        [
+            [0, 200, 0],  # เขียวชัดเจน
+            [0, 90, 0],  # มืดเกินไป
+            [0, 150, 100],  # เขียวไม่ถึง 1.5 เท่าของแดง
+            [0, 0, 200],  # แดงชัดเจน
+        ],
+        dtype=np.uint8,
+    )[np.newaxis]
+
+    codes = scanner.classify(row)
+
+    assert codes.tolist() == [ZONE_GREEN, ZONE_UNKNOWN, ZONE_UNKNOWN, ZONE_RED]
+
+
+def test_classify_points_matches_full_row():
+    rng = np.random.default_rng(0)
+    for order in ("BGR", "BGRA", "RGB"):
+        workspace = FrameWorkspace(order)
+        scanner = ZoneScanner(workspace)
+        image = rng.integers(0, 256, (20, 120, workspace.channels), dtype=np.uint8)
+        xs = np.arange(0, 120, 7, dtype=np.intp)
+        for band_rows in (1, 3, 5):
+            full = scanner.classify(image, band_rows).copy()
+            points = scanner.classify_points(image, xs, band_rows)
+
+            np.testing.assert_array_equal(points, full[xs])
@@ -0,0 +1,105 @@
+import time
+
+
+class AnimationClock:
+    """นาฬิกาอนิเมชันกลางที่ขับทุก widget ด้วย root.after เพียงสายเดียวบนเธรดหลักของ Tk
+
+    widget ลงทะเบียนฟังก์ชัน callback(now) ด้วยชื่อ แต่ละ tick เรียกทุกฟังก์ชันตามลำดับที่ลงทะเบียน
+    ฟังก์ชันที่คืนค่า False จะถูกถอดออก เมื่อไม่มีอนิเมชันเหลือหรือถูกหยุดชั่วคราว
+    (เช่นย่อหน้าต่าง หรือบอทกำลังทำงาน) จะไม่มีการตั้งเวลา tick ถัดไปเลย
+    """
+
+    def __init__(self, root, fps=30):
+        """
+        Args:
+            root: หน้าต่างหลักของ Tk
+            fps: อัตราเฟรมสูงสุดของอนิเมชัน
+        """
+        self.root = root
+        self.interval_ms = max(1, int(1000 / fps)) if fps > 0 else 33
+
+        self._callbacks = {}
+        self._paused = set()
+        self._after_id = None
+
+        self.ticks = 0
+
+        # หยุดเมื่อย่อหน้าต่าง และทำต่อเมื่อหน้าต่างกลับมาแสดง
+        root.bind("<Unmap>", self._on_unmap, add="+")
+        root.bind("<Map>", self._on_map, add="+")
+
+    def add(self, name, callback):
+        """ลงทะเบียนอนิเมชัน (ชื่อเดิมจะถูกแทนที่)
+
+        Args:
+            name: ชื่อของอนิเมชัน
+            callback: ฟังก์ชัน callback(now) คืนค่า False เมื่ออนิเมชันจบ
+        """
+        self._callbacks[name] = callback
+        self._schedule()
+
+    def remove(self, name):
+        """ถอดอนิเมชันออก (ไม่มีผลถ้าไม่ได้ลงทะเบียนไว้)"""
+        self._callbacks.pop(name, None)
+        if not self._callbacks:
+            self._cancel()
+
+    def __contains__(self, name):
+        return name in self._callbacks
+
+    def pause(self, reason):
+        """หยุดทุกอนิเมชันชั่วคราวด้วยเหตุผลที่กำหนด
+
+        Args:
+            reason: ชื่อเหตุผล (เช่น "iconified", "running") ต้อง resume ด้วยชื่อเดียวกัน
+        """
+        self._paused.add(reason)
+        self._cancel()
+
+    def resume(self, reason):
+        """ยกเลิกการหยุดด้วยเหตุผลที่กำหนด ทำต่อเมื่อไม่มีเหตุผลให้หยุดเหลืออยู่"""
+        self._paused.discard(reason)
+        self._schedule()
+
+    @property
+    def paused(self):
+        return bool(self._paused)
+
+    def stop(self):
+        """ถอดอนิเมชันทั้งหมดและหยุด tick"""
+        self._callbacks.clear()
+        self._cancel()
+
+    def _on_unmap(self, event):
+        if event.widget is self.root:
+            self.pause("iconified")
+
+    def _on_map(self, event):
+        if event.widget is self.root:
+            self.resume("iconified")
+
+    def _schedule(self):
+        """ตั้งเวลา tick ถัดไปถ้ามีอนิเมชันและไม่ได้หยุดอยู่"""
+        if self._after_id is None and self._callbacks and not self._paused:
+            self._after_id = self.root.after(self.interval_ms, self._tick)
+
+    def _cancel(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _tick(self):
+        """เรียกทุกอนิเมชันหนึ่งเฟรม แล้วตั้งเวลารอบถัดไป"""
+        self._after_id = None
+        self.ticks += 1
+        now = time.perf_counter()
+
+        for name, callback in list(self._callbacks.items()):
+            try:
+                if callback(now) is False:
+                    self._callbacks.pop(name, None)
+            except Exception as e:
+                print(f"Error in animation '{name}': {e}")
+                self._callbacks.pop(name, None)
+
+        self._schedule()
@@ -3,15 +3,91 @@ import math
 import random
 import time
 
+from ui.animation import AnimationClock
+
+# tag ของรายการบน canvas แยกตามบทบาทของสี เพื่อเปลี่ยนสีด้วย itemconfig ครั้งเดียวต่อบทบาท
+TAG_BACKGROUND = "background"
+TAG_DANGER = "zone-danger"
+TAG_WARNING = "zone-warning"
+TAG_SAFE = "zone-safe"
+TAG_ACCENT = "accent"
+TAG_CRT = "crt"
+TAG_CRT_OUTLINE = "crt-outline"
+# ทุกรายการของตัวชี้ที่เลื่อนไปพร้อมกัน
+TAG_INDICATOR = "indicator"
+
+# seed ของความเข้มสีรายช่อง แยกตามขนาดตาราง (rows, cols)
+_seed_cache = {}
+
+
+def _hex_to_rgb(color):
+    """แปลงรหัสสี HEX (#rrggbb) เป็น tuple (r, g, b)"""
+    return int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)
+
+
+def _cell_seeds(rows, cols):
+    """seed แบบแน่นอนของแต่ละช่อง (ค่าเดียวกับ hash((row, col)) % 20 ที่ใช้มาเดิม)"""
+    seeds = _seed_cache.get((rows, cols))
+    if seeds is None:
+        import numpy as np
+
+        seeds = _seed_cache[(rows, cols)] = np.array(
+            [[hash((row, col)) % 20 for col in range(cols)] for row in range(rows)],
+            dtype=np.float64,
+        ).reshape(rows, cols)
+    return seeds
+
+
+def _fill_rect(image, x1, y1, x2, y2, color):
+    """ระบายสี่เหลี่ยมลงภาพ (พิกัดแบบ canvas ปัดเป็นพิกเซลและตัดส่วนที่เกินภาพ)"""
+    h, w = image.shape[:2]
+    x1 = max(0, int(round(x1)))
+    y1 = max(0, int(round(y1)))
+    x2 = min(w, int(round(x2)))
+    y2 = min(h, int(round(y2)))
+    if x2 > x1 and y2 > y1:
+        image[y1:y2, x1:x2] = color
+
+
+def _fill_cells(image, x, y, colors, cell_size):
+    """ระบายตารางช่องพิกเซล (เว้นเส้นตาราง 1 พิกเซลท้ายแต่ละช่อง) ลงภาพในครั้งเดียว
+
+    Args:
+        image: ภาพ RGB ปลายทาง
+        x: ขอบซ้ายของช่องแรก
+        y: ขอบบนของช่องแรก
+        colors: สีของแต่ละช่อง ขนาด (rows, cols, 3)
+        cell_size: ขนาดของช่อง (พิกเซล)
+    """
+    import numpy as np
+
+    rows, cols = colors.shape[:2]
+    if not rows or not cols:
+        return
+
+    block = np.repeat(np.repeat(colors, cell_size, axis=0), cell_size, axis=1)
+    mask = np.ones(block.shape[:2], dtype=bool)
+    mask[cell_size - 1 :: cell_size, :] = False
+    mask[:, cell_size - 1 :: cell_size] = False
+
+    x = int(round(x))
+    y = int(round(y))
+    h = min(block.shape[0], image.shape[0] - y)
+    w = min(block.shape[1], image.shape[1] - x)
+    if h <= 0 or w <= 0:
+        return
+    np.copyto(image[y : y + h, x : x + w], block[:h, :w], where=mask[:h, :w, None])
+
 
 class PixelGauge:
-    def __init__(self, parent, colors):
+    def __init__(self, parent, colors, clock=None):
         """
         สร้างเกจแบบพิกเซลอาร์ตสำหรับการตกปลา
 
         Args:
             parent: Widget ที่จะเป็น parent ของ Canvas
             colors: Dictionary ที่เก็บค่าสีต่างๆ ที่ใช้ในเกจ
+            clock: AnimationClock ที่ใช้ขับอนิเมชัน (None = สร้างของตัวเอง)
         """
         self.parent = parent
         self.colors = colors
@@ -29,6 +105,8 @@ class PixelGauge:
         )
         self.canvas.pack(fill="x", pady=5)
 
+        self.clock = clock or AnimationClock(self.canvas.winfo_toplevel())
+
         # ตัวแปรสำหรับเก็บรายการในเกจ
         self.gauge_line = None
         self.gauge_shadow = None
@@ -36,6 +114,23 @@ class PixelGauge:
         self.gauge_blinker = None
         self.gauge_indicators = []
 
+        # ภาพพื้นหลังของเกจ (ต้องเก็บอ้างอิงไว้ ไม่เช่นนั้น Tk จะลบภาพทิ้ง)
+        self.background_image = None
+        self._background_key = None
+
+        # ขนาดและขอบเขตโซนของเกจที่วาดล่าสุด และตำแหน่งตัวชี้ล่าสุด
+        self._layout = None
+        self.last_relative_pos = None
+
+        # ความกว้างของ canvas (อัปเดตจาก <Configure>) ตำแหน่งตัวชี้ (พิกเซล) และสีไฟกะพริบปัจจุบัน
+        self.canvas_width = 380
+        self.indicator_x = None
+        self._blinker_fill = None
+        self.canvas.bind("<Configure>", self._on_configure)
+        self.canvas.bind(
+            "<Map>", lambda event: self.canvas.after_idle(self._show_background)
+        )
+
         # ตัวแปรสำหรับการกะพริบ
         self.blink_state = False
         self.last_blink_time = time.time()
@@ -44,125 +139,188 @@ class PixelGauge:
         self.create_pixel_gauge()
 
     def create_pixel_gauge(self):
-        """สร้างเกจแบบพิกเซลที่มีรายละเอียดและแบ่งโซนอย่างชัดเจน"""
-        # ตรวจสอบความกว้างของ canvas
-        width = self.canvas.winfo_width()
-        if width < 10:
-            width = 380
+        """สร้างเกจแบบพิกเซลที่มีรายละเอียดและแบ่งโซนอย่างชัดเจน
+
+        ส่วนที่ไม่เปลี่ยน (ขอบ โซนสี ไอคอน เส้นแบ่ง) ถูกวาดลงภาพ RGB เพียงภาพเดียว
+        บน canvas จึงเหลือเพียงภาพพื้นหลัง ป้ายกำกับ และตัวชี้ที่ขยับได้
+        """
+        width = self.canvas_width
 
         # ล้าง canvas
         self.canvas.delete("all")
 
-        # สร้างกรอบเกจด้วยเส้นพิกเซล
-        self.canvas.create_rectangle(
-            0, 0, width, 60, outline=self.accent_color, width=1
-        )
-
-        # สร้างเส้นขอบด้านในแบบพิกเซล
-        pixel_border_size = 2
-        for i in range(0, width, pixel_border_size * 2):
-            # เส้นขอบด้านบน
-            self.canvas.create_rectangle(
-                i,
-                0,
-                i + pixel_border_size,
-                pixel_border_size,
-                fill=self.crt_color,
-                outline="",
-            )
-            # เส้นขอบด้านล่าง
-            self.canvas.create_rectangle(
-                i,
-                60 - pixel_border_size,
-                i + pixel_border_size,
-                60,
-                fill=self.crt_color,
-                outline="",
-            )
-
-        for i in range(0, 60, pixel_border_size * 2):
-            # เส้นขอบด้านซ้าย
-            self.canvas.create_rectangle(
-                0,
-                i,
-                pixel_border_size,
-                i + pixel_border_size,
-                fill=self.crt_color,
-                outline="",
-            )
-            # เส้นขอบด้านขวา
-            self.canvas.create_rectangle(
-                width - pixel_border_size,
-                i,
-                width,
-                i + pixel_border_size,
-                fill=self.crt_color,
-                outline="",
-            )
-
         # พื้นที่ใช้งานจริงของเกจ (ภายในขอบ)
         gauge_padding = 4
         gauge_inner_width = width - (gauge_padding * 2)
         gauge_inner_height = 52
 
-        # สร้างพื้นหลังพิกเซลด้วยลายตาราง
-        cell_size = 4  # ขนาดพิกเซล
-        rows = gauge_inner_height // cell_size
-        cols = gauge_inner_width // cell_size
-
-        # วาดพื้นหลังเป็นลายตาราง
-        for row in range(rows):
-            for col in range(cols):
-                x1 = gauge_padding + (col * cell_size)
-                y1 = gauge_padding + (row * cell_size)
-                x2 = x1 + cell_size - 1  # -1 เพื่อสร้างเส้นตารางบาง
-                y2 = y1 + cell_size - 1
-
-                # ลายตารางสลับสี
-                if (row + col) % 2 == 0:
-                    color = self.bg_color
-                else:
-                    # สีที่เข้มกว่าเล็กน้อยเพื่อสร้างลายตาราง
-                    r = max(0, int(int(self.bg_color[1:3], 16) * 0.8))
-                    g = max(0, int(int(self.bg_color[3:5], 16) * 0.8))
-                    b = max(0, int(int(self.bg_color[5:7], 16) * 0.8))
-                    color = f"#{r:02x}{g:02x}{b:02x}"
-
-                self.canvas.create_rectangle(x1, y1, x2, y2, fill=color, outline="")
-
         # กำหนดขนาดของแต่ละโซน
         red_zone_width = gauge_inner_width * 0.18
         buffer_width = gauge_inner_width * 0.07
         green_zone_width = gauge_inner_width - (2 * red_zone_width) - (2 * buffer_width)
 
+        # พื้นหลังของเกจเป็นภาพเดียว วาดเมื่อ canvas แสดงบนจอแล้ว
+        # (NumPy จะถูก import ตอนนั้น ไม่หน่วงการเปิดหน้าต่างครั้งแรก)
+        self._layout = (
+            width,
+            gauge_padding,
+            gauge_inner_height,
+            red_zone_width,
+            buffer_width,
+            green_zone_width,
+        )
+        self.canvas.create_image(0, 0, anchor="nw", tags=TAG_BACKGROUND)
+        if self.canvas.winfo_ismapped():
+            self._show_background()
+
+        # เพิ่มป้ายกำกับโซน
+        self._add_zone_labels(
+            gauge_padding,
+            gauge_inner_height,
+            red_zone_width,
+            buffer_width,
+            green_zone_width,
+            width,
+        )
+
+        # สร้างตัวชี้
+        line_x = width // 2
+        self._create_gauge_indicator(line_x, gauge_padding, gauge_inner_height)
+        self.indicator_x = line_x
+        self._blinker_fill = self.accent_color
+
+        # เพิ่มเอฟเฟกต์เรืองแสงแบบ CRT
+        self._add_glow_effect(line_x, gauge_padding + gauge_inner_height / 2)
+
+    def _on_configure(self, event):
+        """จำความกว้างของ canvas และวาดเกจใหม่เมื่อความกว้างเปลี่ยน"""
+        if event.width < 10 or event.width == self.canvas_width:
+            return
+        self.canvas_width = event.width
+        if self._layout is not None and self._layout[0] != event.width:
+            self.create_pixel_gauge()
+            if self.last_relative_pos is not None:
+                self.update_position(self.last_relative_pos)
+
+    def _show_background(self):
+        """ใส่ภาพพื้นหลังให้รายการภาพของเกจ (วาดใหม่เฉพาะเมื่อขนาดหรือสีเปลี่ยน)"""
+        if self._layout is None:
+            return
+        self._render_background(*self._layout)
+        self.canvas.itemconfig(TAG_BACKGROUND, image=self.background_image)
+
+    def _render_background(
+        self,
+        width,
+        gauge_padding,
+        gauge_inner_height,
+        red_zone_width,
+        buffer_width,
+        green_zone_width,
+    ):
+        """สร้างภาพพื้นหลังของเกจเป็น PhotoImage (ใช้ภาพเดิมถ้าขนาดและสีไม่เปลี่ยน)
+
+        Returns:
+            bool: True ถ้าสร้างภาพใหม่
+        """
+        key = (
+            width,
+            self.bg_color,
+            self.accent_color,
+            self.crt_color,
+            self.success_color,
+            self.danger_color,
+        )
+        if self.background_image is not None and self._background_key == key:
+            return False
+
+        image = self.render_background_array(
+            width,
+            gauge_padding,
+            gauge_inner_height,
+            red_zone_width,
+            buffer_width,
+            green_zone_width,
+        )
+
+        # ส่งภาพให้ Tk ในรูปแบบ PPM (P6) โดยตรง ไม่ต้องผ่านไลบรารีภาพอื่น
+        height = image.shape[0]
+        header = f"P6 {width} {height} 255 ".encode("ascii")
+        self.background_image = tk.PhotoImage(
+            master=self.canvas,
+            width=width,
+            height=height,
+            data=header + image.tobytes(),
+            format="PPM",
+        )
+        self._background_key = key
+        return True
+
+    def render_background_array(
+        self,
+        width,
+        gauge_padding,
+        gauge_inner_height,
+        red_zone_width,
+        buffer_width,
+        green_zone_width,
+    ):
+        """วาดส่วนที่ไม่เปลี่ยนของเกจลงอาร์เรย์ RGB
+
+        Returns:
+            numpy.ndarray: ภาพขนาด (60, width, 3) ชนิด uint8
+        """
+        import numpy as np
+
+        image = np.empty((60, width, 3), dtype=np.uint8)
+        image[:] = _hex_to_rgb(self.bg_color)
+
+        # สร้างกรอบเกจด้วยเส้นพิกเซล
+        accent = _hex_to_rgb(self.accent_color)
+        image[[0, -1], :] = accent
+        image[:, [0, -1]] = accent
+
+        # สร้างเส้นขอบด้านในแบบพิกเซล (ยาว 2 พิกเซล เว้น 2 พิกเซล)
+        pixel_border_size = 2
+        crt = _hex_to_rgb(self.crt_color)
+        dashes_x = np.arange(width) % (pixel_border_size * 2) < pixel_border_size
+        dashes_y = np.arange(60) % (pixel_border_size * 2) < pixel_border_size
+        image[:pixel_border_size, dashes_x] = crt
+        image[-pixel_border_size:, dashes_x] = crt
+        image[dashes_y, :pixel_border_size] = crt
+        image[dashes_y, -pixel_border_size:] = crt
+
         # สร้างพื้นหลังสีเข้มเพื่อให้โซนต่างๆ โดดเด่น
-        self.canvas.create_rectangle(
+        # (ลายตารางเดิมถูกพื้นหลังนี้ทับทั้งหมด จึงไม่ต้องวาด)
+        _fill_rect(
+            image,
             gauge_padding,
             gauge_padding,
             width - gauge_padding,
             gauge_padding + gauge_inner_height,
-            fill="#1e2430",
-            outline="",
+            _hex_to_rgb("#1e2430"),
         )
 
         # เพิ่มเส้นขีดบอกระยะเพื่อเพิ่มรายละเอียด
         tick_height = 2
+        gauge_inner_width = width - (gauge_padding * 2)
         tick_spacing = gauge_inner_width / 20
+        tick_color = _hex_to_rgb("#717e96")
         for i in range(21):  # 20 ช่วง = 21 เส้น
             x = gauge_padding + (i * tick_spacing)
-            self.canvas.create_line(
+            _fill_rect(
+                image,
                 x,
                 gauge_padding + gauge_inner_height - tick_height,
-                x,
+                x + 1,
                 gauge_padding + gauge_inner_height,
-                fill="#717e96",
-                width=1,
+                tick_color,
             )
 
         # สร้างไอคอน 8-bit สำหรับแสดงโซน
         self._draw_zone_icons(
+            image,
             gauge_padding,
-            gauge_inner_width,
             red_zone_width,
             buffer_width,
             green_zone_width,
@@ -170,10 +328,11 @@ class PixelGauge:
         )
 
         # สร้างโซนสีต่างๆ ด้วยลายพิกเซล
+        cell_size = 4  # ขนาดพิกเซล
         self._draw_colored_zones(
+            image,
             gauge_padding,
-            rows,
-            cols,
+            gauge_inner_height // cell_size,
             cell_size,
             red_zone_width,
             buffer_width,
@@ -183,33 +342,23 @@ class PixelGauge:
 
         # สร้างเส้นแบ่งโซน
         self._draw_zone_dividers(
-            gauge_padding, gauge_inner_height, red_zone_width, buffer_width, width
-        )
-
-        # สร้างเส้นกลาง
-        self._draw_center_line(width, gauge_padding, gauge_inner_height)
-
-        # เพิ่มป้ายกำกับโซน
-        self._add_zone_labels(
+            image,
             gauge_padding,
             gauge_inner_height,
             red_zone_width,
             buffer_width,
-            green_zone_width,
             width,
         )
 
-        # สร้างตัวชี้
-        line_x = width / 2
-        self._create_gauge_indicator(line_x, gauge_padding, gauge_inner_height)
+        # สร้างเส้นกลาง
+        self._draw_center_line(image, width, gauge_padding, gauge_inner_height)
 
-        # เพิ่มเอฟเฟกต์เรืองแสงแบบ CRT
-        self._add_glow_effect(line_x, gauge_padding + gauge_inner_height / 2)
+        return image
 
     def _draw_zone_icons(
         self,
+        image,
         gauge_padding,
-        gauge_inner_width,
         red_zone_width,
         buffer_width,
         green_zone_width,
@@ -219,6 +368,7 @@ class PixelGauge:
         # ไอคอนอันตราย (ซ้าย)
         danger_icon_left = ["  XX  ", " XXXX ", "XXXXXX", "XXXXXX", " XXXX ", "  XX  "]
         self._draw_pixel_icon(
+            image,
             danger_icon_left,
             gauge_padding + red_zone_width / 2 - 12,
             gauge_padding + 5,
@@ -228,6 +378,7 @@ class PixelGauge:
         # ไอคอนปลอดภัย (กลาง)
         safe_icon = ["      ", " XXXX ", "X    X", "X XX X", "X    X", " XXXX "]
         self._draw_pixel_icon(
+            image,
             safe_icon,
             gauge_padding + red_zone_width + buffer_width + green_zone_width / 2 - 12,
             gauge_padding + 5,
@@ -237,6 +388,7 @@ class PixelGauge:
         # ไอคอนอันตราย (ขวา)
         danger_icon_right = ["  XX  ", " XXXX ", "XXXXXX", "XXXXXX", " XXXX ", "  XX  "]
         self._draw_pixel_icon(
+            image,
             danger_icon_right,
             width - gauge_padding - red_zone_width / 2 - 12,
             gauge_padding + 5,
@@ -245,128 +397,84 @@ class PixelGauge:
 
     def _draw_colored_zones(
         self,
+        image,
         gauge_padding,
         rows,
-        cols,
         cell_size,
         red_zone_width,
         buffer_width,
         green_zone_width,
         width,
     ):
-        """วาดโซนสีต่างๆ ด้วยลายพิกเซลที่มีประสิทธิภาพมากขึ้น"""
-        h, w = rows, cols
-
-        # สร้าง grid ขนาด h x w แทนการวนลูปซ้อน
-        for row in range(rows):
-            # โซนแดงซ้าย
-            red_cols = int(red_zone_width // cell_size)
-            for col in range(red_cols):
-                x1 = gauge_padding + (col * cell_size)
-                y1 = gauge_padding + (row * cell_size)
-                x2 = x1 + cell_size - 1
-                y2 = y1 + cell_size - 1
-
-                # ใช้ seed ที่แน่นอนในการสุ่มเพื่อให้ได้ลายเดิมทุกครั้ง
-                seed = hash((row, col)) % 20
-                intensity = 0.9 + seed / 100
-                color = self._adjust_color_intensity(self.danger_color, intensity)
-
-                self.canvas.create_rectangle(x1, y1, x2, y2, fill=color, outline="")
-
-            # โซนบัฟเฟอร์ซ้าย
-            buffer_cols = int(buffer_width // cell_size)
-            for col in range(buffer_cols):
-                x1 = gauge_padding + red_zone_width + (col * cell_size)
-                y1 = gauge_padding + (row * cell_size)
-                x2 = x1 + cell_size - 1
-                y2 = y1 + cell_size - 1
-
-                # ไล่ระดับสีจากแดงไปเขียว
-                ratio = col / max(1, buffer_cols - 1)
-                color = self._blend_colors(self.danger_color, self.success_color, ratio)
-
-                self.canvas.create_rectangle(x1, y1, x2, y2, fill=color, outline="")
-
-            # โซนเขียวกลาง
-            green_cols = int(green_zone_width // cell_size)
-            for col in range(green_cols):
-                x1 = gauge_padding + red_zone_width + buffer_width + (col * cell_size)
-                y1 = gauge_padding + (row * cell_size)
-                x2 = x1 + cell_size - 1
-                y2 = y1 + cell_size - 1
-
-                # ใช้ seed ที่แน่นอนในการสุ่มเพื่อให้ได้ลายเดิมทุกครั้ง
-                seed = hash((row, col)) % 20
-                intensity = 0.9 + seed / 100
-                color = self._adjust_color_intensity(self.success_color, intensity)
-
-                self.canvas.create_rectangle(x1, y1, x2, y2, fill=color, outline="")
-
-            # โซนบัฟเฟอร์ขวา
-            for col in range(buffer_cols):
-                x1 = (
-                    gauge_padding
-                    + red_zone_width
-                    + buffer_width
-                    + green_zone_width
-                    + (col * cell_size)
-                )
-                y1 = gauge_padding + (row * cell_size)
-                x2 = x1 + cell_size - 1
-                y2 = y1 + cell_size - 1
+        """วาดโซนสีต่างๆ ด้วยลายพิกเซล โดยคำนวณสีของทุกช่องพร้อมกันด้วย NumPy"""
+        import numpy as np
 
-                # ไล่ระดับสีจากเขียวไปแดง
-                ratio = col / max(1, buffer_cols - 1)
-                color = self._blend_colors(self.success_color, self.danger_color, ratio)
+        danger = np.array(_hex_to_rgb(self.danger_color), dtype=np.float64)
+        success = np.array(_hex_to_rgb(self.success_color), dtype=np.float64)
 
-                self.canvas.create_rectangle(x1, y1, x2, y2, fill=color, outline="")
+        red_cols = int(red_zone_width // cell_size)
+        buffer_cols = int(buffer_width // cell_size)
+        green_cols = int(green_zone_width // cell_size)
 
-            # โซนแดงขวา
-            for col in range(red_cols):
-                x1 = width - gauge_padding - red_zone_width + (col * cell_size)
-                y1 = gauge_padding + (row * cell_size)
-                x2 = x1 + cell_size - 1
-                y2 = y1 + cell_size - 1
+        # ใช้ seed ที่แน่นอนในการสุ่มเพื่อให้ได้ลายเดิมทุกครั้ง
+        def textured(color, cols):
+            intensity = 0.9 + _cell_seeds(rows, cols) / 100
+            return np.minimum(255, color * intensity[..., None]).astype(np.uint8)
 
-                # ใช้ seed ที่แน่นอนในการสุ่มเพื่อให้ได้ลายเดิมทุกครั้ง
-                seed = hash((row, col)) % 20
-                intensity = 0.9 + seed / 100
-                color = self._adjust_color_intensity(self.danger_color, intensity)
+        # ไล่ระดับสีระหว่างสองสีตามคอลัมน์
+        def gradient(start, end, cols):
+            ratio = (np.arange(cols) / max(1, cols - 1))[:, None]
+            colors = (start * (1 - ratio) + end * ratio).astype(np.uint8)
+            return np.broadcast_to(colors, (rows, cols, 3))
 
-                self.canvas.create_rectangle(x1, y1, x2, y2, fill=color, outline="")
+        top = gauge_padding
+        green_start = gauge_padding + red_zone_width + buffer_width
 
-    # เพิ่มเมธอดช่วยสำหรับการผสมสีและปรับความเข้มของสี
-    def _blend_colors(self, color1, color2, ratio):
-        """ผสมสีระหว่างสองสีตามอัตราส่วนที่กำหนด"""
-        r1, g1, b1 = int(color1[1:3], 16), int(color1[3:5], 16), int(color1[5:7], 16)
-        r2, g2, b2 = int(color2[1:3], 16), int(color2[3:5], 16), int(color2[5:7], 16)
+        # โซนแดงซ้าย
+        _fill_cells(image, gauge_padding, top, textured(danger, red_cols), cell_size)
 
-        # คำนวณสีใหม่
-        r = int(r1 * (1 - ratio) + r2 * ratio)
-        g = int(g1 * (1 - ratio) + g2 * ratio)
-        b = int(b1 * (1 - ratio) + b2 * ratio)
-
-        # แปลงกลับเป็นรหัสสี HEX
-        return f"#{r:02x}{g:02x}{b:02x}"
+        # โซนบัฟเฟอร์ซ้าย (ไล่ระดับสีจากแดงไปเขียว)
+        _fill_cells(
+            image,
+            gauge_padding + red_zone_width,
+            top,
+            gradient(danger, success, buffer_cols),
+            cell_size,
+        )
 
-    def _adjust_color_intensity(self, color, intensity):
-        """ปรับความเข้มของสี"""
-        r, g, b = int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)
+        # โซนเขียวกลาง
+        _fill_cells(image, green_start, top, textured(success, green_cols), cell_size)
 
-        # ปรับค่าแต่ละช่องสี
-        r = min(255, int(r * intensity))
-        g = min(255, int(g * intensity))
-        b = min(255, int(b * intensity))
+        # โซนบัฟเฟอร์ขวา (ไล่ระดับสีจากเขียวไปแดง)
+        _fill_cells(
+            image,
+            green_start + green_zone_width,
+            top,
+            gradient(success, danger, buffer_cols),
+            cell_size,
+        )
 
-        # แปลงกลับเป็นรหัสสี HEX
-        return f"#{r:02x}{g:02x}{b:02x}"
+        # โซนแดงขวา
+        _fill_cells(
+            image,
+            width - gauge_padding - red_zone_width,
+            top,
+            textured(danger, red_cols),
+            cell_size,
+        )
 
     def _draw_zone_dividers(
-        self, gauge_padding, gauge_inner_height, red_zone_width, buffer_width, width
+        self,
+        image,
+        gauge_padding,
+        gauge_inner_height,
+        red_zone_width,
+        buffer_width,
+        width,
     ):
         """วาดเส้นแบ่งโซน"""
         zone_divider_width = 3
+        crt = _hex_to_rgb(self.crt_color)
         for x in [
             gauge_padding + red_zone_width,
             gauge_padding + red_zone_width + buffer_width,
@@ -375,22 +483,21 @@ class PixelGauge:
         ]:
             # สร้างเส้นแบ่งแบบพิกเซล
             for i in range(gauge_padding, gauge_padding + gauge_inner_height, 6):
-                self.canvas.create_rectangle(
+                _fill_rect(
+                    image,
                     x - zone_divider_width // 2,
                     i,
                     x + zone_divider_width // 2,
                     i + 4,
-                    fill=self.crt_color,
-                    outline="",
+                    crt,
                 )
 
-    def _draw_center_line(self, width, gauge_padding, gauge_inner_height):
+    def _draw_center_line(self, image, width, gauge_padding, gauge_inner_height):
         """วาดเส้นกลาง"""
         center_x = width / 2
+        crt = _hex_to_rgb(self.crt_color)
         for i in range(gauge_padding, gauge_padding + gauge_inner_height, 6):
-            self.canvas.create_rectangle(
-                center_x - 1, i, center_x + 1, i + 3, fill=self.crt_color, outline=""
-            )
+            _fill_rect(image, center_x - 1, i, center_x + 1, i + 3, crt)
 
     def _add_zone_labels(
         self,
@@ -411,6 +518,7 @@ class PixelGauge:
             text="DANGER",
             fill=self.danger_color,
             font=("Courier", 7, "bold"),
+            tags=TAG_DANGER,
         )
 
         # ซ้าย (ระวัง)
@@ -420,6 +528,7 @@ class PixelGauge:
             text="CAUTION",
             fill=self.warning_color,
             font=("Courier", 7, "bold"),
+            tags=TAG_WARNING,
         )
 
         # กลาง (ปลอดภัย)
@@ -429,6 +538,7 @@ class PixelGauge:
             text="SAFE ZONE",
             fill=self.success_color,
             font=("Courier", 7, "bold"),
+            tags=TAG_SAFE,
         )
 
         # ขวา (ระวัง)
@@ -438,6 +548,7 @@ class PixelGauge:
             text="CAUTION",
             fill=self.warning_color,
             font=("Courier", 7, "bold"),
+            tags=TAG_WARNING,
         )
 
         # ขวา (อันตราย)
@@ -447,6 +558,7 @@ class PixelGauge:
             text="DANGER",
             fill=self.danger_color,
             font=("Courier", 7, "bold"),
+            tags=TAG_DANGER,
         )
 
     def _create_gauge_indicator(self, line_x, gauge_padding, gauge_inner_height):
@@ -460,6 +572,7 @@ class PixelGauge:
             fill="#000000",
             outline="",
             stipple="gray25",
+            tags=TAG_INDICATOR,
         )
 
         # สร้างเส้นตัวชี้หลัก
@@ -470,6 +583,7 @@ class PixelGauge:
             gauge_padding + gauge_inner_height,
             fill=self.crt_color,
             width=3,
+            tags=(TAG_CRT, TAG_INDICATOR),
         )
 
         # สร้างหัวลูกศรด้านบน
@@ -483,6 +597,7 @@ class PixelGauge:
             gauge_padding + arrow_size + 2,
             fill=self.crt_color,
             outline="",
+            tags=(TAG_CRT, TAG_INDICATOR),
         )
 
         # สร้างไฟกะพริบด้านล่าง
@@ -494,6 +609,7 @@ class PixelGauge:
             fill=self.accent_color,
             outline=self.crt_color,
             width=1,
+            tags=(TAG_ACCENT, TAG_CRT_OUTLINE, TAG_INDICATOR),
         )
 
     def _add_glow_effect(self, x, y, radius=10):
@@ -509,21 +625,23 @@ class PixelGauge:
                 outline=self.crt_color,
                 width=1,
                 stipple=stipple,
+                tags=TAG_CRT_OUTLINE,
             )
 
-    def _draw_pixel_icon(self, icon_data, x, y, color):
+    def _draw_pixel_icon(self, image, icon_data, x, y, color):
         """วาดไอคอนแบบพิกเซล"""
         pixel_size = 4
+        rgb = _hex_to_rgb(color)
         for row, line in enumerate(icon_data):
             for col, pixel in enumerate(line):
                 if pixel == "X":
-                    self.canvas.create_rectangle(
+                    _fill_rect(
+                        image,
                         x + col * pixel_size,
                         y + row * pixel_size,
                         x + (col + 1) * pixel_size - 1,
                         y + (row + 1) * pixel_size - 1,
-                        fill=color,
-                        outline="",
+                        rgb,
                     )
 
     def update_position(self, relative_pos):
@@ -537,53 +655,14 @@ class PixelGauge:
                 zone_type: "danger", "warning", "safe"
                 position_text: "LEFT", "RIGHT", "LEFT-MID", "RIGHT-MID", "CENTER"
         """
-        width = self.canvas.winfo_width()
-        if width < 10:
-            width = 380
+        self.last_relative_pos = relative_pos
 
-        gauge_padding = 4
-        gauge_inner_height = 52
-
-        line_x = width * relative_pos
-
-        # อัปเดตเส้นตัวชี้
-        self.canvas.coords(
-            self.gauge_line,
-            line_x,
-            gauge_padding,
-            line_x,
-            gauge_padding + gauge_inner_height,
-        )
-
-        # อัปเดตเงา
-        self.canvas.coords(
-            self.gauge_shadow,
-            line_x - 3,
-            gauge_padding,
-            line_x + 3,
-            gauge_padding + gauge_inner_height,
-        )
-
-        # อัปเดตหัวลูกศร
-        arrow_size = 8
-        self.canvas.coords(
-            self.gauge_arrow,
-            line_x - arrow_size,
-            gauge_padding,
-            line_x + arrow_size,
-            gauge_padding,
-            line_x,
-            gauge_padding + arrow_size + 2,
-        )
-
-        # อัปเดตไฟกะพริบ
-        self.canvas.coords(
-            self.gauge_blinker,
-            line_x - 4,
-            gauge_padding + gauge_inner_height - 8,
-            line_x + 4,
-            gauge_padding + gauge_inner_height,
-        )
+        # เลื่อนตัวชี้ทั้งกลุ่มด้วย move ครั้งเดียว เฉพาะเมื่อตำแหน่งเปลี่ยนอย่างน้อย 1 พิกเซล
+        line_x = int(round(self.canvas_width * relative_pos))
+        dx = line_x - self.indicator_x
+        if dx:
+            self.canvas.move(TAG_INDICATOR, dx, 0)
+            self.indicator_x = line_x
 
         # กำหนดสีตามโซน
         if relative_pos < 0.25:
@@ -607,21 +686,19 @@ class PixelGauge:
             zone_type = "safe"
             position_text = "CENTER"
 
-        # อัปเดตสีไฟกะพริบ
-        self.canvas.itemconfig(self.gauge_blinker, fill=blinker_color)
-
         # เอฟเฟกต์กะพริบเมื่ออยู่ในโซนอันตราย
-        current_time = time.time()
-        if (
-            relative_pos < 0.25 or relative_pos > 0.75
-        ) and current_time - self.last_blink_time > 0.25:
-            self.blink_state = not self.blink_state
-            self.last_blink_time = current_time
-
-            if self.blink_state:
-                self.canvas.itemconfig(self.gauge_blinker, fill=blinker_color)
-            else:
-                self.canvas.itemconfig(self.gauge_blinker, fill="#000000")
+        if zone_type == "danger":
+            current_time = time.time()
+            if current_time - self.last_blink_time > 0.25:
+                self.blink_state = not self.blink_state
+                self.last_blink_time = current_time
+            if not self.blink_state:
+                blinker_color = "#000000"
+
+        # อัปเดตสีไฟกะพริบเฉพาะเมื่อสีเปลี่ยน
+        if blinker_color != self._blinker_fill:
+            self.canvas.itemconfig(self.gauge_blinker, fill=blinker_color)
+            self._blinker_fill = blinker_color
 
         return zone_type, position_text
 
@@ -633,34 +710,32 @@ class PixelGauge:
             duration: ระยะเวลาของการกระตุก (วินาที)
             callback: ฟังก์ชันที่จะเรียกเมื่อสิ้นสุดการกระตุก
         """
-        # กำหนดช่วงเวลา
-        fps = 30
-        steps = int(duration * fps)
-        step_time = int(1000 / fps)  # มิลลิวินาที
-
         # กำหนดตำแหน่งเป้าหมาย
         target_pos = random.uniform(0.1, 0.9)
+        start_time = None
 
-        # อนิเมชันการกระตุก
-        def animate_bite(step=0):
-            if step >= steps:
-                if callback:
-                    callback()
-                return
+        # อนิเมชันการกระตุก (เรียกทุกเฟรมจากนาฬิกาอนิเมชัน)
+        def animate_bite(now):
+            nonlocal start_time
+            if start_time is None:
+                start_time = now
 
             # คำนวณตำแหน่งปัจจุบัน
-            progress = step / steps
+            progress = min(1.0, (now - start_time) / duration) if duration > 0 else 1.0
             easing = 1 - math.pow(1 - progress, 3)  # Ease out cubic
             current_pos = start_pos + (target_pos - start_pos) * easing
 
             # อัปเดตตำแหน่ง
             self.update_position(current_pos)
 
-            # ทำซ้ำตามจำนวนเฟรม
-            self.canvas.after(step_time, lambda: animate_bite(step + 1))
+            if progress >= 1.0:
+                if callback:
+                    callback()
+                return False
+            return True
 
         # เริ่มอนิเมชัน
-        animate_bite()
+        self.clock.add("gauge-bite", animate_bite)
 
     def set_gauge_color(
         self,
@@ -679,20 +754,41 @@ class PixelGauge:
             accent_color: สีเน้น
             crt_color: สีแสง CRT
         """
-        # อัปเดตค่าสี
-        if success_color:
-            self.success_color = success_color
-        if danger_color:
-            self.danger_color = danger_color
-        if warning_color:
-            self.warning_color = warning_color
-        if accent_color:
-            self.accent_color = accent_color
-        if crt_color:
-            self.crt_color = crt_color
-
-        # สร้างเกจใหม่
-        self.create_pixel_gauge()
+        # อัปเดตค่าสี (ข้ามทั้งหมดถ้าไม่มีสีใดเปลี่ยน)
+        changed = False
+        for attr, color in (
+            ("success_color", success_color),
+            ("danger_color", danger_color),
+            ("warning_color", warning_color),
+            ("accent_color", accent_color),
+            ("crt_color", crt_color),
+        ):
+            if color and color != getattr(self, attr):
+                setattr(self, attr, color)
+                changed = True
+
+        if changed:
+            self._apply_colors()
+
+    def _apply_colors(self):
+        """เปลี่ยนสีของรายการบน canvas ตาม tag โดยไม่ต้องสร้างเกจใหม่"""
+        self.canvas.itemconfig(TAG_DANGER, fill=self.danger_color)
+        self.canvas.itemconfig(TAG_WARNING, fill=self.warning_color)
+        self.canvas.itemconfig(TAG_SAFE, fill=self.success_color)
+        self.canvas.itemconfig(TAG_CRT, fill=self.crt_color)
+        self.canvas.itemconfig(TAG_CRT_OUTLINE, outline=self.crt_color)
+
+        # สีไฟกะพริบขึ้นกับโซนของตัวชี้ จึงคำนวณใหม่จากตำแหน่งล่าสุด
+        if self.last_relative_pos is None:
+            self.canvas.itemconfig(TAG_ACCENT, fill=self.accent_color)
+            self._blinker_fill = self.accent_color
+        else:
+            self._blinker_fill = None
+            self.update_position(self.last_relative_pos)
+
+        # ภาพพื้นหลังวาดใหม่เฉพาะเมื่อแสดงอยู่แล้วและสีที่อยู่ในภาพเปลี่ยน
+        if self.background_image is not None:
+            self._show_background()
 
     def reset(self, start_position=0.5):
         """รีเซ็ตเกจไปที่ตำแหน่งเริ่มต้น
@@ -700,8 +796,9 @@ class PixelGauge:
         Args:
             start_position: ตำแหน่งเริ่มต้น (ค่าเริ่มต้น: 0.5)
         """
-        # สร้างเกจใหม่
-        self.create_pixel_gauge()
+        # สร้างเกจใหม่เฉพาะเมื่อขนาด canvas เปลี่ยนไปจากที่วาดไว้
+        if self._layout is None or self._layout[0] != self.canvas_width:
+            self.create_pixel_gauge()
 
         # อัปเดตตำแหน่ง
         self.update_position(start_position)
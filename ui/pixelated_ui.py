@@ -1,10 +1,9 @@
 import tkinter as tk
 from tkinter import ttk
-import threading
 import random
 import math
-import time
 
+from ui.animation import AnimationClock
 from ui.gauge_widget import PixelGauge
 from ui.progress_bar import PixelProgressBar
 from ui.styles import apply_styles
@@ -55,6 +54,9 @@ class PixelatedUI:
         except:
             pass  # ไม่มีไอคอน
 
+        # นาฬิกาอนิเมชันกลางของทุก widget
+        self.animation_clock = AnimationClock(root, UI_CONSTANTS["ANIMATION_FPS"])
+
         # สร้างส่วนประกอบของ UI
         apply_styles(ttk.Style())
         self.create_ui()
@@ -175,7 +177,9 @@ class PixelatedUI:
             "warning": self.warning_color,
         }
 
-        self.progress_bar = PixelProgressBar(progress_frame, colors, height=15)
+        self.progress_bar = PixelProgressBar(
+            progress_frame, colors, height=15, clock=self.animation_clock
+        )
 
     def _create_controls_section(self, parent):
         """สร้างส่วนควบคุม"""
@@ -237,7 +241,7 @@ class PixelatedUI:
         }
 
         # สร้างเกจแบบพิกเซล
-        self.gauge = PixelGauge(gauge_frame, gauge_colors)
+        self.gauge = PixelGauge(gauge_frame, gauge_colors, clock=self.animation_clock)
 
         # สร้างส่วนแสดงข้อมูล
         indicator_frame = ttk.Frame(gauge_frame, style="Pixel.TFrame")
@@ -389,47 +393,40 @@ class PixelatedUI:
 
     def start_animation(self):
         """เริ่มการเคลื่อนไหวเส้นตัวชี้เกจ"""
-        self.is_animating = True
-        self.animation_thread = threading.Thread(
-            target=self._animation_loop, daemon=True
-        )
-        self.animation_thread.start()
+        self._demo_start = None
+        self._demo_last = None
+        self.animation_clock.add("demo", self._animate_demo)
 
     def stop_animation(self):
         """หยุดการเคลื่อนไหวทั้งหมด"""
-        self.is_animating = False
-
         # หยุดการเคลื่อนไหวของ progress bar
         if hasattr(self, "progress_bar"):
             self.progress_bar.stop_animation()
 
-    def _animation_loop(self):
-        """ลูปการเคลื่อนไหวเส้นตัวชี้เกจแบบต่อเนื่อง"""
+        self.animation_clock.stop()
+
+    def _animate_demo(self, now):
+        """เคลื่อนไหวเส้นตัวชี้เกจหนึ่งเฟรม (นาฬิกาหยุดเรียกขณะบอททำงาน)"""
         # ตัวแปรสำหรับการเคลื่อนไหวแบบนุ่มนวล
         amplitude = 0.45  # ระยะห่างสูงสุดจากจุดกึ่งกลาง
         period = 15.0  # ระยะเวลาสำหรับหนึ่งรอบ
 
-        # เวลาเริ่มต้น
-        start_time = time.time()
-
-        while self.is_animating:
-            # เคลื่อนไหวเฉพาะเมื่อไม่ได้ทำงานอยู่
-            if not hasattr(self.app, "running") or not self.app.running:
-                # ใช้คลื่นไซน์เพื่อการเคลื่อนไหวที่ดูเป็นธรรมชาติ
-                current_time = time.time() - start_time
-                position = 0.5 + amplitude * math.sin(
-                    2 * math.pi * current_time / period
-                )
+        if self._demo_start is None:
+            self._demo_start = self._demo_last = now
 
-                # อัปเดตตำแหน่ง
-                self.update_line_position(position)
+        # ใช้คลื่นไซน์เพื่อการเคลื่อนไหวที่ดูเป็นธรรมชาติ
+        current_time = now - self._demo_start
+        position = 0.5 + amplitude * math.sin(2 * math.pi * current_time / period)
 
-                # สุ่มสร้างเหตุการณ์ปลากระตุกเพื่อการสาธิต
-                if random.random() < 0.005:  # 0.2% โอกาสต่อเฟรม
-                    self.simulate_bite()
+        # อัปเดตตำแหน่ง
+        self.update_line_position(position)
 
-            # หน่วงเวลาเพื่อการเคลื่อนไหวที่นุ่มนวล
-            time.sleep(0.05)
+        # สุ่มสร้างเหตุการณ์ปลากระตุกเพื่อการสาธิต
+        # (0.5% ต่อ 50 ms เท่าเดิม ไม่ขึ้นกับอัตราเฟรม)
+        elapsed = now - self._demo_last
+        self._demo_last = now
+        if random.random() < 0.005 * elapsed / 0.05:
+            self.simulate_bite()
 
     def simulate_bite(self):
         """จำลองการกระตุกของปลา"""
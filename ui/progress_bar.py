@@ -2,13 +2,22 @@ import tkinter as tk
 import time
 import math
 
+from ui.animation import AnimationClock
+
+# ระยะเวลาระหว่างแต่ละขั้นของอนิเมชันแบบ indeterminate (วินาที)
+ANIMATION_STEP = 0.1
+
+# จำนวนระดับความเข้มของสีบล็อก (0.80 - 1.09) และจำนวนจังหวะของลายกะพริบ
+INTENSITY_LEVELS = 30
+SHIMMER_PHASES = 10
+
 
 class PixelProgressBar:
     """Progress bar แบบพิกเซลอาร์ต"""
 
     # แก้ไข progress_bar.py
 
-    def __init__(self, parent, colors, height=15):
+    def __init__(self, parent, colors, height=15, clock=None):
         """
         สร้าง progress bar แบบพิกเซลอาร์ต
 
@@ -16,6 +25,7 @@ class PixelProgressBar:
             parent: Widget ที่จะเป็น parent
             colors: Dictionary ที่เก็บค่าสีต่างๆ
             height: ความสูงของ progress bar
+            clock: AnimationClock ที่ใช้ขับอนิเมชัน (None = สร้างของตัวเอง)
         """
         self.parent = parent
 
@@ -34,11 +44,21 @@ class PixelProgressBar:
         )
         self.canvas.pack(fill="x")
 
+        self.clock = clock or AnimationClock(self.canvas.winfo_toplevel())
+        self._animation_name = f"progress-{id(self)}"
+        self._last_step = None
+
         # ตัวแปรของ progress bar
         self.blocks = []
         self.animation_active = False
         self.counter = 0
 
+        # สีปัจจุบันของแต่ละบล็อก และระดับความเข้มของบล็อกในแต่ละจังหวะ
+        self.block_fills = []
+        self._shimmer = []
+        # ชุดสีที่ปรับความเข้มไว้แล้วของแต่ละสี
+        self._palettes = {}
+
         # สร้าง progress bar
         self.create_progress_bar()
 
@@ -52,6 +72,7 @@ class PixelProgressBar:
         for block in self.blocks:
             self.canvas.delete(block)
         self.blocks = []
+        self.block_fills = []
 
         # สร้างกรอบ
         self.canvas.create_rectangle(
@@ -80,6 +101,44 @@ class PixelProgressBar:
                     x1, y1, x2, y2, fill=self.bg_color, outline=self.panel_bg, width=1
                 )
                 self.blocks.append(block)
+                self.block_fills.append(self.bg_color)
+
+        # คำนวณระดับความเข้มของทุกบล็อกในทุกจังหวะไว้ล่วงหน้า
+        self._shimmer = [
+            [hash((i, phase)) % INTENSITY_LEVELS for i in range(len(self.blocks))]
+            for phase in range(SHIMMER_PHASES)
+        ]
+
+    def _palette(self, color):
+        """รับชุดสีที่ปรับความเข้มแล้วของสีที่กำหนด (คำนวณครั้งแรกแล้วเก็บไว้)
+
+        Args:
+            color: สีในรูปแบบ #RRGGBB
+
+        Returns:
+            tuple: สีของแต่ละระดับความเข้ม
+        """
+        palette = self._palettes.get(color)
+        if palette is None:
+            if len(color) == 7:  # สีในรูปแบบ #RRGGBB
+                r = int(color[1:3], 16)
+                g = int(color[3:5], 16)
+                b = int(color[5:7], 16)
+
+                shades = []
+                for level in range(INTENSITY_LEVELS):
+                    intensity = 0.8 + level / 100
+                    shades.append(
+                        f"#{min(255, int(r * intensity)):02x}"
+                        f"{min(255, int(g * intensity)):02x}"
+                        f"{min(255, int(b * intensity)):02x}"
+                    )
+                palette = tuple(shades)
+            else:
+                # ใช้สีเดิมหากรูปแบบไม่ถูกต้อง
+                palette = (color,) * INTENSITY_LEVELS
+            self._palettes[color] = palette
+        return palette
 
     def update(self, value):
         """อัปเดตค่า progress
@@ -101,60 +160,47 @@ class PixelProgressBar:
         else:
             color = self.text_color
 
-        # อัปเดตสีของบล็อก
+        # เพิ่มเอฟเฟกต์แบบพิกเซลด้วยการสลับความเข้มของสีตามจังหวะเวลา
+        palette = self._palette(color)
+        levels = self._shimmer[int(time.time() * 5) % SHIMMER_PHASES]
+
+        # อัปเดตเฉพาะบล็อกที่สีเปลี่ยนจริง
+        fills = self.block_fills
         for i, block in enumerate(self.blocks):
             if i < active_blocks:
-                # เพิ่มเอฟเฟกต์แบบพิกเซลด้วยการสุ่มค่าความเข้มของสี
-                intensity = 0.8 + (hash((i, int(time.time() * 5) % 10)) % 30) / 100
-
-                # แปลงสีเป็นค่า RGB
-                if len(color) == 7:  # สีในรูปแบบ #RRGGBB
-                    r = int(color[1:3], 16)
-                    g = int(color[3:5], 16)
-                    b = int(color[5:7], 16)
-                else:
-                    # ใช้สีเดิมหากรูปแบบไม่ถูกต้อง
-                    self.canvas.itemconfig(block, fill=color)
-                    continue
-
-                # ปรับความเข้มของสี
-                r = min(255, int(r * intensity))
-                g = min(255, int(g * intensity))
-                b = min(255, int(b * intensity))
-
-                # สร้างสีใหม่
-                block_color = f"#{r:02x}{g:02x}{b:02x}"
-
-                # ตรวจสอบความถูกต้องของสี
-                if len(block_color) != 7:
-                    block_color = color
+                block_color = palette[levels[i]]
+            else:
+                block_color = self.bg_color
 
+            if fills[i] != block_color:
                 self.canvas.itemconfig(block, fill=block_color)
-            else:
-                self.canvas.itemconfig(block, fill=self.bg_color)
+                fills[i] = block_color
 
     def start_animation(self):
         """เริ่มการแสดงผลแบบเคลื่อนไหว (indeterminate)"""
         self.counter = 0
         if not self.animation_active:
             self.animation_active = True
-            self._animate()
+            self._last_step = None
+            self.clock.add(self._animation_name, self._animate)
 
-    def _animate(self):
-        """แสดงผลการเคลื่อนไหวแบบต่อเนื่อง"""
+    def _animate(self, now):
+        """แสดงผลการเคลื่อนไหวแบบต่อเนื่อง (ขยับหนึ่งขั้นทุก ANIMATION_STEP วินาที)"""
         if not self.animation_active:
-            return
+            return False
+        if self._last_step is not None and now - self._last_step < ANIMATION_STEP:
+            return True
+        self._last_step = now
 
         # รูปแบบการเคลื่อนไหวแบบเลื่อนไปมา
         self.counter = (self.counter + 5) % 100
         self.update(self.counter)
-
-        # ทำซ้ำ
-        self.canvas.after(100, self._animate)
+        return True
 
     def stop_animation(self):
         """หยุดการแสดงผลแบบเคลื่อนไหว"""
         self.animation_active = False
+        self.clock.remove(self._animation_name)
         self.update(0)
 
     def pulse(self, value=100, duration=1000):
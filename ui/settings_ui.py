@@ -1,7 +1,6 @@
+import copy
 import tkinter as tk
 from tkinter import ttk
-import json
-import os
 
 from ui.settings_components import ThresholdSettings, ColorSettings, TimingSettings
 from utils.constants import UI_CONSTANTS, PIXEL_COLORS, DEFAULT_CONFIG
@@ -10,20 +9,18 @@ from utils.constants import UI_CONSTANTS, PIXEL_COLORS, DEFAULT_CONFIG
 class SettingsUI:
     """หน้าตั้งค่าหลักสำหรับแอพพลิเคชัน"""
 
-    def __init__(self, parent, config_file="config.json"):
+    def __init__(self, parent, config_manager):
         """
         สร้างหน้าตั้งค่าที่สามารถปรับได้จริง
 
         Args:
             parent: หน้าต่างหลักที่จะใช้เป็น parent
-            config_file: ที่อยู่ของไฟล์ config.json
+            config_manager: อินสแตนซ์ของ ConfigManager ที่เก็บการตั้งค่าของแอพ
         """
         self.parent = parent
-        self.config_file = config_file
+        self.config_manager = config_manager
         self.settings_window = None
-
-        # โหลดการตั้งค่าปัจจุบัน
-        self.config = self.load_config()
+        self.draft_config = None
 
         # ตัวแปรเก็บข้อมูลสี
         self.colors = {
@@ -38,60 +35,10 @@ class SettingsUI:
             "crt": PIXEL_COLORS["TEXT_LIGHT"],
         }
 
-    def load_config(self):
-        """โหลดการตั้งค่าจากไฟล์ config.json"""
-        try:
-            with open(self.config_file, "r") as f:
-                config = json.load(f)
-                # ตรวจสอบและเพิ่มค่าที่ขาดหายไป
-                self._verify_and_update_config(config)
-                return config
-        except (FileNotFoundError, json.JSONDecodeError):
-            # ถ้าไฟล์ไม่มีหรือมีปัญหา ใช้ค่าเริ่มต้น
-            return DEFAULT_CONFIG.copy()
-
-    def _verify_and_update_config(self, config):
-        """ตรวจสอบว่ามีค่าที่จำเป็นทั้งหมดหรือไม่ ถ้าไม่มีให้เพิ่มจากค่า default"""
-        updated = False
-
-        # ตรวจสอบค่าหลัก
-        for key, value in DEFAULT_CONFIG.items():
-            if key not in config:
-                config[key] = value
-                updated = True
-            elif key == "ui_colors" and isinstance(value, dict):
-                # ตรวจสอบค่าสีย่อย
-                if not isinstance(config[key], dict):
-                    config[key] = value
-                    updated = True
-                else:
-                    for color_key, color_value in value.items():
-                        if color_key not in config[key]:
-                            config[key][color_key] = color_value
-                            updated = True
-
-        # บันทึกการเปลี่ยนแปลงถ้ามีการอัปเดต
-        if updated:
-            self.save_config(config)
-
-        return config
-
-    def save_config(self, config=None):
-        """บันทึกการตั้งค่าลงไฟล์ config.json
-
-        Args:
-            config: ข้อมูลการตั้งค่าที่จะบันทึก (หากไม่ระบุจะใช้ค่าปัจจุบัน)
-        """
-        if config is None:
-            config = self.config
-
-        try:
-            with open(self.config_file, "w") as f:
-                json.dump(config, f, indent=4)
-            return True
-        except Exception as e:
-            print(f"ไม่สามารถบันทึก config ได้: {e}")
-            return False
+    @property
+    def config(self):
+        """การตั้งค่าปัจจุบันจาก ConfigManager"""
+        return self.config_manager.config
 
     def open_settings(self):
         """เปิดหน้าต่างตั้งค่า"""
@@ -148,10 +95,12 @@ class SettingsUI:
         notebook.add(color_tab, text=" Colors ")
         notebook.add(timing_tab, text=" Timing ")
 
-        # สร้างส่วนประกอบแต่ละแท็บ
-        self.threshold_settings = ThresholdSettings(threshold_tab, self.config)
-        self.color_settings = ColorSettings(color_tab, self.config)
-        self.timing_settings = TimingSettings(timing_tab, self.config)
+        # สร้างส่วนประกอบแต่ละแท็บบนสำเนาการตั้งค่า แท็บสีแก้ไข dict ui_colors โดยตรง
+        # ถ้าใช้ config จริง update_values จะไม่เห็นความต่าง และการยกเลิกจะเปลี่ยนค่าจริงไปแล้ว
+        self.draft_config = copy.deepcopy(self.config)
+        self.threshold_settings = ThresholdSettings(threshold_tab, self.draft_config)
+        self.color_settings = ColorSettings(color_tab, self.draft_config)
+        self.timing_settings = TimingSettings(timing_tab, self.draft_config)
 
         # ปุ่มควบคุม
         control_frame = ttk.Frame(main_frame, style="Pixel.TFrame")
@@ -209,13 +158,13 @@ class SettingsUI:
         color_config = self.color_settings.get_settings()
         timing_config = self.timing_settings.get_settings()
 
-        # อัปเดต config
-        self.config.update(threshold_config)
-        self.config.update(color_config)
-        self.config.update(timing_config)
+        # อัปเดต config (ผู้สังเกตการณ์ได้รับเฉพาะคีย์ที่เปลี่ยน)
+        self.config_manager.update_values(
+            {**threshold_config, **color_config, **timing_config}
+        )
 
-        # บันทึกลงไฟล์
-        if self.save_config(self.config):
+        # บันทึกลงไฟล์ทันที
+        if self.config_manager.flush():
             # แสดงการบันทึกสำเร็จ
             self._show_success_message("Settings saved successfully!")
             # ปิดหน้าต่าง
@@ -227,7 +176,7 @@ class SettingsUI:
     def reset_defaults(self):
         """รีเซ็ตการตั้งค่าเป็นค่าเริ่มต้น"""
         # ใช้ค่า default จาก constants
-        default_config = DEFAULT_CONFIG.copy()
+        default_config = copy.deepcopy(DEFAULT_CONFIG)
 
         # อัปเดตส่วนต่างๆ ด้วยค่าเริ่มต้น
         self.threshold_settings.update_settings(default_config)
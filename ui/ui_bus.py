@@ -0,0 +1,110 @@
+import tkinter as tk
+
+
+def call_on_tk_thread(root, callback, *args):
+    """ส่งงานจากเธรดอื่นไปทำบนเธรดหลักของ Tk (ทางเดียวที่เธรดอื่นในแอพใช้แตะ Tk)
+
+    tkinter ที่สร้างกับ Tcl แบบ threaded (ค่าปกติของ Python บนทุกแพลตฟอร์ม)
+    ส่งต่อคำสั่ง Tk ที่เรียกจากเธรดอื่นไปยังเธรดของ interpreter เอง
+    root.after(0, ...) จึงเรียกจากเธรดใดก็ได้ และ callback จะทำงานในรอบถัดไปของ mainloop
+    โดยเธรดหลักไม่ต้องคอยตรวจธงเป็นระยะ ใช้กับ Hotkey F10 และตัวเฝ้าดูไฟล์การตั้งค่า
+
+    Args:
+        root: หน้าต่างหลักของ Tk
+        callback: ฟังก์ชันที่จะเรียกบนเธรดหลัก
+        *args: อาร์กิวเมนต์ของ callback
+
+    Returns:
+        bool: False ถ้าส่งไม่ได้ (หน้าต่างถูกปิดแล้ว หรือ mainloop ไม่ทำงาน)
+    """
+    try:
+        root.after(0, callback, *args)
+        return True
+    except (RuntimeError, tk.TclError):
+        return False
+
+
+class UIStateBus:
+    """ส่งสถานะล่าสุดจากเธรดตรวจจับไปยัง UI อย่างปลอดภัยต่อเธรด
+
+    เธรดตรวจจับเรียก update_line_position/update_status เหมือนเรียก UI โดยตรง
+    แต่เป็นเพียงการเขียนค่าล่าสุดทับค่าเดิม (ไม่รอ และไม่แตะ Tk)
+    เธรดหลักของ Tk ดึงค่าล่าสุดด้วย root.after ตามอัตราที่จำกัด
+    และส่งต่อไปยัง UI เฉพาะค่าที่เปลี่ยนไปจากครั้งก่อน
+    """
+
+    def __init__(self, root, ui, rate_hz=30):
+        """
+        Args:
+            root: หน้าต่างหลักของ Tk
+            ui: PixelatedUI ที่รับการอัปเดตจริง
+            rate_hz: อัตราสูงสุดของการอัปเดต UI (ครั้งต่อวินาที)
+        """
+        self.root = root
+        self.ui = ui
+        self.interval_ms = max(1, int(1000 / rate_hz)) if rate_hz > 0 else 33
+
+        # ค่าล่าสุดที่เผยแพร่ (การกำหนดค่าตัวแปรเดียวเป็น atomic จึงไม่ต้องใช้ lock)
+        self._position = None
+        self._status = None
+
+        # ค่าที่ส่งไปยัง UI แล้ว
+        self._applied_position = None
+        self._applied_status = None
+
+        self._after_id = None
+
+        self.published = 0
+        self.applied = 0
+
+    def update_line_position(self, relative_pos):
+        """เผยแพร่ตำแหน่งเส้นล่าสุด (เรียกจากเธรดใดก็ได้)"""
+        self._position = relative_pos
+        self.published += 1
+
+    def update_status(self, text, status_type="normal"):
+        """เผยแพร่ข้อความสถานะล่าสุด (เรียกจากเธรดใดก็ได้)"""
+        self._status = (text, status_type)
+        self.published += 1
+
+    def start(self):
+        """เริ่มดึงค่าไปยัง UI (เรียกจากเธรดหลักของ Tk)"""
+        if self._after_id is None:
+            self._after_id = self.root.after(self.interval_ms, self._drain)
+
+    def stop(self):
+        """หยุดดึงค่า และทิ้งค่าที่ยังไม่ได้ส่ง (เรียกจากเธรดหลักของ Tk)"""
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        self._position = None
+        self._status = None
+        self._applied_position = None
+        self._applied_status = None
+
+    def _drain(self):
+        """ส่งค่าล่าสุดที่เปลี่ยนไปยัง UI แล้วตั้งเวลารอบถัดไป"""
+        try:
+            position = self._position
+            if position is not None and position != self._applied_position:
+                self.ui.update_line_position(position)
+                self._applied_position = position
+                self.applied += 1
+
+            status = self._status
+            if status is not None and status != self._applied_status:
+                self.ui.update_status(*status)
+                self._applied_status = status
+                self.applied += 1
+        except Exception as e:
+            print(f"Error updating UI: {e}")
+
+        self._after_id = self.root.after(self.interval_ms, self._drain)
+
+    def get_stats(self):
+        """รับสถิติการอัปเดต
+
+        Returns:
+            dict: จำนวนค่าที่เผยแพร่ และจำนวนการอัปเดต UI จริง
+        """
+        return {"published": self.published, "applied": self.applied}
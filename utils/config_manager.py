@@ -1,39 +1,109 @@
+import copy
 import json
 import os
-import time
+import threading
+from utils.config_watcher import ConfigWatcher
 from utils.constants import DEFAULT_CONFIG
 
 
+class ConfigSnapshot:
+    """สำเนาการตั้งค่าแบบอ่านอย่างเดียว สำหรับใช้ในลูปตรวจจับ
+
+    เข้าถึงค่าเป็น attribute (เช่น snapshot.action_cooldown) โดยไม่ต้องค้น dict
+    และคำนวณค่าที่ได้จากหลายคีย์ไว้ล่วงหน้า ทุกครั้งที่การตั้งค่าเปลี่ยน
+    ConfigManager จะสร้าง snapshot ใหม่ที่มี version สูงขึ้น แทนการแก้ไขของเดิม
+    """
+
+    __slots__ = tuple(DEFAULT_CONFIG) + (
+        "version",
+        "safe_zone_min",
+        "safe_zone_max",
+        "danger_right_min",
+        "strip_mode",
+        "pid_mode",
+        "hold_mode",
+    )
+
+    def __init__(self, config=None, version=0):
+        """
+        Args:
+            config: dict การตั้งค่า (คีย์ที่ไม่มีจะใช้ค่าจาก DEFAULT_CONFIG)
+            version: หมายเลขรุ่นของการตั้งค่า
+        """
+        config = config or {}
+        set_value = object.__setattr__
+        for key, default_value in DEFAULT_CONFIG.items():
+            set_value(self, key, config.get(key, default_value))
+        set_value(self, "version", version)
+
+        # ขอบเขตโซนจากสัดส่วนคงที่ (ใช้เมื่อวัดขอบเขตจากภาพไม่ได้)
+        set_value(
+            self, "safe_zone_min", self.red_zone_threshold + self.buffer_zone_size
+        )
+        set_value(
+            self, "safe_zone_max", 1.0 - self.red_zone_threshold - self.buffer_zone_size
+        )
+        set_value(self, "danger_right_min", 1.0 - self.red_zone_threshold)
+
+        # โหมดการทำงานที่ตรวจทุกรอบ
+        set_value(self, "strip_mode", self.capture_mode == "strip")
+        set_value(self, "pid_mode", self.control_mode == "pid")
+        set_value(self, "hold_mode", self.actuation_mode == "hold")
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ConfigSnapshot is read-only")
+
 
 class ConfigManager:
-    """จัดการการตั้งค่าและการอัปเดตแอพพลิเคชัน"""
+    """จัดการการตั้งค่าและการอัปเดตแอพพลิเคชัน
+
+    เป็นที่เก็บการตั้งค่าเพียงแห่งเดียวของแอพ การเขียนไฟล์ทำแบบ atomic
+    (เขียนไฟล์ชั่วคราว, fsync, แล้วเปลี่ยนชื่อทับ) และการเปลี่ยนค่าหลายครั้งติดกัน
+    จะถูกรวมเป็นการเขียนไฟล์ครั้งเดียว ผู้สังเกตการณ์ได้รับเฉพาะชุดคีย์ที่เปลี่ยน
+    """
 
-    def __init__(self, config_file="config.json"):
+    def __init__(self, config_file="config.json", save_delay=0.5):
         """
         สร้างตัวจัดการการตั้งค่า
 
         Args:
             config_file: ที่อยู่ของไฟล์ config.json
+            save_delay: เวลาที่รอรวมการเปลี่ยนค่าก่อนเขียนไฟล์ (วินาที)
         """
         self.config_file = config_file
-        self.config = self.load_config()
+        self.save_delay = save_delay
         self.observers = []  # รายการคอลแบ็กสำหรับการแจ้งเตือนเมื่อการตั้งค่าเปลี่ยน
+        self.snapshot = ConfigSnapshot()
+
+        # สถานะการเขียนไฟล์
+        self._lock = threading.RLock()
+        self._save_timer = None
+        self._dirty = False
+        self._written_text = None
+        self.last_modified = 0
+
+        self.config = self.load_config()
+        self._publish_snapshot()
 
         # ตรวจสอบเวลาแก้ไขไฟล์ล่าสุด
         self.last_modified = self._get_file_modified_time()
 
+        # ตัวเฝ้าดูไฟล์ config (เริ่มด้วย start_watching)
+        self.watcher = None
+
     def load_config(self):
         """โหลดการตั้งค่าจากไฟล์ config.json"""
         try:
             with open(self.config_file, "r") as f:
                 config = json.load(f)
-                # ตรวจสอบและเพิ่มค่าที่ขาดหายไป
-                self._verify_and_update_config(config)
-                return config
+            # ตรวจสอบและเพิ่มค่าที่ขาดหายไป
+            self._verify_and_update_config(config)
+            return config
         except (FileNotFoundError, json.JSONDecodeError):
             # ถ้าไฟล์ไม่มีหรือมีปัญหา ใช้ค่าเริ่มต้น
-            self.save_config(DEFAULT_CONFIG)
-            return DEFAULT_CONFIG.copy()
+            config = copy.deepcopy(DEFAULT_CONFIG)
+            self._write_config(config)
+            return config
 
     def _verify_and_update_config(self, config):
         """ตรวจสอบว่ามีค่าที่จำเป็นทั้งหมดหรือไม่ ถ้าไม่มีให้เพิ่มจากค่า default"""
@@ -42,12 +112,12 @@ class ConfigManager:
         # ตรวจสอบค่าหลัก
         for key, value in DEFAULT_CONFIG.items():
             if key not in config:
-                config[key] = value
+                config[key] = copy.deepcopy(value)
                 updated = True
             elif key == "ui_colors" and isinstance(value, dict):
                 # ตรวจสอบค่าสีย่อย
                 if not isinstance(config[key], dict):
-                    config[key] = value
+                    config[key] = copy.deepcopy(value)
                     updated = True
                 else:
                     for color_key, color_value in value.items():
@@ -57,12 +127,14 @@ class ConfigManager:
 
         # บันทึกการเปลี่ยนแปลงถ้ามีการอัปเดต
         if updated:
-            self.save_config(config)
+            self._write_config(config)
+        else:
+            self._written_text = json.dumps(config, indent=4)
 
         return config
 
     def save_config(self, config=None):
-        """บันทึกการตั้งค่าลงไฟล์ config.json
+        """บันทึกการตั้งค่าลงไฟล์ config.json ทันที
 
         Args:
             config: ข้อมูลการตั้งค่าที่จะบันทึก (หากไม่ระบุจะใช้ค่าปัจจุบัน)
@@ -70,26 +142,76 @@ class ConfigManager:
         Returns:
             bool: True ถ้าบันทึกสำเร็จ, False ถ้าล้มเหลว
         """
-        if config is None:
-            config = self.config
-        else:
-            self.config = config
+        if config is not None:
+            with self._lock:
+                changed_keys = self._diff(self.config, config)
+                self.config = config
+            if changed_keys:
+                self._notify_observers(changed_keys)
 
-        try:
-            with open(self.config_file, "w") as f:
-                json.dump(config, f, indent=4)
+        with self._lock:
+            self._cancel_pending_save()
+            self._dirty = False
+            return self._write_config(self.config)
 
-            # อัปเดตเวลาแก้ไขล่าสุด
-            self.last_modified = self._get_file_modified_time()
+    def flush(self):
+        """เขียนการเปลี่ยนแปลงที่รอรวมอยู่ลงไฟล์ทันที (เช่นก่อนปิดโปรแกรม)
 
-            # แจ้งเตือนผู้สังเกตการณ์ทุกรายการ
-            self._notify_observers()
+        Returns:
+            bool: True ถ้าไม่มีสิ่งที่ต้องเขียนหรือบันทึกสำเร็จ
+        """
+        with self._lock:
+            self._cancel_pending_save()
+            if not self._dirty:
+                return True
+            self._dirty = False
+            return self._write_config(self.config)
+
+    def _schedule_save(self):
+        """ตั้งเวลาเขียนไฟล์ใหม่ การเปลี่ยนค่าระหว่างรอจะเลื่อนเวลาออกไป"""
+        with self._lock:
+            self._dirty = True
+            self._cancel_pending_save()
+            self._save_timer = threading.Timer(self.save_delay, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def _cancel_pending_save(self):
+        if self._save_timer is not None:
+            self._save_timer.cancel()
+            self._save_timer = None
+
+    def _write_config(self, config):
+        """เขียนไฟล์แบบ atomic ข้ามการเขียนถ้าเนื้อหาไม่ต่างจากที่เขียนไว้ล่าสุด
 
+        Returns:
+            bool: True ถ้าบันทึกสำเร็จ, False ถ้าล้มเหลว
+        """
+        text = json.dumps(config, indent=4)
+        if text == self._written_text and os.path.exists(self.config_file):
+            return True
+
+        temp_file = f"{self.config_file}.tmp"
+        try:
+            with open(temp_file, "w") as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.config_file)
+
+            self._written_text = text
+            # อัปเดตเวลาแก้ไขล่าสุด (ตัวเฝ้าดูไฟล์จะไม่โหลดไฟล์ที่เราเขียนเองซ้ำ)
+            self.last_modified = self._get_file_modified_time()
             return True
         except Exception as e:
             print(f"ไม่สามารถบันทึก config ได้: {e}")
             return False
 
+    @staticmethod
+    def _diff(old, new):
+        """หาชุดคีย์ที่ค่าต่างกันระหว่างการตั้งค่าสองชุด"""
+        return {key for key in old.keys() | new.keys() if old.get(key) != new.get(key)}
+
     def _get_file_modified_time(self):
         """รับเวลาแก้ไขล่าสุดของไฟล์ config"""
         try:
@@ -106,13 +228,34 @@ class ConfigManager:
         current_modified = self._get_file_modified_time()
         if current_modified > self.last_modified:
             # โหลดการตั้งค่าใหม่
-            self.config = self.load_config()
+            config = self.load_config()
             self.last_modified = current_modified
-            # แจ้งเตือนผู้สังเกตการณ์
-            self._notify_observers()
-            return True
+            with self._lock:
+                changed_keys = self._diff(self.config, config)
+                self.config = config
+            # แจ้งเตือนผู้สังเกตการณ์เฉพาะเมื่อค่าเปลี่ยนจริง
+            if changed_keys:
+                self._notify_observers(changed_keys)
+                return True
         return False
 
+    def start_watching(self, on_change):
+        """เริ่มเฝ้าดูไฟล์ config แทนการตรวจตามระยะเวลา
+
+        Args:
+            on_change: ฟังก์ชันที่ไม่มีอาร์กิวเมนต์ ถูกเรียกจากเธรดของตัวเฝ้าดูเมื่อไฟล์เปลี่ยน
+                (ควรส่งต่อไปเรียก check_for_changes ในเธรดของ UI)
+        """
+        if self.watcher is None:
+            self.watcher = ConfigWatcher(self.config_file, on_change)
+            self.watcher.start()
+
+    def stop_watching(self):
+        """หยุดเฝ้าดูไฟล์ config"""
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
+
     def get_value(self, key, default_value=None):
         """รับค่าจากการตั้งค่า
 
@@ -126,17 +269,43 @@ class ConfigManager:
         return self.config.get(key, default_value)
 
     def set_value(self, key, value):
-        """ตั้งค่าและบันทึกลงไฟล์ config
+        """ตั้งค่าและตั้งเวลาบันทึกลงไฟล์ config
 
         Args:
             key: คีย์ที่ต้องการตั้งค่า
             value: ค่าที่ต้องการกำหนด
 
         Returns:
-            bool: True ถ้าบันทึกสำเร็จ, False ถ้าล้มเหลว
+            bool: True ถ้าค่าเปลี่ยน, False ถ้าเท่ากับค่าเดิม
         """
-        self.config[key] = value
-        return self.save_config()
+        return self.update_values({key: value})
+
+    def update_values(self, values):
+        """ตั้งค่าหลายคีย์พร้อมกัน แจ้งผู้สังเกตการณ์ครั้งเดียว และตั้งเวลาบันทึกไฟล์
+
+        การเขียนไฟล์จะรอ save_delay เพื่อรวมการเปลี่ยนค่าที่ตามมาติดกัน
+        (เรียก flush() เพื่อเขียนทันที)
+
+        Args:
+            values: dict ของคีย์และค่าใหม่
+
+        Returns:
+            bool: True ถ้ามีค่าที่เปลี่ยน, False ถ้าทุกค่าเท่ากับค่าเดิม
+        """
+        with self._lock:
+            changed_keys = {
+                key for key, value in values.items() if self.config.get(key) != value
+            }
+            if not changed_keys:
+                return False
+            # เก็บสำเนา เพื่อไม่ให้ผู้เรียกแก้ dict/list ที่ส่งมาแล้วกระทบ config โดยไม่ผ่านการแจ้งเตือน
+            self.config.update(
+                {key: copy.deepcopy(values[key]) for key in changed_keys}
+            )
+
+        self._notify_observers(changed_keys)
+        self._schedule_save()
+        return True
 
     def get_colors(self):
         """รับค่าสีทั้งหมดจากการตั้งค่า
@@ -150,7 +319,7 @@ class ConfigManager:
         """ลงทะเบียนฟังก์ชันที่จะเรียกเมื่อมีการเปลี่ยนแปลงการตั้งค่า
 
         Args:
-            callback: ฟังก์ชันที่จะเรียกเมื่อมีการเปลี่ยนแปลง
+            callback: ฟังก์ชัน callback(config, changed_keys) ที่จะเรียกเมื่อมีการเปลี่ยนแปลง
         """
         if callback not in self.observers:
             self.observers.append(callback)
@@ -164,10 +333,19 @@ class ConfigManager:
         if callback in self.observers:
             self.observers.remove(callback)
 
-    def _notify_observers(self):
-        """แจ้งเตือนผู้สังเกตการณ์ทุกรายการเกี่ยวกับการเปลี่ยนแปลง"""
+    def _publish_snapshot(self):
+        """สร้าง snapshot ใหม่จากการตั้งค่าปัจจุบัน (ผู้อ่านเห็นทั้งชุดเก่าหรือชุดใหม่เท่านั้น)"""
+        self.snapshot = ConfigSnapshot(self.config, self.snapshot.version + 1)
+
+    def _notify_observers(self, changed_keys):
+        """แจ้งเตือนผู้สังเกตการณ์ทุกรายการเกี่ยวกับการเปลี่ยนแปลง
+
+        Args:
+            changed_keys: ชุดคีย์ที่ค่าเปลี่ยน
+        """
+        self._publish_snapshot()
         for callback in self.observers:
             try:
-                callback(self.config)
+                callback(self.config, changed_keys)
             except Exception as e:
                 print(f"เกิดข้อผิดพลาดในการแจ้งเตือนผู้สังเกตการณ์: {e}")
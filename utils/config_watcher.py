@@ -0,0 +1,154 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+
+# ค่าคงที่ของ inotify (จาก <sys/inotify.h>)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_NONBLOCK = 0x00000800
+IN_CLOEXEC = 0x00080000
+
+# ส่วนหัวของ struct inotify_event: wd, mask, cookie, len
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class ConfigWatcher:
+    """เฝ้าดูไฟล์ config และเรียก callback เมื่อไฟล์ถูกแก้ไข
+
+    บน Linux ใช้ inotify (ไม่มีงานเลยขณะที่ไฟล์ไม่เปลี่ยน) ระบบอื่นถอยไปตรวจ mtime
+    เป็นระยะในเธรดแยก การเขียนหลายครั้งติดกันจะถูกรวมเป็นการแจ้งเตือนเดียว
+    callback ถูกเรียกจากเธรดของตัวเฝ้าดู ผู้เรียกต้องส่งต่อไปยังเธรดของ UI เอง
+    """
+
+    def __init__(self, path, callback, debounce=0.05, poll_interval=0.5):
+        """
+        Args:
+            path: ที่อยู่ของไฟล์ที่ต้องการเฝ้าดู
+            callback: ฟังก์ชันที่ไม่มีอาร์กิวเมนต์ เรียกเมื่อไฟล์เปลี่ยน
+            debounce: เวลาที่ต้องเงียบหลังการเขียนครั้งสุดท้ายก่อนแจ้งเตือน (วินาที)
+            poll_interval: ระยะเวลาตรวจ mtime เมื่อใช้ inotify ไม่ได้ (วินาที)
+        """
+        self.path = os.path.abspath(path)
+        self.callback = callback
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+
+        self.mode = None
+        self.notifications = 0
+        self._stop = threading.Event()
+        self._thread = None
+        self._fd = None
+
+    def start(self):
+        """เริ่มเฝ้าดู (inotify ถ้าใช้ได้ ไม่เช่นนั้นตรวจ mtime เป็นระยะ)"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self.mode = "poll"
+        target = self._poll_loop
+        # inotify มีเฉพาะบน Linux ความผิดพลาดใดๆ ในการเปิดให้ถอยไปตรวจ mtime แทน
+        if sys.platform.startswith("linux"):
+            try:
+                self._fd = self._open_inotify()
+                self.mode = "inotify"
+                target = self._inotify_loop
+            except Exception as e:
+                print(f"inotify unavailable ({e}), polling config file instead")
+        self._thread = threading.Thread(target=target, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """หยุดเฝ้าดูและรอให้เธรดจบ"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _open_inotify(self):
+        """เปิด inotify และเฝ้าดูโฟลเดอร์ของไฟล์
+
+        เฝ้าดูทั้งโฟลเดอร์ เพราะโปรแกรมแก้ไขไฟล์หลายตัว (และการบันทึกแบบ atomic)
+        เขียนไฟล์ใหม่แล้วเปลี่ยนชื่อทับ ทำให้ watch ที่ผูกกับไฟล์เดิมหายไป
+        """
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        directory = os.path.dirname(self.path).encode()
+        mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_MODIFY
+        if libc.inotify_add_watch(fd, directory, mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(errno, "inotify_add_watch failed")
+        return fd
+
+    def _read_events(self):
+        """อ่านเหตุการณ์ที่ค้างอยู่ทั้งหมด
+
+        Returns:
+            bool: True ถ้ามีเหตุการณ์ของไฟล์ที่เฝ้าดู
+        """
+        name = os.path.basename(self.path).encode()
+        matched = False
+        while True:
+            try:
+                data = os.read(self._fd, 4096)
+            except BlockingIOError:
+                return matched
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(data):
+                _, _, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                event_name = data[offset : offset + length].rstrip(b"\0")
+                offset += length
+                if event_name == name:
+                    matched = True
+
+    def _inotify_loop(self):
+        pending = False
+        while not self._stop.is_set():
+            # รอเหตุการณ์ (ตื่นทุกครึ่งวินาทีเพื่อตรวจการสั่งหยุด)
+            timeout = self.debounce if pending else 0.5
+            readable, _, _ = select.select([self._fd], [], [], timeout)
+            if readable:
+                if self._read_events():
+                    pending = True
+            elif pending:
+                # ไม่มีการเขียนเพิ่มในช่วง debounce: แจ้งเตือนครั้งเดียว
+                pending = False
+                self._notify()
+
+    def _poll_loop(self):
+        last_modified = self._get_modified_time()
+        pending = False
+        while not self._stop.wait(self.debounce if pending else self.poll_interval):
+            modified = self._get_modified_time()
+            if modified != last_modified:
+                last_modified = modified
+                pending = True
+            elif pending:
+                pending = False
+                self._notify()
+
+    def _get_modified_time(self):
+        try:
+            return os.path.getmtime(self.path)
+        except OSError:
+            return 0
+
+    def _notify(self):
+        self.notifications += 1
+        try:
+            self.callback()
+        except Exception as e:
+            print(f"Error in config watcher callback: {e}")
@@ -4,6 +4,7 @@ UI_CONSTANTS = {
     "WINDOW_HEIGHT": 770,
     "PADDING": 15,
     "FONT_FAMILY": "Courier",
+    "ANIMATION_FPS": 30,
 }
 
 # ค่า default สำหรับการตั้งค่าทั้งหมดของแอพ
@@ -15,6 +16,40 @@ DEFAULT_CONFIG = {
     "action_cooldown": 0.1,
     "first_click_delay": 1.0,
     "periodic_click_interval": 4.0,
+    "capture_backend": "auto",
+    "frame_alloc_probe": False,
+    "capture_mode": "full",
+    "strip_rows": 9,
+    "capture_thread": True,
+    "zone_scan_rows": 1,
+    "min_zone_width": 3,
+    "measured_zones": True,
+    "zone_merge_gap": 8,
+    "layout_cache": True,
+    "layout_verify_samples": 3,
+    "layout_verify_tolerance": 1,
+    "line_tracking": True,
+    "line_search_margin": 8,
+    "line_velocity_gain": 2.0,
+    "max_line_width": 10,
+    "min_line_confidence": 0.5,
+    "line_prediction": True,
+    "prediction_lead": 0.03,
+    "predictor_alpha": 0.5,
+    "predictor_beta": 0.1,
+    "input_backend": "auto",
+    "input_thread": True,
+    "control_mode": "zone",
+    "actuation_mode": "click",
+    "loop_rate_hz": 240,
+    "ui_rate_hz": 30,
+    "pid_kp": 4.0,
+    "pid_ki": 1.0,
+    "pid_kd": 0.5,
+    "pid_bias": 0.5,
+    "stage_timing": True,
+    "stage_timing_export": "",
+    "session_report": False,
     "ui_colors": {
         "primary": "#3498db",
         "success": "#2ecc71",
@@ -0,0 +1,121 @@
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupProfile:
+    """บันทึกเวลาที่ใช้ในแต่ละช่วงของการเริ่มโปรแกรม (แสดงผลเมื่อเปิดด้วย --startup-profile)
+
+    measure() จับเวลาของช่วงงาน (เช่นการ import แต่ละโมดูล) จากเธรดใดก็ได้
+    mark() บันทึกเวลาที่ผ่านไปนับจากเริ่มโปรแกรม ณ จุดสำคัญ (เช่นหน้าต่างแสดงครั้งแรก)
+    """
+
+    def __init__(self, start_time=None):
+        """
+        Args:
+            start_time: เวลาเริ่มโปรแกรมจาก time.perf_counter() (None = เวลาปัจจุบัน)
+        """
+        self.start_time = time.perf_counter() if start_time is None else start_time
+        self.phases = []
+        self.marks = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def measure(self, name):
+        """จับเวลาของช่วงงานในบล็อก with
+
+        Args:
+            name: ชื่อของช่วงงาน
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.phases.append((name, threading.current_thread().name, elapsed))
+
+    def mark(self, name):
+        """บันทึกเวลาที่ผ่านไปนับจากเริ่มโปรแกรม
+
+        Args:
+            name: ชื่อของจุดที่บันทึก
+        """
+        elapsed = time.perf_counter() - self.start_time
+        with self._lock:
+            self.marks.append((name, elapsed))
+
+    def report(self):
+        """พิมพ์สรุปเวลาที่ใช้ในแต่ละช่วงและแต่ละจุด"""
+        with self._lock:
+            phases = list(self.phases)
+            marks = sorted(self.marks, key=lambda mark: mark[1])
+
+        print("Startup profile:")
+        for name, thread_name, elapsed in phases:
+            print(f"  {name:<24} {elapsed * 1000:8.1f} ms  [{thread_name}]")
+        for name, elapsed in marks:
+            print(f"  @ {name:<22} {elapsed * 1000:8.1f} ms")
+
+
+class BackgroundLoader:
+    """เรียกฟังก์ชันโหลดโมดูลหนักบนเธรดเบื้องหลัง แล้วแจ้งผลกลับบนเธรดหลักของ Tk"""
+
+    def __init__(self, target, name="module-loader"):
+        """
+        Args:
+            target: ฟังก์ชันที่โหลดโมดูลและคืนค่าผลลัพธ์
+            name: ชื่อของเธรด
+        """
+        self.target = target
+        self.name = name
+        self.result = None
+        self.error = None
+        self._done = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """เริ่มโหลดบนเธรดเบื้องหลัง (เรียกซ้ำได้ จะเริ่มเพียงครั้งเดียว)"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=self.name)
+            self._thread.daemon = True
+            self._thread.start()
+
+    def _run(self):
+        try:
+            self.result = self.target()
+        except Exception as e:
+            self.error = e
+        finally:
+            self._done.set()
+
+    @property
+    def started(self):
+        """True เมื่อเริ่มโหลดแล้ว"""
+        return self._thread is not None
+
+    @property
+    def done(self):
+        """True เมื่อโหลดเสร็จแล้ว (ทั้งสำเร็จและล้มเหลว)"""
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """รอจนโหลดเสร็จ
+
+        Returns:
+            bool: True ถ้าโหลดเสร็จภายในเวลาที่กำหนด
+        """
+        return self._done.wait(timeout)
+
+    def when_done(self, root, callback, interval_ms=50):
+        """เรียก callback(loader) บนเธรดหลักของ Tk เมื่อโหลดเสร็จ (ตรวจด้วย root.after)
+
+        Args:
+            root: หน้าต่างหลักของ Tk
+            callback: ฟังก์ชันที่รับ BackgroundLoader
+            interval_ms: ระยะห่างของการตรวจ (มิลลิวินาที)
+        """
+        if self.done:
+            callback(self)
+        else:
+            root.after(interval_ms, self.when_done, root, callback, interval_ms)
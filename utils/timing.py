@@ -0,0 +1,253 @@
+import time
+
+
+class FixedRateScheduler:
+    """กำหนดจังหวะลูปให้คงที่ตามอัตราเป้าหมาย โดยใช้นาฬิกา time.perf_counter
+
+    รอด้วย time.sleep จนเกือบถึงเวลา แล้ววนรอ (spin) ช่วงสุดท้ายเพื่อความแม่นยำ
+    การวนรอเรียก time.sleep(0) ทุกรอบเพื่อปล่อย GIL ให้เธรดจับภาพและ UI ทำงานได้
+    และเก็บคาบจริงของแต่ละรอบไว้คำนวณ jitter
+    """
+
+    def __init__(self, rate_hz, spin=0.001, history=1024):
+        """
+        Args:
+            rate_hz: อัตราเป้าหมาย (รอบต่อวินาที) ค่า 0 หรือน้อยกว่าคือไม่จำกัด
+            spin: ช่วงเวลาก่อนถึงกำหนดที่เปลี่ยนจาก sleep เป็นการวนรอ (วินาที)
+            history: จำนวนคาบล่าสุดที่เก็บไว้คำนวณสถิติ
+        """
+        self.rate_hz = rate_hz
+        self.period = 1.0 / rate_hz if rate_hz > 0 else 0.0
+        self.spin = spin
+
+        self._periods = [0.0] * history
+        self._index = 0
+        self._count = 0
+        self._deadline = None
+        self._last_tick = None
+
+        self.overruns = 0
+
+    def wait(self):
+        """รอจนถึงกำหนดของรอบถัดไป แล้วบันทึกคาบของรอบที่ผ่านมา"""
+        now = time.perf_counter()
+        if self._deadline is None:
+            self._deadline = now
+
+        if self.period > 0:
+            self._deadline += self.period
+            remaining = self._deadline - now
+            if remaining < 0:
+                # ช้ากว่ากำหนด: ไม่รอในรอบนี้ ถ้าช้าเกินหนึ่งคาบให้เริ่มนับใหม่จากตอนนี้
+                # แทนการเร่งหลายรอบติดกันเพื่อตามให้ทัน
+                self.overruns += 1
+                if remaining < -self.period:
+                    self._deadline = now
+            else:
+                if remaining > self.spin:
+                    time.sleep(remaining - self.spin)
+                while time.perf_counter() < self._deadline:
+                    time.sleep(0)
+
+        self._record(time.perf_counter())
+
+    def _record(self, tick):
+        """บันทึกคาบระหว่างการเรียก wait() ครั้งก่อนกับครั้งนี้"""
+        if self._last_tick is not None:
+            self._periods[self._index] = tick - self._last_tick
+            self._index = (self._index + 1) % len(self._periods)
+            self._count += 1
+        self._last_tick = tick
+
+    def get_stats(self):
+        """รับสถิติคาบของลูป
+
+        Returns:
+            dict: อัตราเป้าหมาย, จำนวนรอบ, อัตราจริงเฉลี่ย (Hz),
+                jitter (|คาบจริง - คาบเป้าหมาย|) ที่ p50/p99/สูงสุด (ms) และจำนวนรอบที่ช้ากว่ากำหนด
+                (ไม่จำกัดอัตราจะไม่มีคาบเป้าหมาย jitter จึงเป็น 0 เสมอ)
+        """
+        samples = self._periods[: min(self._count, len(self._periods))]
+        if not samples:
+            return {
+                "target_hz": self.rate_hz,
+                "ticks": 0,
+                "actual_hz": 0.0,
+                "p50_jitter_ms": 0.0,
+                "p99_jitter_ms": 0.0,
+                "max_jitter_ms": 0.0,
+                "overruns": self.overruns,
+            }
+
+        mean = sum(samples) / len(samples)
+        if self.period > 0:
+            jitter = sorted(abs(period - self.period) * 1000 for period in samples)
+        else:
+            jitter = [0.0]
+        return {
+            "target_hz": self.rate_hz,
+            "ticks": self._count,
+            "actual_hz": 1.0 / mean if mean > 0 else 0.0,
+            "p50_jitter_ms": jitter[len(jitter) // 2],
+            "p99_jitter_ms": jitter[min(len(jitter) - 1, int(len(jitter) * 0.99))],
+            "max_jitter_ms": jitter[-1],
+            "overruns": self.overruns,
+        }
+
+
+# จำนวนช่องของฮิสโทแกรมต่อช่วงเวลาที่เพิ่มเป็นสองเท่า และจำนวนช่องทั้งหมด
+# (ช่องละ ~41% ของความกว้าง ครอบคลุม 1 ns ถึงประมาณ 18 นาที)
+HISTOGRAM_SUBBINS = 2
+HISTOGRAM_BINS = 41 * HISTOGRAM_SUBBINS
+
+
+def _bin_of(ns):
+    """ช่องของฮิสโทแกรมแบบลอการิทึมสำหรับช่วงเวลา ns (นาโนวินาที)"""
+    octave = ns.bit_length()
+    if octave < 2:
+        return octave * HISTOGRAM_SUBBINS
+    index = octave * HISTOGRAM_SUBBINS + ((ns >> (octave - 2)) & 1)
+    return min(index, HISTOGRAM_BINS - 1)
+
+
+def _bin_upper_ns(index):
+    """ขอบบนของช่องฮิสโทแกรม (นาโนวินาที)"""
+    octave, sub = divmod(index, HISTOGRAM_SUBBINS)
+    if octave < 2:
+        return 1 << octave
+    return (1 << (octave - 1)) + (sub + 1) * (1 << (octave - 2))
+
+
+class StageTimer:
+    """จับเวลาของแต่ละขั้นตอนในหนึ่งรอบของลูป แล้วสะสมลงฮิสโทแกรมขนาดคงที่
+
+    ใช้นาฬิกา time.perf_counter_ns (monotonic) ต่อเนื่องกันเป็นช่วง:
+    start() เริ่มรอบ, lap(stage) ปิดช่วงเวลาตั้งแต่ lap ครั้งก่อนให้เป็นของ stage นั้น
+    และ end() บันทึกเวลาทั้งรอบในชื่อ "frame" ต้นทุนต่อ lap คือการอ่านนาฬิกาหนึ่งครั้ง
+    กับการบวกตัวเลขในลิสต์ จึงเปิดไว้ตลอดได้ (ปิดทั้งหมดได้โดยไม่สร้าง timer เลย)
+    """
+
+    def __init__(self):
+        self._histograms = {}
+        self._totals = {}
+        self._frame_start = None
+        self._last = None
+
+    def start(self):
+        """เริ่มจับเวลารอบใหม่"""
+        self._frame_start = self._last = time.perf_counter_ns()
+
+    def lap(self, stage):
+        """บันทึกเวลาตั้งแต่ start()/lap() ครั้งก่อนเป็นของขั้นตอนที่กำหนด
+
+        Args:
+            stage: ชื่อขั้นตอน
+        """
+        now = time.perf_counter_ns()
+        if self._last is not None:
+            self.add(stage, now - self._last)
+        self._last = now
+
+    def end(self):
+        """จบรอบและบันทึกเวลาทั้งรอบในชื่อ "frame" """
+        if self._frame_start is not None:
+            self.add("frame", time.perf_counter_ns() - self._frame_start)
+        self._frame_start = self._last = None
+
+    def add(self, stage, ns):
+        """เพิ่มช่วงเวลาหนึ่งค่าลงฮิสโทแกรมของขั้นตอน
+
+        Args:
+            stage: ชื่อขั้นตอน
+            ns: ช่วงเวลา (นาโนวินาที)
+        """
+        histogram = self._histograms.get(stage)
+        if histogram is None:
+            histogram = self._histograms[stage] = [0] * HISTOGRAM_BINS
+            self._totals[stage] = [0, 0, 0]
+        histogram[_bin_of(ns)] += 1
+
+        totals = self._totals[stage]
+        totals[0] += 1
+        totals[1] += ns
+        if ns > totals[2]:
+            totals[2] = ns
+
+    def reset(self):
+        """ล้างข้อมูลที่สะสมไว้ทั้งหมด"""
+        self._histograms.clear()
+        self._totals.clear()
+        self._frame_start = self._last = None
+
+    def _percentile_ms(self, histogram, count, fraction):
+        """ประมาณค่า percentile จากฮิสโทแกรม (ใช้ขอบบนของช่อง)"""
+        target = fraction * count
+        seen = 0
+        for index, bin_count in enumerate(histogram):
+            seen += bin_count
+            if bin_count and seen >= target:
+                return _bin_upper_ns(index) / 1e6
+        return 0.0
+
+    def get_stats(self):
+        """รับสถิติของแต่ละขั้นตอน
+
+        Returns:
+            dict: ชื่อขั้นตอน -> จำนวนครั้ง, เวลาเฉลี่ย/p50/p99/สูงสุด (ms) และสัดส่วนของเวลาทั้งรอบ
+        """
+        frame_total = self._totals.get("frame", (0, 0, 0))[1]
+        stats = {}
+        for stage, histogram in list(self._histograms.items()):
+            count, total, maximum = self._totals[stage]
+            max_ms = maximum / 1e6
+            stats[stage] = {
+                "count": count,
+                "avg_ms": total / count / 1e6 if count else 0.0,
+                # ขอบบนของช่องอาจเกินค่าสูงสุดจริง จึงจำกัดไม่ให้เกิน max
+                "p50_ms": min(self._percentile_ms(histogram, count, 0.5), max_ms),
+                "p99_ms": min(self._percentile_ms(histogram, count, 0.99), max_ms),
+                "max_ms": max_ms,
+                "share": total / frame_total if frame_total else 0.0,
+            }
+        return stats
+
+    def to_dict(self):
+        """ข้อมูลทั้งหมดสำหรับส่งออก (สถิติและฮิสโทแกรมเฉพาะช่องที่มีค่า)"""
+        stats = self.get_stats()
+        for stage, histogram in list(self._histograms.items()):
+            stats[stage]["histogram"] = [
+                {"upper_ms": _bin_upper_ns(index) / 1e6, "count": count}
+                for index, count in enumerate(histogram)
+                if count
+            ]
+        return {"stages": stats}
+
+    def export(self, path):
+        """ส่งออกข้อมูลเป็นไฟล์ JSON หรือ CSV ตามนามสกุลของไฟล์
+
+        CSV มีหนึ่งแถวต่อช่องฮิสโทแกรมที่มีค่า พร้อมสถิติสรุปของขั้นตอนนั้น
+
+        Args:
+            path: ที่อยู่ไฟล์ (.json หรือ .csv)
+        """
+        data = self.to_dict()["stages"]
+        if path.lower().endswith(".csv"):
+            import csv
+
+            columns = ["count", "avg_ms", "p50_ms", "p99_ms", "max_ms", "share"]
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(["stage"] + columns + ["bin_upper_ms", "bin_count"])
+                for stage, stats in data.items():
+                    summary = [stats[column] for column in columns]
+                    for bin_data in stats["histogram"]:
+                        writer.writerow(
+                            [stage]
+                            + summary
+                            + [bin_data["upper_ms"], bin_data["count"]]
+                        )
+        else:
+            import json
+
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"stages": data}, f, indent=4)